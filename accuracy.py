@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""Accuracy and latency regression harness for the circle and grid detectors.
+
+Runs a detector backend over a corpus of labeled tracks and reports
+precision and recall, parameter errors (radius, turns, grid bearing and
+line spacing) and per-call latency percentiles, next to what the reference
+Python detectors score on the same tracks, and how often the backend agrees
+with them. The run fails, exiting 1, if the backend scores worse than the
+reference by more than a metric's tolerance, so a faster engine can be
+accepted or rejected mechanically:
+
+    python accuracy.py --backend numpy
+    python accuracy.py --backend numpy --thresholds thresholds.json --output report.json
+
+The corpus is synthetic by default (circles, wide orbits, racetrack holds,
+lawnmower surveys, straight transits and stationary GPS jitter). It can be
+exported with --export, replaced by a saved corpus with --corpus, and
+extended with tracks cut from a --record recording, labeled in a JSON
+file keyed by hex id:
+
+    {"a1b2c3": {"kind": "circle", "circle": true, "grid": false, "radius_km": 1.2,
+                "start": 1700000000, "end": 1700000300}}
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import requests
+
+from app import (CIRCLE_DETECTORS, GRID_DETECTORS, BinCraftSnapshot, Position, SnapshotReplay, TAR1090Monitor,
+                 TrackBuffer, VirtualClock)
+from synthetic_traffic import Fleet, FleetConfig, FlightPlan
+
+# Accuracy is gated on the difference from the reference Python detectors on
+# the same corpus: how far below the reference a score may fall, or how far
+# above it an error may rise. Absolute limits would only measure the corpus
+# (surveys and racetracks also read as circles to the reference, and it averages
+# the bearings of legs flown both ways), not whether a backend got worse
+HIGHER_IS_BETTER = ('circle_precision', 'circle_recall', 'grid_precision', 'grid_recall')
+LOWER_IS_BETTER = ('radius_error_km', 'turns_error', 'bearing_error_deg', 'spacing_error_km')
+THRESHOLDS = {
+    'circle_precision': 0.0,
+    'circle_recall': 0.0,
+    'grid_precision': 0.0,
+    'grid_recall': 0.0,
+    'radius_error_km': 0.01,  # Mean absolute error on detected circles
+    'turns_error': 0.01,
+    'bearing_error_deg': 1.0,  # Modulo 180
+    'spacing_error_km': 0.01,
+    'agreement': 1.0,  # Fraction of tracks where the backend decides like the Python detectors
+    'latency_ratio': 1.25,  # p50 latency relative to the Python detectors
+}
+
+@dataclass
+class LabeledTrack:
+    name: str
+    kind: str
+    circle: bool  # Whether the circle detector should fire
+    grid: bool  # Whether the grid detector should fire
+    positions: List[Position] = field(default_factory=list)
+    radius_km: Optional[float] = None
+    turns: Optional[float] = None
+    bearing: Optional[float] = None
+    spacing_km: Optional[float] = None
+
+
+def synthetic_corpus(per_kind: int, window: float, interval: float, seed: int) -> List[LabeledTrack]:
+    """Labeled synthetic tracks of every kind, window seconds long."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(per_kind):
+        fleet = Fleet(FleetConfig(aircraft=0, noise_km=rng.choice([0.0, 0.02, 0.05]),
+                                  dropout=rng.choice([0.0, 0.05, 0.15]), seed=seed + i))
+        lat, lon = rng.uniform(25, 60), rng.uniform(-120, 20)
+
+        def plan(kind, **kwargs):
+            return FlightPlan(hex_id=f'{kind[:4]}{i:04d}', callsign=kind.upper(), kind=kind, lat=lat, lon=lon,
+                              altitude=rng.randrange(1500, 12000, 100), heading=rng.uniform(0, 360), **kwargs)
+
+        def track(flight_plan):
+            return fleet.track(flight_plan, window, interval, start=1_700_000_000.0)
+
+        # Circles of 0.8-5 km and wide orbits of 5-9 km, each making 2-4 turns within the window
+        for kind, radii in (('circle', (0.8, 5.0)), ('orbit', (5.0, 9.0))):
+            radius, turns = rng.uniform(*radii), rng.uniform(2, 4)
+            flight_plan = plan('circle', speed_kt=2 * math.pi * radius * turns / window * 3600 / 1.852,
+                               radius_km=radius, seconds_per_turn=window / turns, phase=rng.uniform(0, 2 * math.pi))
+            corpus.append(LabeledTrack(f'{kind}-{i}', kind, True, False, track(flight_plan),
+                                       radius_km=radius, turns=turns))
+
+        # Racetrack holds are one of GridDetector's pattern types, not circles
+        flight_plan = plan('racetrack', speed_kt=rng.uniform(120, 180), radius_km=rng.uniform(0.8, 1.5),
+                           leg_km=rng.uniform(1.5, 3.0))
+        corpus.append(LabeledTrack(f'racetrack-{i}', 'racetrack', False, True, track(flight_plan)))
+
+        spacing = rng.uniform(0.5, 1.5)
+        flight_plan = plan('survey', speed_kt=rng.uniform(110, 160), leg_km=rng.uniform(3.0, 4.0),
+                           spacing_km=spacing, legs=50)
+        corpus.append(LabeledTrack(f'survey-{i}', 'survey', False, True, track(flight_plan),
+                                   bearing=flight_plan.heading % 180, spacing_km=spacing))
+
+        corpus.append(LabeledTrack(f'straight-{i}', 'straight', False, False,
+                                   track(plan('transit', speed_kt=rng.uniform(150, 480)))))
+
+        # A parked or hovering aircraft whose position only wanders with GPS noise
+        jitter = Fleet(FleetConfig(aircraft=0, noise_km=rng.uniform(0.02, 0.1), dropout=0.05, seed=seed + i))
+        corpus.append(LabeledTrack(f'jitter-{i}', 'jitter', False, False,
+                                   jitter.track(plan('stationary', speed_kt=0.0), window, interval,
+                                                start=1_700_000_000.0)))
+    return corpus
+
+
+def recorded_corpus(directory: str, labels_file: str, window: float) -> List[LabeledTrack]:
+    """Tracks of the labeled aircraft in a --record recording."""
+    with open(labels_file) as f:
+        labels = json.load(f)
+    replay = SnapshotReplay(directory)
+    monitor = TAR1090Monitor(replay.manifest['server_urls'], clock=VirtualClock())
+    monitor.replay = replay
+
+    positions = defaultdict(list)
+    while True:
+        try:
+            bodies = monitor.poll_aircraft_data()
+        except requests.exceptions.RequestException:
+            continue  # Every receiver failed in this poll
+        if replay.finished:
+            break
+        data = monitor.parse_aircraft_data(bodies)
+        if data is None:
+            continue
+        if isinstance(data, BinCraftSnapshot):
+            data = {'now': data.now, 'aircraft': data.to_dicts()}
+        for ac_data in data['aircraft']:
+            hex_id = ac_data.get('hex', '').lower()
+            if hex_id not in labels or ac_data.get('lat') is None or ac_data.get('lon') is None:
+                continue
+            track = positions[hex_id]
+            if track and track[-1].lat == ac_data['lat'] and track[-1].lon == ac_data['lon']:
+                continue
+            track.append(Position(float(ac_data['lat']), float(ac_data['lon']),
+                                  data['now'] - float(ac_data.get('seen_pos') or 0),
+                                  ac_data.get('alt_baro'), ac_data.get('gs')))
+
+    corpus = []
+    for hex_id, label in labels.items():
+        track = positions.get(hex_id.lower(), [])
+        end = label.get('end') or (track[-1].timestamp if track else 0)
+        start = label.get('start') or end - window
+        corpus.append(LabeledTrack(
+            f'recorded-{hex_id}', label.get('kind', 'recorded'), label['circle'], label['grid'],
+            [p for p in track if start <= p.timestamp <= end],
+            label.get('radius_km'), label.get('turns'), label.get('bearing'), label.get('spacing_km')))
+    return corpus
+
+
+def load_corpus(path: str) -> List[LabeledTrack]:
+    with open(path) as f:
+        entries = json.load(f)
+    return [LabeledTrack(**dict(entry, positions=[Position(*p) for p in entry['positions']])) for entry in entries]
+
+
+def save_corpus(corpus: List[LabeledTrack], path: str):
+    entries = [dict(asdict(track), positions=[[p.lat, p.lon, p.timestamp, p.altitude, p.speed] for p in track.positions])
+               for track in corpus]
+    with open(path, 'w') as f:
+        json.dump(entries, f)
+
+
+def to_buffer(positions: List[Position]) -> TrackBuffer:
+    buffer = TrackBuffer(max(len(positions), 1))
+    for p in positions:
+        buffer.append(p)
+    return buffer
+
+
+def timed_detections(make_detect, buffers: List[TrackBuffer], repeat: int):
+    """Run a fresh detector over every track, returning the results and every call's latency in microseconds.
+
+    Each repetition gets a new detector, so backends that cache per track
+    are timed on first sight of a track, as after a restart.
+    """
+    latencies = []
+    for _ in range(repeat):
+        detect = make_detect()
+        results = []
+        for buffer in buffers:
+            start = time.perf_counter()
+            results.append(detect(buffer))
+            latencies.append((time.perf_counter() - start) * 1e6)
+    return results, latencies
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {f'p{q}': round(ordered[min(int(q / 100 * len(ordered)), len(ordered) - 1)], 1) for q in (50, 95, 99)}
+
+
+def precision_recall(expected: List[bool], actual: List[bool]) -> Dict[str, float]:
+    true_positives = sum(e and a for e, a in zip(expected, actual))
+    detected, labeled = sum(actual), sum(expected)
+    return {
+        'precision': true_positives / detected if detected else 1.0,
+        'recall': true_positives / labeled if labeled else 1.0,
+        'false_positives': detected - true_positives,
+        'false_negatives': labeled - true_positives
+    }
+
+
+def mean_error(pairs) -> Optional[float]:
+    errors = [abs(truth - measured) for truth, measured in pairs if truth is not None]
+    return statistics.mean(errors) if errors else None
+
+
+def bearing_error(truth: float, measured: float) -> float:
+    diff = abs(truth - measured) % 180
+    return min(diff, 180 - diff)
+
+
+def accuracy(corpus: List[LabeledTrack], circles, grids) -> Dict[str, Optional[float]]:
+    """Detection and parameter accuracy of one backend's results against the labels."""
+    circle_scores = precision_recall([t.circle for t in corpus], [c.is_circling for c in circles])
+    grid_scores = precision_recall([t.grid for t in corpus], [g.is_grid_pattern for g in grids])
+    found_circles = [(t, c) for t, c in zip(corpus, circles) if t.circle and c.is_circling]
+    found_grids = [(t, g) for t, g in zip(corpus, grids) if t.grid and g.is_grid_pattern]
+    bearing_errors = [bearing_error(t.bearing, g.grid_bearing) for t, g in found_grids if t.bearing is not None]
+    return {
+        'circle_precision': circle_scores['precision'],
+        'circle_recall': circle_scores['recall'],
+        'grid_precision': grid_scores['precision'],
+        'grid_recall': grid_scores['recall'],
+        'radius_error_km': mean_error((t.radius_km, c.radius) for t, c in found_circles),
+        'turns_error': mean_error((t.turns, c.turns) for t, c in found_circles),
+        'bearing_error_deg': statistics.mean(bearing_errors) if bearing_errors else None,
+        'spacing_error_km': mean_error((t.spacing_km, g.line_spacing) for t, g in found_grids),
+    }
+
+
+def evaluate(corpus: List[LabeledTrack], backend: str, repeat: int) -> Dict:
+    """Score a backend and the reference Python detectors against the labels, and against each other."""
+    buffers = [to_buffer(track.positions) for track in corpus]
+    circles, circle_latency = timed_detections(lambda: CIRCLE_DETECTORS[backend]().detect_circling, buffers, repeat)
+    grids, grid_latency = timed_detections(lambda: GRID_DETECTORS[backend]().detect_grid_pattern, buffers, repeat)
+    reference_circles, reference_circle_latency = timed_detections(
+        lambda: CIRCLE_DETECTORS['python']().detect_circling, buffers, repeat)
+    reference_grids, reference_grid_latency = timed_detections(
+        lambda: GRID_DETECTORS['python']().detect_grid_pattern, buffers, repeat)
+
+    agreements = sum(
+        c.is_circling == rc.is_circling and g.is_grid_pattern == rg.is_grid_pattern
+        for c, rc, g, rg in zip(circles, reference_circles, grids, reference_grids)
+    )
+    reference_p50 = statistics.median(reference_circle_latency + reference_grid_latency)
+
+    misses = [t.name for t, c, g in zip(corpus, circles, grids) if t.circle != c.is_circling or t.grid != g.is_grid_pattern]
+    return {
+        'backend': backend,
+        'tracks': len(corpus),
+        'accuracy': accuracy(corpus, circles, grids),
+        'reference': accuracy(corpus, reference_circles, reference_grids),
+        'agreement': agreements / len(corpus),
+        'latency_us': {
+            'circle': percentiles(circle_latency),
+            'grid': percentiles(grid_latency),
+            'reference_circle': percentiles(reference_circle_latency),
+            'reference_grid': percentiles(reference_grid_latency)
+        },
+        'latency_ratio': statistics.median(circle_latency + grid_latency) / reference_p50,
+        'mislabeled': misses
+    }
+
+
+def limits(report: Dict, thresholds: Dict[str, float]) -> Dict[str, Optional[float]]:
+    """The value each metric must reach: the reference's score moved by the metric's tolerance."""
+    reference = report['reference']
+    bounds = {}
+    for name in HIGHER_IS_BETTER:
+        bounds[name] = reference[name] - thresholds[name]
+    for name in LOWER_IS_BETTER:
+        bounds[name] = None if reference[name] is None else reference[name] + thresholds[name]
+    bounds['agreement'] = thresholds['agreement']
+    bounds['latency_ratio'] = thresholds['latency_ratio']
+    return bounds
+
+
+def check(report: Dict, thresholds: Dict[str, float]) -> List[str]:
+    """Names of the metrics that miss their limits."""
+    bounds = limits(report, thresholds)
+    scores = report['accuracy']
+    failures = [name for name in HIGHER_IS_BETTER if scores[name] < bounds[name]]
+    for name in LOWER_IS_BETTER:
+        # The reference found nothing to measure, so there is nothing to fall behind
+        if bounds[name] is not None and (scores[name] is None or scores[name] > bounds[name]):
+            failures.append(name)
+    if report['agreement'] < bounds['agreement']:
+        failures.append('agreement')
+    if report['latency_ratio'] > bounds['latency_ratio']:
+        failures.append('latency_ratio')
+    return failures
+
+
+def print_report(report: Dict, thresholds: Dict[str, float], failures: List[str]):
+    def shown(value):
+        return '-' if value is None else f'{value:.3f}'
+
+    def row(name, value, reference, limit, better):
+        status = '❌' if name in failures else '✅'
+        print(f"{name:<20}{shown(value):>10}{shown(reference):>11}{better:>4}{shown(limit):>8}  {status}")
+
+    bounds = limits(report, thresholds)
+    print(f"Backend {report['backend']} on {report['tracks']} labeled tracks")
+    print(f"{'metric':<20}{'value':>10}{'reference':>11}{'':>4}{'limit':>8}")
+    for name in HIGHER_IS_BETTER:
+        row(name, report['accuracy'][name], report['reference'][name], bounds[name], '>=')
+    for name in LOWER_IS_BETTER:
+        row(name, report['accuracy'][name], report['reference'][name], bounds[name], '<=')
+    row('agreement', report['agreement'], None, bounds['agreement'], '>=')
+    row('latency_ratio', report['latency_ratio'], None, bounds['latency_ratio'], '<=')
+
+    print(f"\n{'latency (us)':<20}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, values in report['latency_us'].items():
+        print(f"{name:<20}{values['p50']:>10.1f}{values['p95']:>10.1f}{values['p99']:>10.1f}")
+    if report['mislabeled']:
+        print(f"\nTracks detected against their label: {', '.join(report['mislabeled'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Accuracy and latency regression harness for the detectors')
+    parser.add_argument('--backend', choices=sorted(CIRCLE_DETECTORS), default='python',
+                        help='Detector backend to evaluate (default: python)')
+    parser.add_argument('--tracks', type=int, default=20, help='Synthetic tracks per kind (default: 20)')
+    parser.add_argument('--window', type=float, default=300, help='Track length in seconds (default: 300)')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between positions (default: 5.0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    parser.add_argument('--corpus', help='Evaluate a corpus saved with --export instead of synthetic tracks')
+    parser.add_argument('--recording', metavar='DIR', help='Add labeled tracks from a --record recording')
+    parser.add_argument('--labels', help='Labels for --recording, keyed by hex id')
+    parser.add_argument('--export', metavar='FILE', help='Save the corpus as JSON')
+    parser.add_argument('--thresholds', help='JSON file overriding the default tolerances and limits')
+    parser.add_argument('--output', metavar='FILE', help='Write the report as JSON')
+    args = parser.parse_args()
+    if args.recording and not args.labels:
+        parser.error('--recording needs --labels')
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        corpus = synthetic_corpus(args.tracks, args.window, args.interval, args.seed)
+    if args.recording:
+        corpus += recorded_corpus(args.recording, args.labels, args.window)
+    if args.export:
+        save_corpus(corpus, args.export)
+        print(f"Corpus of {len(corpus)} tracks written to {args.export}")
+
+    thresholds = dict(THRESHOLDS)
+    if args.thresholds:
+        with open(args.thresholds) as f:
+            thresholds.update(json.load(f))
+
+    report = evaluate(corpus, args.backend, args.repeat)
+    failures = check(report, thresholds)
+    report['thresholds'] = thresholds
+    report['failures'] = failures
+    print_report(report, thresholds, failures)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if failures:
+        print(f"\n❌ Rejected: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Accepted")
+
+
+if __name__ == "__main__":
+    main()
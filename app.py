@@ -462,11 +462,160 @@ MAP_HTML_TEMPLATE = '''
             return (heading + 360) % 360;
         }
         
-        // Update patterns from API
+        // Map state: a full /api/patterns snapshot, kept current by the change sets
+        // pushed over /api/patterns/stream once per cycle
+        const liveAircraft = new Map();  // hex_id -> entry, with kind 'circle', 'grid' or 'aircraft'
+        const patternShapes = {};  // hex_id -> circle or rectangle drawn around a pattern
+        const dirtyAircraft = new Set();  // hex_ids whose layers need redrawing
+        let liveCycle = null;
+        let liveStatus = null;
+        let loadingSnapshot = false;
+        let snapshotRequests = 0;
+        let pendingChanges = [];
+        let liveView = null;  // The view the loaded snapshot was cut to
+        
+        // The part of the map in view, padded so short pans need no reload, and the
+        // zoom level the server simplifies tracks for
+        function currentView() {
+            const bounds = map.getBounds().pad(0.25);
+            return {west: bounds.getWest(), south: bounds.getSouth(), east: bounds.getEast(),
+                    north: bounds.getNorth(), zoom: map.getZoom()};
+        }
+        
+        function viewQuery(view) {
+            return 'bbox=' + [view.west, view.south, view.east, view.north].join(',') + '&zoom=' + view.zoom;
+        }
+        
+        function inView(point) {
+            if (point.lat < liveView.south || point.lat > liveView.north) {
+                return false;
+            }
+            const width = liveView.east - liveView.west;
+            return width >= 360 || ((point.lon - liveView.west) % 360 + 360) % 360 <= width;
+        }
+        
+        // Douglas-Peucker to about one pixel at zoom, as simplify_track in app.py does
+        function simplifyPath(path, zoom) {
+            if (path.length < 3) {
+                return path;
+            }
+            const tolerance = 360 / (256 * Math.pow(2, zoom));
+            const stretch = Math.cos(path.reduce((sum, p) => sum + p.lat, 0) / path.length * Math.PI / 180);
+            const keep = new Uint8Array(path.length);
+            keep[0] = keep[path.length - 1] = 1;
+            const segments = [[0, path.length - 1]];
+            while (segments.length) {
+                const [first, last] = segments.pop();
+                if (last - first < 2) {
+                    continue;
+                }
+                const x0 = path[first].lon, y0 = path[first].lat / stretch;
+                const dx = path[last].lon - x0, dy = path[last].lat / stretch - y0;
+                const length = Math.hypot(dx, dy);
+                let farthest = -1, maxDistance = tolerance;
+                for (let i = first + 1; i < last; i++) {
+                    const px = path[i].lon - x0, py = path[i].lat / stretch - y0;
+                    const distance = length > 0 ? Math.abs(px * dy - py * dx) / length : Math.hypot(px, py);
+                    if (distance > maxDistance) {
+                        farthest = i;
+                        maxDistance = distance;
+                    }
+                }
+                if (farthest >= 0) {
+                    keep[farthest] = 1;
+                    segments.push([first, farthest], [farthest, last]);
+                }
+            }
+            return path.filter((p, i) => keep[i]);
+        }
+        
+        // Change sets cover the whole map, so cut an added entry to the loaded view the way
+        // the server cuts a snapshot. Returns null for an aircraft outside patterns and out of view.
+        function fitToView(entry) {
+            if (liveView === null || !entry.path.length) {
+                return entry;
+            }
+            if (entry.kind === 'aircraft') {
+                if (!inView(entry.path[entry.path.length - 1])) {
+                    return null;
+                }
+            } else if (!entry.path.some(inView)) {
+                return Object.assign({}, entry, {path: entry.path.slice(-2)});
+            }
+            return Object.assign({}, entry, {path: simplifyPath(entry.path, liveView.zoom)});
+        }
+        
+        // Decode the compact /api/patterns encoding (see encode_columnar in app.py) into the
+        // same object the JSON response parses to
+        const COLUMNAR_MEDIA_TYPE = 'application/vnd.aircraft-patterns.columnar';
+        function decodeColumnar(buffer) {
+            const bytes = new Uint8Array(buffer);
+            if (String.fromCharCode(...bytes.subarray(0, 4)) !== 'ACP1') {
+                throw new Error('Unknown columnar payload version');
+            }
+            const headerLength = new DataView(buffer).getUint32(4, true);
+            const header = JSON.parse(new TextDecoder().decode(bytes.subarray(8, 8 + headerLength)));
+            let offset = 8 + headerLength;
+            
+            // A column of zigzag varint deltas, summed back into values
+            let total = 0;
+            Object.values(header.lists).forEach(list => list.points.forEach(count => total += count));
+            function readColumn() {
+                const values = new Float64Array(total);
+                let value = 0;
+                for (let i = 0; i < total; i++) {
+                    let raw = 0;
+                    let scale = 1;
+                    let byte;
+                    do {
+                        byte = bytes[offset++];
+                        raw += (byte & 0x7f) * scale;
+                        scale *= 128;
+                    } while (byte & 0x80);
+                    value += raw % 2 ? -(raw + 1) / 2 : raw / 2;
+                    values[i] = value;
+                }
+                return values;
+            }
+            const lats = readColumn();
+            const lons = readColumn();
+            const alts = readColumn();
+            const times = readColumn();
+            
+            const data = Object.assign({}, header.fields);
+            let point = 0;
+            Object.entries(header.lists).forEach(([name, list]) => {
+                const keys = Object.keys(list.columns);
+                data[name] = list.points.map((count, index) => {
+                    const entry = {};
+                    keys.forEach(key => entry[key] = list.columns[key][index]);
+                    entry.path = [];
+                    for (const end = point + count; point < end; point++) {
+                        entry.path.push({
+                            lat: lats[point] / 100000,
+                            lon: lons[point] / 100000,
+                            alt: alts[point] === -1000000 ? null : alts[point],
+                            time: header.time_base + times[point] / 1000
+                        });
+                    }
+                    return entry;
+                });
+            });
+            return data;
+        }
+        
+        // Load the full map state for the current view from the API
         async function updatePatterns() {
+            const request = ++snapshotRequests;
+            const view = currentView();
+            loadingSnapshot = true;
             try {
-                const response = await fetch(baseUrl + '/api/patterns');
-                const data = await response.json();
+                const response = await fetch(baseUrl + '/api/patterns?format=columnar&' + viewQuery(view));
+                const columnar = (response.headers.get('Content-Type') || '').startsWith(COLUMNAR_MEDIA_TYPE);
+                const data = columnar ? decodeColumnar(await response.arrayBuffer()) : await response.json();
+                if (request !== snapshotRequests) {
+                    return;  // The view changed while loading; a newer snapshot is on its way
+                }
                 
                 // Debug logging
                 console.log('Data received:', {
@@ -476,273 +625,366 @@ MAP_HTML_TEMPLATE = '''
                     allAircraft: data.all_aircraft ? data.all_aircraft.length : 0
                 });
                 
-                // Update stats
-                document.getElementById('totalAircraft').textContent = data.aircraft_count;
-                document.getElementById('circleCount').textContent = data.circles.length;
-                document.getElementById('gridCount').textContent = data.grids.length;
-                document.getElementById('updateTime').textContent = 
-                    'Updated: ' + new Date(data.timestamp).toLocaleTimeString();
-                
-                // Get control states
-                const showAllAircraft = document.getElementById('showAllAircraft').checked;
-                const showTracks = document.getElementById('showTracks').checked;
-                const showPatterns = document.getElementById('showPatterns').checked;
-                const autoCenter = document.getElementById('autoCenter').checked;
-                
-                // Clear existing layers
-                circleLayer.clearLayers();
-                gridLayer.clearLayers();
-                pathLayer.clearLayers();
-                aircraftLayer.clearLayers();
-                trackLayer.clearLayers();
-                visibleAircraftCount = 0;
-                
-                // Check for new patterns and send alerts
-                const currentCircles = new Set(data.circles.map(c => c.hex_id));
-                const currentGrids = new Set(data.grids.map(g => g.hex_id));
-                
-                if (hasInitialized) {
-                    // Check for new circles
-                    data.circles.forEach(circle => {
-                        if (!previousCircles.has(circle.hex_id)) {
-                            showNotification(
-                                'New Circle Pattern Detected',
-                                `${circle.callsign} - ${circle.turns.toFixed(1)} turns, ${circle.radius.toFixed(1)}km radius`,
-                                `circle-${circle.hex_id}`
-                            );
-                        }
-                    });
-                    
-                    // Check for new grids
-                    data.grids.forEach(grid => {
-                        if (!previousGrids.has(grid.hex_id)) {
-                            showNotification(
-                                'New Grid Pattern Detected',
-                                `${grid.callsign} - ${grid.pattern_type}, ${grid.num_legs} legs`,
-                                `grid-${grid.hex_id}`
-                            );
-                        }
-                    });
-                }
-                
-                previousCircles = currentCircles;
-                previousGrids = currentGrids;
-                hasInitialized = true;
-                
-                // Update pattern list
-                const patternList = document.getElementById('patternList');
-                patternList.innerHTML = '';
-                
-                // Process circles
-                data.circles.forEach(circle => {
-                    // Draw circle on map (only if patterns are enabled)
-                    if (showPatterns) {
-                        const circleMarker = L.circle([circle.center_lat, circle.center_lon], {
-                            radius: circle.radius * 1000, // Convert km to meters
-                            color: '#dc3545',
-                            fillColor: '#dc3545',
-                            fillOpacity: 0.2,
-                            weight: 2
-                        }).addTo(circleLayer);
+                // One entry per aircraft; an aircraft in a circle and a grid shows as circling
+                const entries = new Map();
+                data.circles.forEach(circle => entries.set(circle.hex_id, Object.assign({kind: 'circle'}, circle)));
+                data.grids.forEach(grid => {
+                    if (!entries.has(grid.hex_id)) {
+                        entries.set(grid.hex_id, Object.assign({kind: 'grid'}, grid));
                     }
-                    
-                    // Always show aircraft and paths if there's data
-                    if (circle.path && circle.path.length > 1) {
-                        // Draw flight path if patterns are enabled
-                        if (showPatterns) {
-                            const pathCoords = circle.path.map(p => [p.lat, p.lon]);
-                            L.polyline(pathCoords, {
-                                color: '#0066cc',
-                                weight: 2,
-                                opacity: 0.7
-                            }).addTo(pathLayer);
-                        }
-                        
-                        // Always add aircraft marker at last position
-                        const lastPos = circle.path[circle.path.length - 1];
-                        const heading = calculateHeading(circle.path);
-                        const altitude = circle.current_alt || 0;
-                        const typeDesignator = circle.type || null;
-                        const category = circle.category || null;
-                        const marker = L.marker([lastPos.lat, lastPos.lon], {
-                            icon: createAircraftIcon(typeDesignator, category, altitude, heading)
-                        }).addTo(aircraftLayer);
-                        
-                        marker.bindPopup(`
-                            <div class="aircraft-popup">
-                                <div class="aircraft-title">🔴 ${circle.callsign}</div>
-                                <div class="aircraft-details">
-                                    <div><strong>Pattern:</strong> Circling (${circle.turns.toFixed(1)} turns)</div>
-                                    <div><strong>Radius:</strong> ${circle.radius.toFixed(1)} km</div>
-                                    ${circle.current_alt ? `<div><strong>Altitude:</strong> ${circle.current_alt.toLocaleString()} ft</div>` : ''}
-                                    ${circle.current_speed ? `<div><strong>Speed:</strong> ${circle.current_speed} kts</div>` : ''}
-                                    <div><strong>Aircraft ID:</strong> ${circle.hex_id}</div>
-                                    ${circle.type ? `<div><strong>Type:</strong> ${circle.type}</div>` : ''}
-                                </div>
-                                ${circle.tar1090_radar_url ? `<a href="${circle.tar1090_radar_url}" target="_blank" class="aircraft-link">📡 View on Radar</a>` : ''}
-                            </div>
-                        `);
-                        
-                        visibleAircraftCount++;
+                });
+                (data.all_aircraft || []).forEach(aircraft => {
+                    if (!entries.has(aircraft.hex_id)) {
+                        entries.set(aircraft.hex_id, Object.assign({kind: 'aircraft'}, aircraft));
                     }
-                    
-                    // Add to pattern list
-                    const patternDiv = document.createElement('div');
-                    patternDiv.className = 'pattern-item circle-pattern';
-                    patternDiv.innerHTML = `
-                        <strong>🔴 ${circle.callsign}</strong><br>
-                        <small>${circle.turns.toFixed(1)} turns, ${circle.radius.toFixed(1)} km radius</small>
-                    `;
-                    patternDiv.onclick = () => {
-                        map.setView([circle.center_lat, circle.center_lon], 12);
-                    };
-                    patternList.appendChild(patternDiv);
                 });
                 
-                // Process grids
-                data.grids.forEach(grid => {
-                    // Draw grid area (only if patterns are enabled)
-                    if (showPatterns) {
-                        const bounds = calculateGridBounds(grid);
-                        L.rectangle(bounds, {
-                            color: '#28a745',
-                            fillColor: '#28a745',
-                            fillOpacity: 0.1,
-                            weight: 2
-                        }).addTo(gridLayer);
-                    }
-                    
-                    // Always show aircraft and paths if there's data
-                    if (grid.path && grid.path.length > 1) {
-                        // Draw flight path if patterns are enabled
-                        if (showPatterns) {
-                            const pathCoords = grid.path.map(p => [p.lat, p.lon]);
-                            L.polyline(pathCoords, {
-                                color: '#009900',
-                                weight: 3,
-                                opacity: 0.8,
-                                dashArray: '5, 5'
-                            }).addTo(pathLayer);
-                        }
-                        
-                        // Always add aircraft marker at last position
-                        const lastPos = grid.path[grid.path.length - 1];
-                        const heading = calculateHeading(grid.path);
-                        const altitude = grid.current_alt || 0;
-                        const typeDesignator = grid.type || null;
-                        const category = grid.category || null;
-                        const marker = L.marker([lastPos.lat, lastPos.lon], {
-                            icon: createAircraftIcon(typeDesignator, category, altitude, heading)
-                        }).addTo(aircraftLayer);
-                        
-                        marker.bindPopup(`
-                            <div class="aircraft-popup">
-                                <div class="aircraft-title">🟢 ${grid.callsign}</div>
-                                <div class="aircraft-details">
-                                    <div><strong>Pattern:</strong> ${grid.pattern_type}</div>
-                                    <div><strong>Grid Legs:</strong> ${grid.num_legs}</div>
-                                    <div><strong>Coverage:</strong> ${grid.coverage_area.toFixed(1)} km²</div>
-                                    ${grid.current_alt ? `<div><strong>Altitude:</strong> ${grid.current_alt.toLocaleString()} ft</div>` : ''}
-                                    ${grid.current_speed ? `<div><strong>Speed:</strong> ${grid.current_speed} kts</div>` : ''}
-                                    <div><strong>Aircraft ID:</strong> ${grid.hex_id}</div>
-                                    ${grid.type ? `<div><strong>Type:</strong> ${grid.type}</div>` : ''}
-                                </div>
-                                ${grid.tar1090_radar_url ? `<a href="${grid.tar1090_radar_url}" target="_blank" class="aircraft-link">📡 View on Radar</a>` : ''}
-                            </div>
-                        `);
-                        
-                        visibleAircraftCount++;
+                liveAircraft.forEach((entry, hex) => dirtyAircraft.add(hex));
+                liveAircraft.clear();
+                entries.forEach((entry, hex) => {
+                    liveAircraft.set(hex, entry);
+                    dirtyAircraft.add(hex);
+                });
+                liveCycle = data.cycle;
+                liveView = view;
+                liveStatus = {aircraft_count: data.aircraft_count, timestamp: data.timestamp};
+                renderPatterns();
+            } catch (error) {
+                console.error('Error fetching patterns:', error);
+            } finally {
+                if (request === snapshotRequests) {
+                    loadingSnapshot = false;
+                }
+            }
+            if (loadingSnapshot) {
+                return;
+            }
+            
+            // Apply change sets that arrived while the snapshot was loading
+            const queued = pendingChanges;
+            pendingChanges = [];
+            queued.forEach(applyChanges);
+        }
+        
+        // Apply one cycle's change set: new track points, changed details, aircraft added or removed
+        function applyChanges(changes) {
+            if (loadingSnapshot) {
+                pendingChanges.push(changes);
+                return;
+            }
+            if (liveCycle !== null && changes.cycle <= liveCycle) {
+                return;  // Already part of the snapshot
+            }
+            if (changes.base !== liveCycle) {
+                updatePatterns();  // Missed a change set, so reload the full state
+                return;
+            }
+            
+            changes.removed.forEach(hex => {
+                liveAircraft.delete(hex);
+                dirtyAircraft.add(hex);
+            });
+            changes.added.forEach(entry => {
+                const fitted = fitToView(entry);
+                if (fitted) {
+                    liveAircraft.set(entry.hex_id, fitted);
+                } else {
+                    liveAircraft.delete(entry.hex_id);
+                }
+                dirtyAircraft.add(entry.hex_id);
+            });
+            changes.updated.forEach(update => {
+                const entry = liveAircraft.get(update.hex_id);
+                if (!entry) {
+                    return;
+                }
+                const lastTime = entry.path.length ? entry.path[entry.path.length - 1].time : -Infinity;
+                Object.keys(update).forEach(key => {
+                    if (key !== 'path' && key !== 'start') {
+                        entry[key] = update[key];
                     }
-                    
-                    // Add to pattern list
-                    const patternDiv = document.createElement('div');
-                    patternDiv.className = 'pattern-item grid-pattern';
-                    patternDiv.innerHTML = `
-                        <strong>🟢 ${grid.callsign}</strong><br>
-                        <small>${grid.pattern_type}: ${grid.num_legs} legs, ${grid.coverage_area.toFixed(1)} km²</small>
-                    `;
-                    patternDiv.onclick = () => {
-                        map.setView([grid.center_lat, grid.center_lon], 11);
-                    };
-                    patternList.appendChild(patternDiv);
                 });
-                
-                // Add all aircraft if enabled
-                if (showAllAircraft && data.all_aircraft) {
-                    console.log(`Processing ${data.all_aircraft.length} additional aircraft`);
-                    data.all_aircraft.forEach(aircraft => {
-                        if (!aircraft.path || aircraft.path.length === 0) {
-                            console.log(`Skipping aircraft ${aircraft.callsign} - no path data`);
-                            return;
-                        }
-                        
-                        const lastPos = aircraft.path[aircraft.path.length - 1];
-                        if (!lastPos || !lastPos.lat || !lastPos.lon) {
-                            console.log(`Skipping aircraft ${aircraft.callsign} - invalid position`);
-                            return;
-                        }
-                        
-                        const heading = calculateHeading(aircraft.path);
-                        const altitude = aircraft.current_alt || 0;
-                        
-                        // Add aircraft marker
-                        const marker = L.marker([lastPos.lat, lastPos.lon], {
-                            icon: createAircraftIcon(aircraft.type, aircraft.category, altitude, heading)
-                        }).addTo(aircraftLayer);
-                        
-                        marker.bindPopup(`
-                            <div class="aircraft-popup">
-                                <div class="aircraft-title">✈️ ${aircraft.callsign}</div>
-                                <div class="aircraft-details">
-                                    <div><strong>Type:</strong> ${aircraft.type || 'Unknown'}</div>
-                                    ${aircraft.current_alt ? `<div><strong>Altitude:</strong> ${aircraft.current_alt.toLocaleString()} ft</div>` : ''}
-                                    ${aircraft.current_speed ? `<div><strong>Speed:</strong> ${aircraft.current_speed} kts</div>` : ''}
-                                    <div><strong>Aircraft ID:</strong> ${aircraft.hex_id}</div>
-                                    ${aircraft.category ? `<div><strong>Category:</strong> ${aircraft.category}</div>` : ''}
-                                </div>
-                                ${aircraft.tar1090_radar_url ? `<a href="${aircraft.tar1090_radar_url}" target="_blank" class="aircraft-link">📡 View on Radar</a>` : ''}
-                            </div>
-                        `);
-                        
-                        visibleAircraftCount++;
-                        
-                        // Add track if enabled
-                        if (showTracks && aircraft.path.length > 1) {
-                            const trackCoords = aircraft.path.map(p => [p.lat, p.lon]);
-                            const altitudeColor = altitude < 5000 ? '#ff6600' : 
-                                                 altitude < 15000 ? '#ffaa00' : 
-                                                 altitude < 25000 ? '#00aa00' : '#0066ff';
-                            
-                            L.polyline(trackCoords, {
-                                color: altitudeColor,
-                                weight: 1,
-                                opacity: 0.4,
-                                dashArray: '2, 4'
-                            }).addTo(trackLayer);
-                        }
-                    });
+                if (update.path) {
+                    entry.path.push(...update.path.filter(p => p.time > lastTime));
                 }
-                
-                // Update visible aircraft count
-                document.getElementById('visibleAircraft').textContent = visibleAircraftCount;
-                
-                // Auto-center on new patterns if enabled
-                if (autoCenter && hasInitialized) {
-                    if (data.circles.length > 0) {
-                        const firstCircle = data.circles[0];
-                        if (!previousCircles.has(firstCircle.hex_id)) {
-                            map.setView([firstCircle.center_lat, firstCircle.center_lon], 12);
-                        }
-                    } else if (data.grids.length > 0) {
-                        const firstGrid = data.grids[0];
-                        if (!previousGrids.has(firstGrid.hex_id)) {
-                            map.setView([firstGrid.center_lat, firstGrid.center_lon], 11);
-                        }
+                if (update.start !== undefined) {
+                    entry.path = entry.path.filter(p => p.time >= update.start);
+                }
+                // Keep to the loaded view: drop aircraft that flew out of it, and cut patterns outside it
+                if (liveView !== null && entry.path.length) {
+                    if (entry.kind === 'aircraft' && !inView(entry.path[entry.path.length - 1])) {
+                        liveAircraft.delete(update.hex_id);
+                    } else if (entry.kind !== 'aircraft' && entry.path.length > 2 && !entry.path.some(inView)) {
+                        entry.path = entry.path.slice(-2);
                     }
                 }
+                dirtyAircraft.add(update.hex_id);
+            });
+            
+            liveCycle = changes.cycle;
+            liveStatus = {aircraft_count: changes.aircraft_count, timestamp: changes.timestamp};
+            renderPatterns();
+        }
+        
+        // Popup shown for an aircraft marker
+        function aircraftPopup(entry) {
+            if (entry.kind === 'circle') {
+                return `
+                    <div class="aircraft-popup">
+                        <div class="aircraft-title">🔴 ${entry.callsign}</div>
+                        <div class="aircraft-details">
+                            <div><strong>Pattern:</strong> Circling (${entry.turns.toFixed(1)} turns)</div>
+                            <div><strong>Radius:</strong> ${entry.radius.toFixed(1)} km</div>
+                            ${entry.current_alt ? `<div><strong>Altitude:</strong> ${entry.current_alt.toLocaleString()} ft</div>` : ''}
+                            ${entry.current_speed ? `<div><strong>Speed:</strong> ${entry.current_speed} kts</div>` : ''}
+                            <div><strong>Aircraft ID:</strong> ${entry.hex_id}</div>
+                            ${entry.type ? `<div><strong>Type:</strong> ${entry.type}</div>` : ''}
+                        </div>
+                        ${entry.tar1090_radar_url ? `<a href="${entry.tar1090_radar_url}" target="_blank" class="aircraft-link">📡 View on Radar</a>` : ''}
+                    </div>
+                `;
+            }
+            if (entry.kind === 'grid') {
+                return `
+                    <div class="aircraft-popup">
+                        <div class="aircraft-title">🟢 ${entry.callsign}</div>
+                        <div class="aircraft-details">
+                            <div><strong>Pattern:</strong> ${entry.pattern_type}</div>
+                            <div><strong>Grid Legs:</strong> ${entry.num_legs}</div>
+                            <div><strong>Coverage:</strong> ${entry.coverage_area.toFixed(1)} km²</div>
+                            ${entry.current_alt ? `<div><strong>Altitude:</strong> ${entry.current_alt.toLocaleString()} ft</div>` : ''}
+                            ${entry.current_speed ? `<div><strong>Speed:</strong> ${entry.current_speed} kts</div>` : ''}
+                            <div><strong>Aircraft ID:</strong> ${entry.hex_id}</div>
+                            ${entry.type ? `<div><strong>Type:</strong> ${entry.type}</div>` : ''}
+                        </div>
+                        ${entry.tar1090_radar_url ? `<a href="${entry.tar1090_radar_url}" target="_blank" class="aircraft-link">📡 View on Radar</a>` : ''}
+                    </div>
+                `;
+            }
+            return `
+                <div class="aircraft-popup">
+                    <div class="aircraft-title">✈️ ${entry.callsign}</div>
+                    <div class="aircraft-details">
+                        <div><strong>Type:</strong> ${entry.type || 'Unknown'}</div>
+                        ${entry.current_alt ? `<div><strong>Altitude:</strong> ${entry.current_alt.toLocaleString()} ft</div>` : ''}
+                        ${entry.current_speed ? `<div><strong>Speed:</strong> ${entry.current_speed} kts</div>` : ''}
+                        <div><strong>Aircraft ID:</strong> ${entry.hex_id}</div>
+                        ${entry.category ? `<div><strong>Category:</strong> ${entry.category}</div>` : ''}
+                    </div>
+                    ${entry.tar1090_radar_url ? `<a href="${entry.tar1090_radar_url}" target="_blank" class="aircraft-link">📡 View on Radar</a>` : ''}
+                </div>
+            `;
+        }
+        
+        // Line style for a pattern's flight path or another aircraft's track history
+        function trackStyle(entry) {
+            if (entry.kind === 'circle') {
+                return {color: '#0066cc', weight: 2, opacity: 0.7};
+            }
+            if (entry.kind === 'grid') {
+                return {color: '#009900', weight: 3, opacity: 0.8, dashArray: '5, 5'};
+            }
+            const altitude = entry.current_alt || 0;
+            const altitudeColor = altitude < 5000 ? '#ff6600' : 
+                                 altitude < 15000 ? '#ffaa00' : 
+                                 altitude < 25000 ? '#00aa00' : '#0066ff';
+            return {color: altitudeColor, weight: 1, opacity: 0.4, dashArray: '2, 4'};
+        }
+        
+        // Remove an aircraft's marker, track and pattern shape from the map
+        function removeAircraftLayers(hex) {
+            [aircraftMarkers, aircraftTracks, patternShapes].forEach(layers => {
+                if (layers[hex]) {
+                    layers[hex].remove();
+                    delete layers[hex];
+                }
+            });
+        }
+        
+        // Create or update one aircraft's layers in place
+        function drawAircraft(hex, showAllAircraft, showTracks) {
+            const entry = liveAircraft.get(hex);
+            const path = entry ? entry.path : [];
+            const lastPos = path[path.length - 1];
+            const visible = entry && lastPos && lastPos.lat && lastPos.lon &&
+                (entry.kind === 'aircraft' ? showAllAircraft : path.length > 1);
+            if (!visible || (aircraftMarkers[hex] && aircraftMarkers[hex].kind !== entry.kind)) {
+                removeAircraftLayers(hex);
+            }
+            if (!visible) {
+                return;
+            }
+            
+            // Aircraft marker at last position
+            const icon = createAircraftIcon(entry.type || null, entry.category || null,
+                                            entry.current_alt || 0, calculateHeading(path));
+            let marker = aircraftMarkers[hex];
+            if (marker) {
+                marker.setLatLng([lastPos.lat, lastPos.lon]);
+                marker.setIcon(icon);
+                marker.setPopupContent(aircraftPopup(entry));
+            } else {
+                marker = L.marker([lastPos.lat, lastPos.lon], {icon: icon}).addTo(aircraftLayer);
+                marker.bindPopup(aircraftPopup(entry));
+                marker.kind = entry.kind;
+                aircraftMarkers[hex] = marker;
+            }
+            
+            // Pattern outline
+            if (entry.kind === 'circle') {
+                if (patternShapes[hex]) {
+                    patternShapes[hex].setLatLng([entry.center_lat, entry.center_lon]);
+                    patternShapes[hex].setRadius(entry.radius * 1000);
+                } else {
+                    patternShapes[hex] = L.circle([entry.center_lat, entry.center_lon], {
+                        radius: entry.radius * 1000, // Convert km to meters
+                        color: '#dc3545',
+                        fillColor: '#dc3545',
+                        fillOpacity: 0.2,
+                        weight: 2
+                    }).addTo(circleLayer);
+                }
+            } else if (entry.kind === 'grid') {
+                const bounds = calculateGridBounds(entry);
+                if (patternShapes[hex]) {
+                    patternShapes[hex].setBounds(bounds);
+                } else {
+                    patternShapes[hex] = L.rectangle(bounds, {
+                        color: '#28a745',
+                        fillColor: '#28a745',
+                        fillOpacity: 0.1,
+                        weight: 2
+                    }).addTo(gridLayer);
+                }
+            }
+            
+            // Flight path for patterns, track history for other aircraft
+            const coords = path.map(p => [p.lat, p.lon]);
+            const showTrack = path.length > 1 && (entry.kind !== 'aircraft' || showTracks);
+            if (!showTrack) {
+                if (aircraftTracks[hex]) {
+                    aircraftTracks[hex].remove();
+                    delete aircraftTracks[hex];
+                }
+            } else if (aircraftTracks[hex]) {
+                aircraftTracks[hex].setLatLngs(coords);
+                aircraftTracks[hex].setStyle(trackStyle(entry));
+            } else {
+                aircraftTracks[hex] = L.polyline(coords, trackStyle(entry))
+                    .addTo(entry.kind === 'aircraft' ? trackLayer : pathLayer);
+            }
+        }
+        
+        // Redraw aircraft that changed, then refresh stats, alerts and the pattern list
+        function renderPatterns() {
+            if (liveStatus === null) {
+                return;
+            }
+            
+            // Get control states
+            const showAllAircraft = document.getElementById('showAllAircraft').checked;
+            const showTracks = document.getElementById('showTracks').checked;
+            const autoCenter = document.getElementById('autoCenter').checked;
+            
+            dirtyAircraft.forEach(hex => drawAircraft(hex, showAllAircraft, showTracks));
+            dirtyAircraft.clear();
+            
+            const circles = [];
+            const grids = [];
+            liveAircraft.forEach(entry => {
+                if (entry.kind === 'circle') {
+                    circles.push(entry);
+                } else if (entry.kind === 'grid') {
+                    grids.push(entry);
+                }
+            });
+            
+            // Update stats
+            document.getElementById('totalAircraft').textContent = liveStatus.aircraft_count;
+            document.getElementById('circleCount').textContent = circles.length;
+            document.getElementById('gridCount').textContent = grids.length;
+            document.getElementById('updateTime').textContent = 
+                'Updated: ' + new Date(liveStatus.timestamp).toLocaleTimeString();
+            
+            // Check for new patterns and send alerts
+            const currentCircles = new Set(circles.map(c => c.hex_id));
+            const currentGrids = new Set(grids.map(g => g.hex_id));
+            
+            if (hasInitialized) {
+                // Check for new circles
+                circles.forEach(circle => {
+                    if (!previousCircles.has(circle.hex_id)) {
+                        showNotification(
+                            'New Circle Pattern Detected',
+                            `${circle.callsign} - ${circle.turns.toFixed(1)} turns, ${circle.radius.toFixed(1)}km radius`,
+                            `circle-${circle.hex_id}`
+                        );
+                    }
+                });
                 
-            } catch (error) {
-                console.error('Error fetching patterns:', error);
+                // Check for new grids
+                grids.forEach(grid => {
+                    if (!previousGrids.has(grid.hex_id)) {
+                        showNotification(
+                            'New Grid Pattern Detected',
+                            `${grid.callsign} - ${grid.pattern_type}, ${grid.num_legs} legs`,
+                            `grid-${grid.hex_id}`
+                        );
+                    }
+                });
+            }
+            
+            previousCircles = currentCircles;
+            previousGrids = currentGrids;
+            hasInitialized = true;
+            
+            // Update pattern list
+            const patternList = document.getElementById('patternList');
+            patternList.innerHTML = '';
+            
+            circles.forEach(circle => {
+                const patternDiv = document.createElement('div');
+                patternDiv.className = 'pattern-item circle-pattern';
+                patternDiv.innerHTML = `
+                    <strong>🔴 ${circle.callsign}</strong><br>
+                    <small>${circle.turns.toFixed(1)} turns, ${circle.radius.toFixed(1)} km radius</small>
+                `;
+                patternDiv.onclick = () => {
+                    map.setView([circle.center_lat, circle.center_lon], 12);
+                };
+                patternList.appendChild(patternDiv);
+            });
+            
+            grids.forEach(grid => {
+                const patternDiv = document.createElement('div');
+                patternDiv.className = 'pattern-item grid-pattern';
+                patternDiv.innerHTML = `
+                    <strong>🟢 ${grid.callsign}</strong><br>
+                    <small>${grid.pattern_type}: ${grid.num_legs} legs, ${grid.coverage_area.toFixed(1)} km²</small>
+                `;
+                patternDiv.onclick = () => {
+                    map.setView([grid.center_lat, grid.center_lon], 11);
+                };
+                patternList.appendChild(patternDiv);
+            });
+            
+            // Update visible aircraft count
+            visibleAircraftCount = Object.keys(aircraftMarkers).length;
+            document.getElementById('visibleAircraft').textContent = visibleAircraftCount;
+            
+            // Auto-center on new patterns if enabled
+            if (autoCenter && hasInitialized) {
+                if (circles.length > 0) {
+                    const firstCircle = circles[0];
+                    if (!previousCircles.has(firstCircle.hex_id)) {
+                        map.setView([firstCircle.center_lat, firstCircle.center_lon], 12);
+                    }
+                } else if (grids.length > 0) {
+                    const firstGrid = grids[0];
+                    if (!previousGrids.has(firstGrid.hex_id)) {
+                        map.setView([firstGrid.center_lat, firstGrid.center_lon], 11);
+                    }
+                }
             }
         }
         
@@ -763,9 +1005,15 @@ MAP_HTML_TEMPLATE = '''
             return [[minLat, minLon], [maxLat, maxLon]];
         }
         
+        // Redraw every aircraft when the display options change
+        function redrawAll() {
+            liveAircraft.forEach((entry, hex) => dirtyAircraft.add(hex));
+            renderPatterns();
+        }
+        
         // Add event listeners for controls
-        document.getElementById('showAllAircraft').addEventListener('change', updatePatterns);
-        document.getElementById('showTracks').addEventListener('change', updatePatterns);
+        document.getElementById('showAllAircraft').addEventListener('change', redrawAll);
+        document.getElementById('showTracks').addEventListener('change', redrawAll);
         document.getElementById('showPatterns').addEventListener('change', (e) => {
             if (e.target.checked) {
                 map.addLayer(circleLayer);
@@ -778,9 +1026,24 @@ MAP_HTML_TEMPLATE = '''
             }
         });
         
-        // Update every 5 seconds
+        // Load the state for the current view, then follow the per-cycle change sets; poll
+        // every 5 seconds instead where server-sent events are unavailable. The snapshot
+        // only has aircraft in view and change sets are cut to it, so reload it when the
+        // view moves, and every 30 seconds to pick up aircraft that flew into view.
         updatePatterns();
-        setInterval(updatePatterns, 5000);
+        map.on('moveend', updatePatterns);
+        if (window.EventSource) {
+            const changeStream = new EventSource(baseUrl + '/api/patterns/stream');
+            changeStream.addEventListener('changes', event => applyChanges(JSON.parse(event.data)));
+            changeStream.onerror = () => {
+                if (changeStream.readyState === EventSource.CLOSED) {
+                    setInterval(updatePatterns, 5000);
+                }
+            };
+            setInterval(updatePatterns, 30000);
+        } else {
+            setInterval(updatePatterns, 5000);
+        }
     </script>
 </body>
 </html>
@@ -1503,22 +1766,44 @@ HISTORY_HTML_TEMPLATE = '''
 </html>
 '''
 
+import asyncio
+import bisect
 import requests
 import json
 import time
 import math
 import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from collections import defaultdict
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Tuple, Set
+from collections import defaultdict, deque
+from dataclasses import dataclass, asdict, field
+from typing import List, Dict, Optional, Tuple, Set, Union
 import argparse
+import cProfile
+import hmac
+import pstats
 import sys
+import weakref
+import zlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import csv
+import gzip
+import hashlib
+import struct
 from pathlib import Path
+from urllib.parse import urlparse
 import os
+import re
+import socket
 import shutil
-from flask import Flask, render_template_string, jsonify
+import numpy as np
+try:
+    import zstandard
+except ImportError:  # Only needed for zstd-compressed binCraft feeds
+    zstandard = None
+BINCRAFT_ERRORS = (ValueError, zstandard.ZstdError) if zstandard else (ValueError,)
+from flask import Flask, Response, g, jsonify, render_template_string, request
 from flask_cors import CORS
 from werkzeug.middleware.proxy_fix import ProxyFix
 import webbrowser
@@ -1533,11 +1818,183 @@ class Position:
     speed: Optional[int] = None
 
 
+# readsb writes "now" first in aircraft.json, so it can be read without parsing the whole file
+FEED_NOW_PATTERN = re.compile(rb'\s*\{\s*"now"\s*:\s*(-?[0-9]+(?:\.[0-9]*)?)')
+
+# Maximum points kept per aircraft track (600 s of 1 Hz positions)
+DEFAULT_TRACK_CAPACITY = 600
+
+
+class TrackBuffer:
+    """Fixed-capacity columnar ring buffer holding one aircraft's track.
+
+    Each field lives in its own NumPy array with some slack after the live
+    window. Appends write at the tail and the window is only moved back to
+    the start of the arrays when the tail runs out of room, so appends and
+    time-based evictions are O(1) amortized and the ``lat``/``lon``/
+    ``timestamps``/``altitudes``/``speeds`` views never copy. Indexing and
+    iteration still yield ``Position`` objects so the buffer can be used
+    anywhere a ``List[Position]`` was used before.
+    """
+
+    INITIAL_SIZE = 64  # Storage grows on demand up to capacity plus slack
+
+    def __init__(self, capacity: int = DEFAULT_TRACK_CAPACITY):
+        self.capacity = max(1, capacity)
+        self._max_size = self.capacity + max(1, self.capacity // 2)
+        self._allocate(min(self.INITIAL_SIZE, self._max_size))
+        self._head = 0
+        self._tail = 0
+        self.appended = 0  # Total points ever appended, used by incremental consumers
+        self.version = 0  # Bumped whenever the live window changes
+
+    @classmethod
+    def from_arrays(cls, lat: np.ndarray, lon: np.ndarray, timestamps: np.ndarray,
+                    capacity: Optional[int] = None) -> 'TrackBuffer':
+        """Build a buffer from position columns, with unknown altitudes and speeds."""
+        count = len(timestamps)
+        buffer = cls(capacity or max(count, 1))
+        if count > len(buffer._ts):
+            buffer._allocate(min(max(count, buffer.INITIAL_SIZE), buffer._max_size))
+        count = min(count, buffer.capacity)
+        buffer._lat[:count] = lat[len(lat) - count:]
+        buffer._lon[:count] = lon[len(lon) - count:]
+        buffer._ts[:count] = timestamps[len(timestamps) - count:]
+        buffer._alt[:count] = np.nan
+        buffer._speed[:count] = np.nan
+        buffer._tail = count
+        buffer.appended = count
+        buffer.version = 1 if count else 0
+        return buffer
+
+    def _allocate(self, size: int):
+        self._lat = np.empty(size)
+        self._lon = np.empty(size)
+        self._ts = np.empty(size)
+        self._alt = np.empty(size)
+        self._speed = np.empty(size)
+
+    def _make_room(self):
+        """Grow or compact storage so there is space after the tail."""
+        count = self._tail - self._head
+        size = len(self._ts)
+        columns = (self._lat, self._lon, self._ts, self._alt, self._speed)
+        if count > size // 2 and size < self._max_size:
+            self._allocate(min(size * 2, self._max_size))
+            for old, new in zip(columns, (self._lat, self._lon, self._ts, self._alt, self._speed)):
+                new[:count] = old[self._head:self._tail]
+        else:
+            for column in columns:
+                column[:count] = column[self._head:self._tail]
+        self._head = 0
+        self._tail = count
+
+    def append(self, position: Position):
+        """Append a position, dropping the oldest point when the buffer is full."""
+        if self._tail - self._head >= self.capacity:
+            self._head += 1
+        if self._tail == len(self._ts):
+            self._make_room()
+        i = self._tail
+        self._lat[i] = position.lat
+        self._lon[i] = position.lon
+        self._ts[i] = position.timestamp
+        self._alt[i] = np.nan if position.altitude is None else position.altitude
+        self._speed[i] = np.nan if position.speed is None else position.speed
+        self._tail = i + 1
+        self.appended += 1
+        self.version += 1
+
+    def evict_before(self, cutoff_time: float) -> int:
+        """Drop points older than cutoff_time. Returns the number of points evicted."""
+        evicted = int(np.searchsorted(self._ts[self._head:self._tail], cutoff_time, side='left'))
+        if evicted:
+            self._head += evicted
+            self.version += 1
+        if self._head == self._tail:
+            self._head = self._tail = 0
+        return evicted
+
+    def _view(self, column: np.ndarray) -> np.ndarray:
+        view = column[self._head:self._tail]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def lat(self) -> np.ndarray:
+        return self._view(self._lat)
+
+    @property
+    def lon(self) -> np.ndarray:
+        return self._view(self._lon)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._view(self._ts)
+
+    @property
+    def altitudes(self) -> np.ndarray:
+        """Altitudes in feet, NaN where unknown."""
+        return self._view(self._alt)
+
+    @property
+    def speeds(self) -> np.ndarray:
+        """Ground speeds in knots, NaN where unknown."""
+        return self._view(self._speed)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for point storage."""
+        return 5 * self._ts.nbytes
+
+    @staticmethod
+    def _optional(value: float) -> Optional[float]:
+        return None if value != value else value  # NaN marks a missing value
+
+    def _positions(self, start: int, stop: int) -> List[Position]:
+        optional = self._optional
+        return [
+            Position(lat, lon, ts, optional(alt), optional(speed))
+            for lat, lon, ts, alt, speed in zip(
+                self._lat[start:stop].tolist(), self._lon[start:stop].tolist(),
+                self._ts[start:stop].tolist(), self._alt[start:stop].tolist(),
+                self._speed[start:stop].tolist()
+            )
+        ]
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def __iter__(self):
+        return iter(self._positions(self._head, self._tail))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._positions(self._head + start, self._head + max(start, stop))
+        
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('track index out of range')
+        i = self._head + index
+        return Position(
+            lat=float(self._lat[i]),
+            lon=float(self._lon[i]),
+            timestamp=float(self._ts[i]),
+            altitude=self._optional(float(self._alt[i])),
+            speed=self._optional(float(self._speed[i]))
+        )
+
+
 @dataclass
 class Aircraft:
     hex_id: str
     callsign: str
-    path: List[Position]
+    path: TrackBuffer
     last_update: float
     type: Optional[str] = None
     category: Optional[str] = None
@@ -1599,6 +2056,116 @@ class GridLog:
     tar1090_url: str
 
 
+@dataclass(frozen=True)
+class DetectionSnapshot:
+    """Circle and grid detections computed once for a single ingest cycle."""
+    cycle: int
+    circles: List[Tuple[Aircraft, CircleDetection]]
+    grids: List[Tuple[Aircraft, GridDetection]]
+    computed_at: float
+    timestamp: str  # When the cycle was ingested, ISO format; the map's 'timestamp'
+
+
+@dataclass(frozen=True)
+class HealthRecord:
+    """Monitor status published by the monitoring loop after every cycle.
+
+    /api/health serves the latest record as it is, so a health check never
+    runs the detectors or waits on a lock the monitoring loop holds.
+    """
+    published_at: float
+    cycle: int
+    cycle_seconds: float
+    last_update: float  # 0 until a snapshot has been received
+    aircraft_count: int
+    active_circles: int
+    active_grids: int
+    total_requests: int
+    failed_requests: int
+    failure_rate: float
+    details: Dict  # Feed, detection cache, pipeline and stream statistics; never modified once published
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """A response serialized and gzipped once, then shared by every request in its cycle."""
+    cycle: int
+    body: bytes
+    gzip_body: bytes
+    etag: str  # Hash of the body, so it can never match a different payload, even after a restart
+    mimetype: str = 'application/json'
+
+    @classmethod
+    def encode(cls, cycle: int, data, columnar: bool = False) -> 'EncodedPayload':
+        """JSON, or with columnar the compact encoding of a /api/patterns payload."""
+        body = encode_columnar(data) if columnar else json.dumps(data, separators=(',', ':')).encode()
+        return cls(cycle=cycle, body=body, gzip_body=gzip.compress(body, compresslevel=6),
+                   etag=hashlib.blake2b(body, digest_size=16).hexdigest(),
+                   mimetype=COLUMNAR_MEDIA_TYPE if columnar else 'application/json')
+
+
+# Compact /api/patterns encoding, chosen with ?format=columnar or an Accept header naming the media type:
+#
+#   b'ACP1'                magic and version
+#   uint32, little-endian  length of the header
+#   header                 UTF-8 JSON: the payload's other fields under 'fields', and under 'lists'
+#                          each entry list as {'columns': {key: [value per entry]}, 'points': [path length
+#                          per entry]}, plus 'time_base'
+#   lat, lon, alt, time    the path points of every list in turn, one column after another, each a
+#                          zigzag varint per point of the difference from the previous point
+#
+# Coordinates are in units of COORDINATE_SCALE, altitudes in whole feet (NO_ALTITUDE for none) and
+# times in milliseconds after time_base.
+COLUMNAR_MEDIA_TYPE = 'application/vnd.aircraft-patterns.columnar'
+COLUMNAR_MAGIC = b'ACP1'
+COORDINATE_SCALE = 100_000  # 1e-5 degree, about a meter
+NO_ALTITUDE = -1_000_000
+
+
+def zigzag_varints(values: np.ndarray) -> bytes:
+    """Signed integers as zigzag LEB128 varints: 7 bits a byte, low bits first, so small values of
+    either sign take one byte."""
+    values = values.astype(np.int64)
+    zigzag = ((values << 1) ^ (values >> 63)).astype(np.uint64)
+    shifts = np.arange(10, dtype=np.uint64) * np.uint64(7)
+    groups = ((zigzag[:, None] >> shifts) & np.uint64(0x7f)).astype(np.uint8)
+    lengths = 1 + np.count_nonzero(zigzag[:, None] >> shifts[1:], axis=1)
+    byte = np.arange(10)
+    groups[byte < (lengths - 1)[:, None]] |= 0x80  # Continuation bit on all but the last byte
+    return groups[byte < lengths[:, None]].tobytes()
+
+
+def encode_columnar(data: Dict) -> bytes:
+    """A /api/patterns payload in the compact encoding described above."""
+    header = {'fields': {}, 'lists': {}, 'time_base': None}
+    points = []
+    for key, value in data.items():
+        if key in ('circles', 'grids', 'all_aircraft'):
+            columns = dict.fromkeys(name for entry in value for name in entry if name != 'path')
+            header['lists'][key] = {
+                'columns': {name: [entry.get(name) for entry in value] for name in columns},
+                'points': [len(entry['path']) for entry in value]
+            }
+            points.extend(point for entry in value for point in entry['path'])
+        else:
+            header['fields'][key] = value
+    
+    lats = np.array([point['lat'] for point in points], dtype=float)
+    lons = np.array([point['lon'] for point in points], dtype=float)
+    alts = np.array([NO_ALTITUDE if point['alt'] is None else point['alt'] for point in points], dtype=float)
+    times = np.array([point['time'] for point in points], dtype=float)
+    if points:
+        header['time_base'] = float(times.min())
+        times -= header['time_base']
+    
+    header_bytes = json.dumps(header, separators=(',', ':')).encode()
+    parts = [COLUMNAR_MAGIC, struct.pack('<I', len(header_bytes)), header_bytes]
+    for column in (lats * COORDINATE_SCALE, lons * COORDINATE_SCALE, alts, times * 1000):
+        quantized = np.round(column).astype(np.int64)
+        parts.append(zigzag_varints(np.diff(quantized, prepend=0)))
+    return b''.join(parts)
+
+
 class GridDetector:
     def __init__(self, min_legs=3, min_leg_length=2.0, max_turn_angle=45, time_window=600):
         self.min_legs = min_legs  # Minimum parallel legs for detection
@@ -1785,6 +2352,9 @@ class GridDetector:
         if len(flight_path) < 20:
             return GridDetection(False, '', 0, 0, 0, 0, 0, 0)
         
+        # Materialize track buffers once; the steps below index points repeatedly
+        flight_path = list(flight_path)
+        
         # Find turns in the path
         turns = self.detect_turns(flight_path)
         
@@ -1859,16 +2429,17 @@ class GridDetector:
 
 
 class CircleDetector:
-    def __init__(self, min_radius=0.5, max_radius=10.0, min_turns=1.5, time_window=300):
+    def __init__(self, min_radius=0.5, max_radius=10.0, min_turns=1.5, time_window=300, smoothing_window=3):
         self.min_radius = min_radius  # km
         self.max_radius = max_radius  # km
         self.min_turns = min_turns  # number of complete turns
         self.time_window = time_window  # seconds
+        self.smoothing_window = smoothing_window  # points, 0 or 1 disables smoothing
     
     @staticmethod
     def smooth_path(path: List[Position], window_size: int = 3) -> List[Position]:
         """Apply simple moving average smoothing to reduce noise."""
-        if len(path) < window_size:
+        if window_size <= 1 or len(path) < window_size:
             return path
         
         smoothed = []
@@ -1929,9 +2500,12 @@ class CircleDetector:
         if len(flight_path) < 10:
             return CircleDetection(False, 0, 0, 0, 0)
         
+        # Materialize track buffers once; smoothing slices the path for every point
+        flight_path = list(flight_path)
+        
         # Apply smoothing to reduce noise in circle detection
         # Only smooth for detection, keep original path for display
-        smoothed_path = self.smooth_path(flight_path)
+        smoothed_path = self.smooth_path(flight_path, self.smoothing_window)
 
         # Calculate center point (average of all positions)
         # Use smoothed path for center calculation
@@ -1978,40 +2552,2078 @@ class CircleDetector:
         return CircleDetection(is_circling, center_lat, center_lon, avg_distance, complete_turns)
 
 
-class TAR1090Monitor:
-    def __init__(self, server_url: str, update_interval: int = 5):
-        self.server_url = server_url.rstrip('/')
-        self.update_interval = update_interval
-        self.aircraft: Dict[str, Aircraft] = {}
-        self.detector = CircleDetector()
-        self.grid_detector = GridDetector()
-        self.running = False
-        self.session = requests.Session()
-        self.session.timeout = 10
-        
-        # Data quality settings
-        self.max_speed_kmh = 1000  # Max realistic speed in km/h (about 540 knots)
-        self.max_position_jump_km = 5.0  # Max distance jump between updates
-        self.min_update_interval = 0.5  # Min seconds between position updates
+def track_arrays(flight_path) -> Tuple[np.ndarray, np.ndarray]:
+    """Get latitude and longitude arrays for a track buffer or list of positions."""
+    if isinstance(flight_path, TrackBuffer):
+        return flight_path.lat, flight_path.lon
+    count = len(flight_path)
+    lats = np.fromiter((p.lat for p in flight_path), dtype=float, count=count)
+    lons = np.fromiter((p.lon for p in flight_path), dtype=float, count=count)
+    return lats, lons
 
-        # Statistics
-        self.total_requests = 0
-        self.failed_requests = 0
-        self.last_update = None
+
+def haversine_array(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Vectorized CircleDetector.calculate_distance."""
+    R = 6371  # Earth's radius in km
+    
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    delta_lat = np.radians(lat2 - lat1)
+    delta_lon = np.radians(lon2 - lon1)
+    
+    a = (np.sin(delta_lat / 2) * np.sin(delta_lat / 2) +
+         np.cos(lat1_rad) * np.cos(lat2_rad) *
+         np.sin(delta_lon / 2) * np.sin(delta_lon / 2))
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    return R * c
+
+
+def bearing_array(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Vectorized CircleDetector.calculate_bearing."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    delta_lon = np.radians(lon2 - lon1)
+    
+    y = np.sin(delta_lon) * np.cos(lat2_rad)
+    x = (np.cos(lat1_rad) * np.sin(lat2_rad) -
+         np.sin(lat1_rad) * np.cos(lat2_rad) * np.cos(delta_lon))
+    
+    bearing = np.arctan2(y, x)
+    return (np.degrees(bearing) + 360) % 360
+
+
+class VectorizedCircleDetector(CircleDetector):
+    """NumPy implementation of CircleDetector.
+    
+    Smoothing, centroid, distance statistics and bearing accumulation run as
+    array operations, reading TrackBuffer views without copying. Results match
+    CircleDetector to within a relative tolerance of 1e-9; the only difference
+    is floating point summation order.
+    """
+    
+    @staticmethod
+    def smooth_arrays(lats: np.ndarray, lons: np.ndarray, window_size: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+        """Moving average over the same truncated windows as CircleDetector.smooth_path."""
+        count = len(lats)
+        if window_size <= 1 or count < window_size:
+            return lats, lons
+        
+        half = window_size // 2
+        sum_lat = np.zeros(count)
+        sum_lon = np.zeros(count)
+        window_len = np.zeros(count)
+        # Add neighbours in the same left-to-right order the Python detector sums them
+        for offset in range(-half, half + 1):
+            src_start = max(0, offset)
+            src_end = min(count, count + offset)
+            dst = slice(src_start - offset, src_end - offset)
+            sum_lat[dst] += lats[src_start:src_end]
+            sum_lon[dst] += lons[src_start:src_end]
+            window_len[dst] += 1
+        return sum_lat / window_len, sum_lon / window_len
+    
+    def detect_circling(self, flight_path: List[Position]) -> CircleDetection:
+        """Detect if an aircraft is performing circular flight patterns."""
+        if len(flight_path) < 10:
+            return CircleDetection(False, 0, 0, 0, 0)
         
-        # Logging
-        self.circle_logs: List[CircleLog] = []
-        self.grid_logs: List[GridLog] = []
-        self.active_circles: Set[str] = set()  # Track aircraft currently circling
-        self.active_grids: Set[str] = set()  # Track aircraft currently in grid patterns
-        self.circle_start_times: Dict[str, float] = {}  # Track when circling started
-        self.grid_start_times: Dict[str, float] = {}  # Track when grid pattern started
-        # Use data directory for persistent storage
-        self.data_dir = Path("/app/data")
+        lats, lons = track_arrays(flight_path)
+        lats, lons = self.smooth_arrays(lats, lons, self.smoothing_window)
+        
+        center_lat = float(lats.mean())
+        center_lon = float(lons.mean())
+        
+        distances = haversine_array(center_lat, center_lon, lats, lons)
+        avg_distance = float(distances.mean())
+        std_dev = float(np.sqrt(np.mean((distances - avg_distance) ** 2)))
+        
+        if std_dev > avg_distance * 0.5:  # More than 50% deviation
+            return CircleDetection(False, center_lat, center_lon, avg_distance, 0)
+        
+        if avg_distance < self.min_radius or avg_distance > self.max_radius:
+            return CircleDetection(False, center_lat, center_lon, avg_distance, 0)
+        
+        # Unwrap bearing changes into [-180, 180] and accumulate their magnitude
+        bearings = bearing_array(center_lat, center_lon, lats, lons)
+        diffs = np.diff(bearings)
+        diffs = np.where(diffs > 180, diffs - 360, np.where(diffs < -180, diffs + 360, diffs))
+        complete_turns = float(np.abs(diffs).sum()) / 360
+        is_circling = complete_turns >= self.min_turns
+        
+        return CircleDetection(is_circling, center_lat, center_lon, avg_distance, complete_turns)
+
+
+class IncrementalCircleState:
+    """Running sums describing one aircraft's track for IncrementalCircleDetector.
+    
+    Points are projected to a local flat-earth plane in km. The state keeps
+    additive moments of the projected points (enough to derive the centroid,
+    mean squared distance from it and the variance of squared distance) plus
+    the signed bearing change between consecutive points, measured around the
+    centroid as it stood when each point arrived. Additions and evictions
+    adjust the sums in O(1), so syncing with a TrackBuffer costs time
+    proportional to the points added since the last sync.
+    """
+    
+    KM_PER_DEG = 6371 * math.pi / 180
+    REBASE_KM = 20.0  # Re-center the sums once the centroid drifts this far from the origin
+    
+    def __init__(self):
+        self.appended = 0  # TrackBuffer.appended at the last sync
+        self.points = deque()  # (x, y, turn) per point in the window
+        self.ref_lat = None
+        self.ref_lon = None
+        self.km_per_deg_lon = 0.0
+        self.offset_x = 0.0  # Origin shift applied by rebasing, in km
+        self.offset_y = 0.0
+        self._reset_sums()
+    
+    def _reset_sums(self):
+        self.sx = self.sy = 0.0
+        self.sxx = self.syy = self.sxy = 0.0
+        self.sxr2 = self.syr2 = self.sr4 = 0.0
+        self.turn_sum = 0.0  # Signed bearing change over the window, in degrees
+    
+    def _add_moments(self, x: float, y: float, sign: float):
+        r2 = x * x + y * y
+        self.sx += sign * x
+        self.sy += sign * y
+        self.sxx += sign * x * x
+        self.syy += sign * y * y
+        self.sxy += sign * x * y
+        self.sxr2 += sign * x * r2
+        self.syr2 += sign * y * r2
+        self.sr4 += sign * r2 * r2
+    
+    def _evict(self):
+        x, y, _ = self.points.popleft()
+        self._add_moments(x, y, -1.0)
+        if self.points:
+            # The new first point's bearing change was measured from the evicted point
+            nx, ny, turn = self.points[0]
+            self.turn_sum -= turn
+            self.points[0] = (nx, ny, 0.0)
+    
+    def _rebase(self, cx: float, cy: float):
+        """Shift the origin to (cx, cy) and recompute the moments exactly."""
+        self.offset_x += cx
+        self.offset_y += cy
+        self.points = deque((x - cx, y - cy, turn) for x, y, turn in self.points)
+        turn_sum = self.turn_sum
+        self._reset_sums()
+        self.turn_sum = turn_sum
+        for x, y, _ in self.points:
+            self._add_moments(x, y, 1.0)
+    
+    def _append(self, lats: List[float], lons: List[float]):
+        if self.ref_lat is None:
+            self.ref_lat, self.ref_lon = lats[0], lons[0]
+            self.km_per_deg_lon = self.KM_PER_DEG * math.cos(math.radians(lats[0]))
+        projected = [
+            ((lon - self.ref_lon) * self.km_per_deg_lon - self.offset_x,
+             (lat - self.ref_lat) * self.KM_PER_DEG - self.offset_y)
+            for lat, lon in zip(lats, lons)
+        ]
+        for x, y in projected:
+            self._add_moments(x, y, 1.0)
+        
+        # Measure bearing changes around the centroid including the new points
+        n = len(self.points) + len(projected)
+        cx, cy = self.sx / n, self.sy / n
+        last_bearing = None
+        if self.points:
+            last_x, last_y, _ = self.points[-1]
+            last_bearing = math.degrees(math.atan2(last_x - cx, last_y - cy))
+        for x, y in projected:
+            bearing = math.degrees(math.atan2(x - cx, y - cy))
+            turn = 0.0
+            if last_bearing is not None:
+                turn = bearing - last_bearing
+                if turn > 180:
+                    turn -= 360
+                elif turn < -180:
+                    turn += 360
+                self.turn_sum += turn
+            self.points.append((x, y, turn))
+            last_bearing = bearing
+    
+    def sync(self, track: 'TrackBuffer'):
+        """Apply points appended to and evicted from track since the last sync."""
+        new_points = track.appended - self.appended
+        self.appended = track.appended
+        count = len(track)
+        drop = len(self.points) + new_points - count
+        if drop >= len(self.points):
+            # Everything we held has been evicted; start over from the live window
+            self.points.clear()
+            self.offset_x = self.offset_y = 0.0
+            self.ref_lat = None
+            self._reset_sums()
+            new_points = count
+        else:
+            for _ in range(drop):
+                self._evict()
+        if new_points:
+            self._append(track.lat[-new_points:].tolist(), track.lon[-new_points:].tolist())
+        
+        n = len(self.points)
+        if n and math.hypot(self.sx / n, self.sy / n) > self.REBASE_KM:
+            self._rebase(self.sx / n, self.sy / n)
+    
+    def detection(self, detector: 'CircleDetector') -> CircleDetection:
+        """Build a CircleDetection from the running sums."""
+        n = len(self.points)
+        cx, cy = self.sx / n, self.sy / n
+        center_lat = self.ref_lat + (cy + self.offset_y) / self.KM_PER_DEG
+        center_lon = self.ref_lon + (cx + self.offset_x) / self.km_per_deg_lon
+        
+        # Moments of squared distance d2 = |p - c|^2 around the centroid
+        c2 = cx * cx + cy * cy
+        exx, eyy, exy = self.sxx / n, self.syy / n, self.sxy / n
+        mean_d2 = max(exx + eyy - c2, 0.0)
+        mean_d4 = (self.sr4 / n
+                   - 4 * (cx * self.sxr2 + cy * self.syr2) / n
+                   + 4 * (cx * cx * exx + 2 * cx * cy * exy + cy * cy * eyy)
+                   + 2 * c2 * (exx + eyy)
+                   - 3 * c2 * c2)
+        var_d2 = max(mean_d4 - mean_d2 * mean_d2, 0.0)
+        
+        # Delta-method estimates of the mean and spread of the distance itself
+        avg_distance = math.sqrt(mean_d2)
+        std_dev = math.sqrt(var_d2) / (2 * avg_distance) if avg_distance > 0 else 0.0
+        
+        if std_dev > avg_distance * 0.5:  # More than 50% deviation
+            return CircleDetection(False, center_lat, center_lon, avg_distance, 0)
+        
+        if avg_distance < detector.min_radius or avg_distance > detector.max_radius:
+            return CircleDetection(False, center_lat, center_lon, avg_distance, 0)
+        
+        complete_turns = abs(self.turn_sum) / 360
+        is_circling = complete_turns >= detector.min_turns
+        
+        return CircleDetection(is_circling, center_lat, center_lon, avg_distance, complete_turns)
+
+
+class IncrementalCircleDetector(CircleDetector):
+    """Circle detector that keeps running sums per track instead of rescanning it.
+    
+    Each TrackBuffer gets an IncrementalCircleState that is brought up to date
+    with only the points added or evicted since the previous call. Turns are
+    the net signed bearing change around the centroid, the radius is the RMS
+    distance from the centroid and no smoothing is applied, so results are
+    close to, but not identical with, CircleDetector. Plain position lists
+    fall back to the batch detector.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._states = weakref.WeakKeyDictionary()
+
+    def __getstate__(self):
+        # Per-track state is tied to buffers in this process, so it is not shipped
+        state = self.__dict__.copy()
+        del state['_states']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._states = weakref.WeakKeyDictionary()
+
+    def detect_circling(self, flight_path: List[Position]) -> CircleDetection:
+        """Detect if an aircraft is performing circular flight patterns."""
+        if len(flight_path) < 10:
+            return CircleDetection(False, 0, 0, 0, 0)
+        
+        if not isinstance(flight_path, TrackBuffer):
+            return super().detect_circling(flight_path)
+        
+        state = self._states.get(flight_path)
+        if state is None:
+            state = self._states[flight_path] = IncrementalCircleState()
+        state.sync(flight_path)
+        return state.detection(self)
+
+
+class VectorizedGridDetector(GridDetector):
+    """NumPy implementation of GridDetector.
+    
+    Windowed chord vectors for every point are computed in one pass, turns
+    are found with a mask, legs are derived from the turn indices and
+    parallel legs are grouped by binning their bearing modulo 180 degrees.
+    Turn angles use a local flat-earth approximation, so a turn within a
+    hundredth of a degree of the 60 degree threshold may be classified
+    differently; leg bearings and lengths are great-circle values as in
+    GridDetector. Grouping uses fixed bins instead of the greedy first-leg
+    grouping, so borderline legs can be grouped differently.
+    """
+    
+    TURN_WINDOW = 3  # Points to average for bearing calculation
+    
+    def _turn_indices(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Return the indices of significant turns (> 60 degrees) in the path."""
+        window = self.TURN_WINDOW
+        if len(lats) < 5 or len(lats) <= 2 * window:
+            return np.empty(0, dtype=int)
+        
+        # Chord j runs from point j to point j + window. The turn at i is the
+        # angle between chords i - window and i, and it exceeds 60 degrees
+        # exactly when the cosine of that angle is below 0.5. Chords span a
+        # few hundred metres, so local flat-earth vectors agree with the
+        # great-circle bearings to well under a hundredth of a degree without
+        # any inverse trigonometry.
+        # In-place operations keep temporaries to a minimum on fleet-sized arrays.
+        d_north = lats[window:] - lats[:-window]
+        d_east = lons[window:] - lons[:-window]
+        # Single precision is plenty for the longitude scale factor and much cheaper
+        cos_lat = np.radians(lats[:-window], dtype=np.float32)
+        np.cos(cos_lat, out=cos_lat)
+        d_east *= cos_lat
+        
+        chord_sq = d_north * d_north
+        chord_sq += d_east * d_east
+        # calculate_bearing gives a zero-length chord a bearing of 0, so it points north here too
+        zero = chord_sq == 0
+        d_north[zero] = 1.0
+        chord_sq[zero] = 1.0
+        dot = d_north[:-window] * d_north[window:]
+        dot += d_east[:-window] * d_east[window:]
+        limit = chord_sq[:-window] * chord_sq[window:]
+        np.sqrt(limit, out=limit)
+        limit *= 0.5
+        return np.flatnonzero(dot < limit) + window
+    
+    def _legs(self, lats: np.ndarray, lons: np.ndarray, turn_idx: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Return (start, end, bearing, length) arrays for legs between turns."""
+        count = len(lats)
+        starts = [turn_idx[:-1]]
+        ends = [turn_idx[1:]]
+        keep = [(turn_idx[1:] - turn_idx[:-1]) > 3]  # Need at least a few points
+        if turn_idx[0] > 5:
+            starts.insert(0, np.array([0]))
+            ends.insert(0, turn_idx[:1])
+            keep.insert(0, np.array([True]))
+        if count - turn_idx[-1] > 5:
+            starts.append(turn_idx[-1:])
+            ends.append(np.array([count - 1]))
+            keep.append(np.array([True]))
+        
+        keep_mask = np.concatenate(keep)
+        start = np.concatenate(starts)[keep_mask]
+        end = np.concatenate(ends)[keep_mask]
+        bearing = bearing_array(lats[start], lons[start], lats[end], lons[end])
+        length = haversine_array(lats[start], lons[start], lats[end], lons[end])
+        long_enough = length >= self.min_leg_length
+        return start[long_enough], end[long_enough], bearing[long_enough], length[long_enough]
+    
+    def _parallel_groups(self, bearings: np.ndarray) -> List[np.ndarray]:
+        """Group leg indices by bearing modulo 180 using two offset sets of bins."""
+        if len(bearings) < 2:
+            return []
+        
+        # Bins are as wide as the greedy grouping's tolerance on either side
+        # of a leg. A second set offset by half a bin keeps legs near a bin
+        # edge together; the set producing the largest group wins.
+        width = min(2 * self.max_turn_angle, 180)
+        num_bins = max(1, int(round(180 / width)))
+        width = 180 / num_bins
+        axes = bearings % 180
+        best_bins, best_counts = None, None
+        for offset in (0, width / 2):
+            bins = (((axes + offset) % 180) // width).astype(int) % num_bins
+            counts = np.bincount(bins, minlength=num_bins)
+            if best_counts is None or counts.max() > best_counts.max():
+                best_bins, best_counts = bins, counts
+        return [np.flatnonzero(best_bins == b) for b in np.flatnonzero(best_counts >= self.min_legs)]
+    
+    def detect_turns(self, path: List[Position]) -> List[Tuple[int, float, float]]:
+        """Detect significant turns in the flight path."""
+        lats, lons = track_arrays(path)
+        idx = self._turn_indices(lats, lons)
+        window = self.TURN_WINDOW
+        before = bearing_array(lats[idx - window], lons[idx - window], lats[idx], lons[idx])
+        after = bearing_array(lats[idx], lons[idx], lats[idx + window], lons[idx + window])
+        return list(zip(idx.tolist(), before.tolist(), after.tolist()))
+    
+    def identify_legs(self, path: List[Position], turns: List[Tuple[int, float, float]]) -> List[Tuple[int, int, float, float]]:
+        """Identify straight legs between turns."""
+        if not turns:
+            return []
+        lats, lons = track_arrays(path)
+        start, end, bearing, length = self._legs(lats, lons, np.array([t[0] for t in turns]))
+        return list(zip(start.tolist(), end.tolist(), bearing.tolist(), length.tolist()))
+    
+    def find_parallel_legs(self, legs: List[Tuple[int, int, float, float]]) -> List[List[int]]:
+        """Group legs that are roughly parallel to each other."""
+        groups = self._parallel_groups(np.array([leg[2] for leg in legs], dtype=float))
+        return [g.tolist() for g in groups]
+    
+    def detect_grid_pattern(self, flight_path: List[Position]) -> GridDetection:
+        """Detect if an aircraft is flying a grid pattern."""
+        if len(flight_path) < 20:
+            return GridDetection(False, '', 0, 0, 0, 0, 0, 0)
+        
+        lats, lons = track_arrays(flight_path)
+        return self._detect_from_turns(lats, lons, self._turn_indices(lats, lons))
+    
+    def detect_fleet(self, flight_paths: List[List[Position]]) -> List[GridDetection]:
+        """Run detect_grid_pattern over many tracks with one pass of turn detection.
+        
+        All tracks are concatenated so the turn mask is computed in a single
+        set of array operations; only tracks with at least two turns, usually
+        a small fraction of the fleet, need any further per-track work.
+        """
+        results = [GridDetection(False, '', 0, 0, 0, 0, 0, 0) for _ in flight_paths]
+        candidates = [i for i, path in enumerate(flight_paths) if len(path) >= 20]
+        if not candidates:
+            return results
+        
+        arrays = [track_arrays(flight_paths[i]) for i in candidates]
+        lengths = np.array([len(lats) for lats, _ in arrays])
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        all_lats = np.concatenate([lats for lats, _ in arrays])
+        all_lons = np.concatenate([lons for _, lons in arrays])
+        
+        # Keep only turns whose chords lie entirely within a single track
+        window = self.TURN_WINDOW
+        turns = self._turn_indices(all_lats, all_lons)
+        owner = np.searchsorted(offsets, turns, side='right') - 1
+        local = turns - offsets[owner]
+        valid = (local >= window) & (local < lengths[owner] - window)
+        owner, local = owner[valid], local[valid]
+        counts = np.bincount(owner, minlength=len(candidates))
+        
+        for k in np.flatnonzero(counts >= 2).tolist():
+            lats, lons = arrays[k]
+            results[candidates[k]] = self._detect_from_turns(lats, lons, local[owner == k])
+        return results
+    
+    def _detect_from_turns(self, lats: np.ndarray, lons: np.ndarray, turn_idx: np.ndarray) -> GridDetection:
+        """Classify a track given the indices of its significant turns."""
+        if len(turn_idx) < 2:
+            return GridDetection(False, '', 0, 0, 0, 0, 0, 0)
+        
+        start, end, bearing, _ = self._legs(lats, lons, turn_idx)
+        if len(start) < self.min_legs:
+            return GridDetection(False, '', 0, 0, 0, 0, 0, 0)
+        
+        groups = self._parallel_groups(bearing)
+        if not groups:
+            return GridDetection(False, '', 0, 0, 0, 0, 0, 0)
+        
+        largest_group = max(groups, key=len)
+        main_bearing = float(bearing[largest_group].mean())
+        
+        # Spacing between consecutive parallel legs, measured at leg midpoints
+        mid = (start[largest_group] + end[largest_group]) // 2
+        spacings = haversine_array(lats[mid[:-1]], lons[mid[:-1]], lats[mid[1:]], lons[mid[1:]])
+        avg_spacing = float(spacings.mean()) if len(spacings) else 0
+        
+        center_lat = float(lats.mean())
+        center_lon = float(lons.mean())
+        
+        if len(largest_group) >= 4 and avg_spacing < 2.0:
+            pattern_type = 'survey'
+        elif len(turn_idx) > len(start) * 1.5:
+            pattern_type = 'racetrack'
+        else:
+            pattern_type = 'parallel_lines'
+        
+        return GridDetection(
+            is_grid_pattern=True,
+            pattern_type=pattern_type,
+            grid_bearing=main_bearing,
+            line_spacing=avg_spacing,
+            num_legs=len(largest_group),
+            coverage_area=self._coverage_area(lats, lons, len(start)),
+            center_lat=center_lat,
+            center_lon=center_lon
+        )
+    
+    def _coverage_area(self, lats: np.ndarray, lons: np.ndarray, num_legs: int) -> float:
+        """Bounding box area of a detected pattern, as calculate_coverage_area computes it."""
+        if num_legs < 2:
+            return 0
+        min_lat, max_lat = float(lats.min()), float(lats.max())
+        min_lon, max_lon = float(lons.min()), float(lons.max())
+        return (self.calculate_distance(min_lat, min_lon, max_lat, min_lon) *
+                self.calculate_distance(min_lat, min_lon, min_lat, max_lon))
+
+
+# Detector implementations, by backend name; benchmark.py and accuracy.py can run any of them
+CIRCLE_DETECTORS = {
+    'python': CircleDetector,
+    'numpy': VectorizedCircleDetector,
+    'incremental': IncrementalCircleDetector,
+}
+GRID_DETECTORS = {
+    'python': GridDetector,
+    'numpy': VectorizedGridDetector,
+    'incremental': VectorizedGridDetector,  # Grid detection has no incremental variant
+}
+# Backends the monitor offers with --detector-backend. 'incremental' is left out
+# until accuracy.py accepts it: it decides differently from the Python detectors
+# on about one track in seven of the default corpus
+MONITOR_BACKENDS = ('python', 'numpy')
+
+
+# Detectors installed in each worker process by _init_detection_worker
+_worker_detectors: Dict[str, object] = {}
+
+# Each worker's copies of the tracks sharded to it, by hex id. Shipped tracks are
+# applied to these rather than rebuilt, so detectors that keep per-track state
+# (IncrementalCircleDetector) find it again on the next cycle
+_worker_tracks: Dict[str, TrackBuffer] = {}
+WORKER_TRACK_TTL = 3600  # Seconds without new points before a worker forgets a track
+
+
+def _init_detection_worker(circle_detector: CircleDetector, grid_detector: GridDetector):
+    """Install the monitor's detectors in a freshly started worker process."""
+    _worker_detectors['circle'] = circle_detector
+    _worker_detectors['grid'] = grid_detector
+
+
+def _worker_track(hex_id: str, lat: np.ndarray, lon: np.ndarray, timestamps: np.ndarray) -> TrackBuffer:
+    """This worker's copy of a track, brought up to date with the shipped columns."""
+    track = _worker_tracks.get(hex_id)
+    if track is not None and len(track) and len(timestamps):
+        # Apply only what changed since the last cycle: evictions, then new points
+        track.evict_before(timestamps[0])
+        last = track.timestamps[-1] if len(track) else -math.inf
+        for i in range(int(np.searchsorted(timestamps, last, side='right')), len(timestamps)):
+            track.append(Position(float(lat[i]), float(lon[i]), float(timestamps[i])))
+        if len(track) == len(timestamps) and track.timestamps[0] == timestamps[0] and track.timestamps[-1] == timestamps[-1]:
+            return track
+    # New to this worker, or the copy no longer lines up (for example after a gap)
+    track = _worker_tracks[hex_id] = TrackBuffer.from_arrays(lat, lon, timestamps,
+                                                             max(2 * len(timestamps), DEFAULT_TRACK_CAPACITY))
+    return track
+
+
+def _detect_shard(kind: str, hex_ids: List[str], lengths: np.ndarray, lat: np.ndarray, lon: np.ndarray,
+                  timestamps: np.ndarray) -> List:
+    """Run one detector over a shard of tracks packed end to end into flat arrays."""
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    paths = [
+        _worker_track(hex_id, lat[start:stop], lon[start:stop], timestamps[start:stop])
+        for hex_id, start, stop in zip(hex_ids, bounds[:-1].tolist(), bounds[1:].tolist())
+    ]
+    if len(timestamps):
+        cutoff = timestamps.max() - WORKER_TRACK_TTL
+        for hex_id in [h for h, track in _worker_tracks.items() if not len(track) or track.timestamps[-1] < cutoff]:
+            del _worker_tracks[hex_id]
+    detector = _worker_detectors[kind]
+    if kind == 'circle':
+        return [detector.detect_circling(path) for path in paths]
+    if hasattr(detector, 'detect_fleet'):
+        return detector.detect_fleet(paths)
+    return [detector.detect_grid_pattern(path) for path in paths]
+
+
+class DetectionWorkerPool:
+    """Runs circle and grid detection in a pool of worker processes.
+
+    Aircraft are sharded across workers by ICAO hex so a given aircraft
+    always lands on the same worker. Each shard travels as hex ids plus four
+    flat NumPy arrays (track lengths and concatenated lat/lon/timestamp
+    columns) rather than pickled ``Position`` lists, and the workers send back
+    plain ``CircleDetection``/``GridDetection`` results. Workers keep their
+    own copy of each track and apply only the points added or evicted since
+    the last cycle, so per-track detector state survives between cycles. Workers are spawned rather
+    than forked because the monitor already runs the Flask thread.
+    """
+
+    def __init__(self, workers: int, circle_detector: CircleDetector, grid_detector: GridDetector):
+        self.workers = max(1, workers)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_detection_worker,
+            initargs=(circle_detector, grid_detector)
+        )
+
+    def shard_of(self, hex_id: str) -> int:
+        """Worker index for an aircraft."""
+        try:
+            return int(hex_id.lstrip('~'), 16) % self.workers
+        except ValueError:
+            return zlib.crc32(hex_id.encode()) % self.workers
+
+    def detect(self, kind: str, aircraft_list: List[Aircraft]) -> List:
+        """Run the 'circle' or 'grid' detector over aircraft, returning detections in order."""
+        shards: List[List[int]] = [[] for _ in range(self.workers)]
+        for i, aircraft in enumerate(aircraft_list):
+            shards[self.shard_of(aircraft.hex_id)].append(i)
+
+        futures = []
+        for indices in shards:
+            if not indices:
+                continue
+            paths = [aircraft_list[i].path for i in indices]
+            futures.append((indices, self.executor.submit(
+                _detect_shard, kind, [aircraft_list[i].hex_id for i in indices],
+                np.array([len(path) for path in paths], dtype=np.int32),
+                np.concatenate([path.lat for path in paths]),
+                np.concatenate([path.lon for path in paths]),
+                np.concatenate([path.timestamps for path in paths])
+            )))
+
+        detections = [None] * len(aircraft_list)
+        for indices, future in futures:
+            for i, detection in zip(indices, future.result()):
+                detections[i] = detection
+        return detections
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        self.executor.shutdown(wait=True)
+
+
+# Fields of an aircraft.binCraft record: name -> (dtype, byte offset)
+BINCRAFT_FIELDS = {
+    'addr': ('<i4', 0),  # ICAO address, bit 24 set for non-ICAO addresses
+    'seen_pos': ('<u2', 4),  # Tenths of a second
+    'lon': ('<i4', 8),  # Microdegrees
+    'lat': ('<i4', 12),
+    'alt_baro': ('<i2', 20),  # 25 ft units
+    'alt_geom': ('<i2', 22),
+    'gs': ('<i2', 34),  # Tenths of a knot
+    'category': ('u1', 64),
+    'validity': ('u1', 73),
+    'flight': ('S8', 78),
+    'type': ('S4', 88),  # Only in builds with the aircraft database
+}
+BINCRAFT_CALLSIGN_VALID = 8
+BINCRAFT_BARO_VALID = 16
+BINCRAFT_GEOM_VALID = 32
+BINCRAFT_POSITION_VALID = 64
+BINCRAFT_GS_VALID = 128
+
+_bincraft_dtypes: Dict[int, np.dtype] = {}
+
+
+def bincraft_dtype(stride: int) -> np.dtype:
+    """Structured dtype for binCraft records of the given size."""
+    dtype = _bincraft_dtypes.get(stride)
+    if dtype is None:
+        fields = {name: spec for name, spec in BINCRAFT_FIELDS.items() if spec[1] + np.dtype(spec[0]).itemsize <= stride}
+        dtype = _bincraft_dtypes[stride] = np.dtype({
+            'names': list(fields),
+            'formats': [spec[0] for spec in fields.values()],
+            'offsets': [spec[1] for spec in fields.values()],
+            'itemsize': stride
+        })
+    return dtype
+
+
+class BinCraftSnapshot:
+    """A decoded aircraft.binCraft snapshot: the feed's 'now' and a record per aircraft with a position."""
+
+    def __init__(self, now: float, records: np.ndarray):
+        self.now = now
+        self.records = records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def columns(self) -> Tuple[List, ...]:
+        """Hex ids, callsigns, types, categories, lats, lons, seen_pos, altitudes and speeds as lists."""
+        records = self.records
+        validity = records['validity']
+        hex_ids = [('~%06x' if addr & 0x1000000 else '%06x') % (addr & 0xFFFFFF) for addr in records['addr'].tolist()]
+        callsigns = np.where(validity & BINCRAFT_CALLSIGN_VALID,
+                             np.char.strip(np.char.decode(records['flight'], 'ascii', 'replace')), '').tolist()
+        if 'type' in records.dtype.names:
+            types = [t or None for t in np.char.strip(np.char.decode(records['type'], 'ascii', 'replace')).tolist()]
+        else:
+            types = [None] * len(records)
+        categories = ['%X' % c if c else None for c in records['category'].tolist()]
+        altitudes = np.where(validity & BINCRAFT_BARO_VALID, records['alt_baro'] * 25.0,
+                             np.where(validity & BINCRAFT_GEOM_VALID, records['alt_geom'] * 25.0, np.nan))
+        speeds = np.where(validity & BINCRAFT_GS_VALID, records['gs'] / 10, np.nan)
+        return (
+            hex_ids, callsigns, types, categories,
+            (records['lat'] / 1e6).tolist(), (records['lon'] / 1e6).tolist(), (records['seen_pos'] / 10).tolist(),
+            [None if a != a else a for a in altitudes.tolist()],  # NaN marks a missing value
+            [None if s != s else s for s in speeds.tolist()]
+        )
+
+    def to_dicts(self) -> List[Dict]:
+        """The records as aircraft.json entries, for merging with other receivers' snapshots."""
+        entries = []
+        for hex_id, callsign, aircraft_type, category, lat, lon, seen_pos, altitude, speed in zip(*self.columns()):
+            entry = {'hex': hex_id, 'lat': lat, 'lon': lon, 'seen_pos': seen_pos, 'alt_baro': altitude, 'gs': speed,
+                     't': aircraft_type, 'category': category}
+            if callsign:
+                entry['flight'] = callsign
+            entries.append(entry)
+        return entries
+
+
+def bincraft_now(body: bytes) -> float:
+    """The feed 'now' from a binCraft header."""
+    low, high = np.frombuffer(body, dtype='<u4', count=2).tolist()
+    return low / 1000 + high * 4294967.296
+
+
+def decode_bincraft(body: bytes) -> BinCraftSnapshot:
+    """Decode aircraft.binCraft, keeping the records that have a valid position."""
+    if len(body) < 12:
+        raise ValueError('binCraft snapshot too short')
+    stride = int(np.frombuffer(body, dtype='<u4', count=1, offset=8)[0])
+    if stride < 86 or stride % 4:
+        raise ValueError(f'unexpected binCraft record size {stride}')
+    records = np.frombuffer(body, dtype=bincraft_dtype(stride), count=len(body) // stride - 1, offset=stride)
+    return BinCraftSnapshot(bincraft_now(body), records[(records['validity'] & BINCRAFT_POSITION_VALID) != 0])
+
+
+class ReceiverFeed:
+    """One tar1090 receiver's aircraft snapshot, fetched with conditional requests.
+
+    Keeps the validators and feed 'now' of the last snapshot so unchanged
+    snapshots are skipped before they are parsed, and the last parsed
+    snapshot so it can be merged with other receivers' fresher ones.
+    binCraft is preferred where the receiver serves it, falling back to
+    aircraft.json.
+
+    The async pipeline downloads and parses on different threads, so both
+    hold the feed's lock. Statistics are replaced rather than changed in
+    place, so stats() can read them from any thread without it.
+    """
+
+    PATHS = {
+        'json': 'data/aircraft.json',
+        'bincraft': 'data/aircraft.binCraft',
+        'bincraft.zst': 'data/aircraft.binCraft.zst'
+    }
+
+    def __init__(self, server_url: str, session: Optional[requests.Session] = None, timeout: float = 10,
+                 feed_format: str = 'json'):
+        self.server_url = server_url.rstrip('/')
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.now: Optional[float] = None  # 'now' of the last parsed snapshot
+        self.data: Optional[Union[Dict, BinCraftSnapshot]] = None  # Last parsed snapshot, None after a failed poll
+        self.last_bytes = 0
+        self.last_parse_ms = 0.0
+        self.lock = threading.RLock()  # Held by download and parse, and while data is read for a merge
+        
+        # Formats to try in order of preference; the first is the one in use
+        self.formats = []
+        if feed_format in ('bincraft', 'auto'):
+            if zstandard is not None:
+                self.formats.append('bincraft.zst')
+            self.formats.append('bincraft')
+        if feed_format in ('json', 'auto'):
+            self.formats.append('json')
+        
+        # Statistics
+        self.requests = 0
+        self.failures = 0
+        self.unchanged = 0  # Polls skipped because the snapshot had not changed
+        self.bytes_saved = 0  # Downloads avoided by 304 responses
+        self.parse_ms_saved = 0.0  # Estimated from the last full parse
+        self.format_stats: Dict[str, Dict[str, float]] = {}  # Downloads, bytes, parses, parse ms, aircraft per format
+
+    @property
+    def format(self) -> str:
+        return self.formats[0]
+
+    @property
+    def aircraft_count(self) -> int:
+        data = self.data
+        if isinstance(data, BinCraftSnapshot):
+            return len(data)
+        return len(data.get('aircraft', ())) if data else 0
+
+    def _count(self, **amounts: float):
+        """Add to the statistics of the format in use, replacing its dict."""
+        stats = self.format_stats.get(self.format) or {'downloads': 0, 'bytes': 0, 'parses': 0, 'parse_ms': 0.0,
+                                                       'aircraft': 0}
+        self.format_stats = {**self.format_stats,
+                             self.format: {key: value + amounts.get(key, 0) for key, value in stats.items()}}
+
+    def _fall_back(self, reason: str):
+        """Switch to the next format, forgetting the validators of the old one."""
+        print(f"⚠️  {self.server_url}: {self.format} unavailable ({reason}), falling back to {self.formats[1]}")
+        self.formats.pop(0)
+        self.etag = self.last_modified = None
+        self.now = None
+
+    def download(self) -> Optional[bytes]:
+        """Download the snapshot, returning None if the server reports it unchanged."""
+        with self.lock:
+            return self._download()
+
+    def _download(self) -> Optional[bytes]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        
+        self.requests += 1
+        try:
+            response = self.session.get(f"{self.server_url}/{self.PATHS[self.format]}", headers=headers,
+                                        timeout=self.timeout)
+            if response.status_code == 404 and len(self.formats) > 1:
+                self._fall_back('404')
+                self.requests -= 1
+                return self._download()
+            if response.status_code == 304:
+                self.unchanged += 1
+                self.bytes_saved += self.last_bytes
+                self.parse_ms_saved += self.last_parse_ms
+                return None
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            # Forget the last snapshot so its aircraft are not kept alive by merges
+            self.failures += 1
+            self.data = self.now = None
+            raise
+        
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        self.last_bytes = len(response.content)
+        self._count(downloads=1, bytes=self.last_bytes)
+        return response.content
+
+    def parse(self, body: bytes) -> bool:
+        """Parse a downloaded snapshot. Returns False if its 'now' matches the previous snapshot."""
+        with self.lock:
+            try:
+                if self.format == 'json':
+                    return self._parse_json(body)
+                return self._parse_bincraft(body)
+            except BINCRAFT_ERRORS as e:
+                # A receiver serving something we cannot decode falls back to the next format
+                if self.format == 'json':
+                    raise
+                if len(self.formats) == 1:
+                    raise ValueError(f"Error decoding binCraft: {e}") from e
+                self._fall_back(str(e))
+                return False
+
+    def _parse_json(self, body: bytes) -> bool:
+        match = FEED_NOW_PATTERN.match(body)
+        if match and self.now is not None and float(match.group(1)) == self.now:
+            self.unchanged += 1
+            self.parse_ms_saved += self.last_parse_ms
+            return False
+        
+        start = time.perf_counter()
+        data = json.loads(body)
+        self._record_parse(start, len(data.get('aircraft', ())))
+        if self.now is not None and data.get('now') == self.now:
+            # 'now' was not first in the body, so this was only found after parsing; ingest is still skipped
+            self.unchanged += 1
+            self.parse_ms_saved += self.last_parse_ms
+            return False
+        self.now = data.get('now')
+        self.data = data
+        return True
+
+    def _parse_bincraft(self, body: bytes) -> bool:
+        start = time.perf_counter()
+        if self.format == 'bincraft.zst':
+            body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+        
+        # The header carries 'now', so unchanged snapshots skip the record decode
+        if len(body) >= 8 and self.now is not None and bincraft_now(body) == self.now:
+            self.unchanged += 1
+            self.parse_ms_saved += self.last_parse_ms
+            return False
+        
+        snapshot = decode_bincraft(body)
+        self._record_parse(start, len(snapshot))
+        self.now = snapshot.now
+        self.data = snapshot
+        return True
+
+    def _record_parse(self, start: float, aircraft: int):
+        self.last_parse_ms = (time.perf_counter() - start) * 1000
+        self._count(parses=1, parse_ms=self.last_parse_ms, aircraft=aircraft)
+
+    def stats(self) -> Dict:
+        """Per-format bytes per poll and parse time per 1,000 aircraft."""
+        return {
+            name: {
+                'bytes_per_poll': round(stats['bytes'] / max(stats['downloads'], 1)),
+                'parse_ms_per_1000': round(stats['parse_ms'] / max(stats['aircraft'], 1) * 1000, 3)
+            }
+            for name, stats in self.format_stats.items()
+        }
+
+
+class Clock:
+    """Wall clock used by the monitor; replays substitute a VirtualClock."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time())
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Clock that only moves when it is set or slept, so replays run at CPU speed."""
+
+    def __init__(self, start: float = 0.0):
+        self.current = start
+
+    def time(self) -> float:
+        return self.current
+
+    def set(self, when: float):
+        self.current = when
+
+    def sleep(self, seconds: float):
+        self.current += seconds
+
+
+# Recorded snapshot formats, indexed by the format byte of each body
+SNAPSHOT_FORMATS = ('json', 'bincraft', 'bincraft.zst')
+RECORD_HEADER = struct.Struct('<dH')  # Received at, number of receivers
+BODY_HEADER = struct.Struct('<bI')  # Format index (or UNCHANGED_BODY, FAILED_BODY), length
+UNCHANGED_BODY = -1  # The receiver answered 304; also every failed download in older recordings
+FAILED_BODY = -2  # The download failed
+
+
+class SnapshotRecorder:
+    """Appends every poll's raw snapshots to gzip-compressed chunk files.
+
+    Each chunk covers CHUNK_SECONDS of polls and is flushed after every
+    poll, so a crash loses at most the poll being written. Chunks are only
+    ever appended to; a manifest records the receivers and poll interval.
+    """
+
+    CHUNK_SECONDS = 3600
+
+    def __init__(self, directory: Union[str, Path], server_urls: List[str], update_interval: float):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / 'manifest.json', 'w') as f:
+            json.dump({'server_urls': server_urls, 'update_interval': update_interval}, f)
+        self.file = None
+        self.chunk_start = 0.0
+        
+        # Statistics
+        self.polls = 0
+        self.bytes_recorded = 0  # Snapshot bytes before compression
+        self.chunks = 0
+
+    def write(self, received_at: float, bodies: List[Tuple[str, Optional[bytes], bool]]):
+        """Record one poll: each receiver's snapshot format, body (None if unchanged or failed)
+        and whether its download failed."""
+        if self.file is None or received_at - self.chunk_start >= self.CHUNK_SECONDS:
+            self._rotate(received_at)
+        
+        parts = [RECORD_HEADER.pack(received_at, len(bodies))]
+        for snapshot_format, body, failed in bodies:
+            if body is None:
+                parts.append(BODY_HEADER.pack(FAILED_BODY if failed else UNCHANGED_BODY, 0))
+            else:
+                parts.append(BODY_HEADER.pack(SNAPSHOT_FORMATS.index(snapshot_format), len(body)))
+                parts.append(body)
+                self.bytes_recorded += len(body)
+        self.file.write(b''.join(parts))
+        self.file.flush()
+        self.polls += 1
+
+    def _rotate(self, received_at: float):
+        self.close()
+        name = datetime.fromtimestamp(received_at).strftime('snapshots-%Y%m%d-%H%M%S.bin.gz')
+        self.file = gzip.open(self.directory / name, 'ab')
+        self.chunk_start = received_at
+        self.chunks += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class SnapshotReplay:
+    """Replays recorded polls in order under a virtual clock.
+
+    With speed N, polls are released N times faster than they were recorded;
+    speed 0 replays as fast as ingest and detection allow.
+    """
+
+    def __init__(self, directory: Union[str, Path], speed: float = 0):
+        self.directory = Path(directory)
+        manifest_file = self.directory / 'manifest.json'
+        if not manifest_file.exists():
+            raise FileNotFoundError(f"No recording in {self.directory}")
+        with open(manifest_file) as f:
+            self.manifest = json.load(f)
+        self.speed = speed
+        self.records = self.read_records()
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self.started = 0.0
+        self.polls = 0
+        self.finished = False
+
+    def read_records(self):
+        """Yield (received_at, [(format, body or None, failed), ...]) from every chunk, oldest first."""
+        for path in sorted(self.directory.glob('snapshots-*.bin.gz')):
+            with gzip.open(path, 'rb') as f:
+                try:
+                    while True:
+                        header = f.read(RECORD_HEADER.size)
+                        if len(header) < RECORD_HEADER.size:
+                            break
+                        received_at, receivers = RECORD_HEADER.unpack(header)
+                        bodies = []
+                        for _ in range(receivers):
+                            format_index, length = BODY_HEADER.unpack(f.read(BODY_HEADER.size))
+                            body = f.read(length) if format_index >= 0 else None
+                            if body is not None and len(body) < length:
+                                raise EOFError('snapshot body cut short')
+                            bodies.append((SNAPSHOT_FORMATS[format_index] if body is not None else None, body,
+                                           format_index == FAILED_BODY))
+                        yield received_at, bodies
+                except (EOFError, struct.error):
+                    # A chunk cut short by a crash ends at its last complete poll
+                    continue
+
+    def next_poll(self, clock: VirtualClock) -> Optional[List[Tuple[Optional[str], Optional[bytes], bool]]]:
+        """The next recorded poll, once it is due, or None at the end of the recording."""
+        record = next(self.records, None)
+        if record is None:
+            self.finished = True
+            return None
+        received_at, bodies = record
+        if self.first is None:
+            self.first = received_at
+            self.started = time.perf_counter()
+        elif self.speed > 0:
+            delay = self.started + (received_at - self.first) / self.speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        clock.set(received_at)
+        self.last = received_at
+        self.polls += 1
+        return bodies
+
+    def stats(self) -> Dict:
+        recorded = (self.last - self.first) if self.polls else 0.0
+        elapsed = time.perf_counter() - self.started if self.polls else 0.0
+        return {
+            'polls': self.polls,
+            'recorded_seconds': round(recorded, 1),
+            'elapsed_seconds': round(elapsed, 2),
+            'speedup': round(recorded / elapsed, 1) if elapsed else None
+        }
+
+
+# Mode S parity: CRC-24 with generator polynomial 0xFFF409, one table entry per leading byte
+def _modes_crc_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 16
+        for _ in range(8):
+            crc = (crc << 1) ^ 0xFFF409 if crc & 0x800000 else crc << 1
+        table.append(crc & 0xFFFFFF)
+    return table
+
+
+MODES_CRC_TABLE = _modes_crc_table()
+
+# Characters of ADS-B identification messages, indexed by 6-bit code
+ADSB_CHARSET = '#ABCDEFGHIJKLMNOPQRSTUVWXYZ##### ###############0123456789######'
+
+# Latitudes at which the number of CPR longitude zones drops from 59 to 1
+CPR_NZ = 15
+CPR_NL_LATS = [
+    math.degrees(math.acos(math.sqrt((1 - math.cos(math.pi / (2 * CPR_NZ))) / (1 - math.cos(2 * math.pi / nl)))))
+    for nl in range(59, 1, -1)
+]
+
+
+def modes_crc(data: bytes) -> int:
+    """Mode S parity of data, e.g. the first 11 bytes of an extended squitter."""
+    crc = 0
+    table = MODES_CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFF) ^ table[(crc >> 16) ^ byte]
+    return crc
+
+
+def cpr_nl(lat: float) -> int:
+    """Number of CPR longitude zones at a latitude."""
+    return 59 - bisect.bisect_right(CPR_NL_LATS, abs(lat))
+
+
+def cpr_global_position(even: Tuple[int, int], odd: Tuple[int, int], use_odd: bool) -> Optional[Tuple[float, float]]:
+    """Decode an airborne position from an even and an odd CPR (lat, lon) pair.
+
+    use_odd selects which frame the result refers to, normally the most recent.
+    Returns None if the two frames straddle a longitude zone boundary.
+    """
+    lat_even, lon_even = even[0] / 131072, even[1] / 131072
+    lat_odd, lon_odd = odd[0] / 131072, odd[1] / 131072
+    
+    j = math.floor(59 * lat_even - 60 * lat_odd + 0.5)
+    rlat_even = 360 / 60 * (j % 60 + lat_even)
+    rlat_odd = 360 / 59 * (j % 59 + lat_odd)
+    if rlat_even >= 270:
+        rlat_even -= 360
+    if rlat_odd >= 270:
+        rlat_odd -= 360
+    
+    nl = cpr_nl(rlat_even)
+    if nl != cpr_nl(rlat_odd):
+        return None
+    
+    if use_odd:
+        lat, zones, lon_cpr = rlat_odd, max(nl - 1, 1), lon_odd
+    else:
+        lat, zones, lon_cpr = rlat_even, max(nl, 1), lon_even
+    m = math.floor(lon_even * (nl - 1) - lon_odd * nl + 0.5)
+    lon = 360 / zones * (m % zones + lon_cpr)
+    if lon >= 180:
+        lon -= 360
+    return lat, lon
+
+
+# Beast frame type byte -> Mode A/C or Mode S payload length
+BEAST_FRAME_LENGTHS = {0x31: 2, 0x32: 7, 0x33: 14}
+
+
+def split_beast_frames(buffer: bytes) -> Tuple[List[bytes], bytes]:
+    """Split a Beast stream into Mode S/AC payloads. Returns (payloads, unconsumed tail).
+    
+    Each frame is 0x1a, a type byte, a 6 byte timestamp, a signal byte and the
+    payload, with any 0x1a inside the frame doubled.
+    """
+    payloads = []
+    end = len(buffer)
+    pos = 0
+    while True:
+        start = buffer.find(b'\x1a', pos)
+        if start < 0:
+            return payloads, b''
+        if start + 1 >= end:
+            return payloads, buffer[start:]
+        length = BEAST_FRAME_LENGTHS.get(buffer[start + 1])
+        if length is None:
+            pos = start + 1  # Escaped 0x1a or an unknown frame type: resynchronize
+            continue
+        
+        size = 7 + length
+        frame = buffer[start + 2:start + 2 + size]
+        if len(frame) == size and b'\x1a' not in frame:
+            pos = start + 2 + size
+        else:
+            # Slow path: undo escaping, or wait for the rest of the frame
+            unescaped = bytearray()
+            i = start + 2
+            while len(unescaped) < size and i < end:
+                byte = buffer[i]
+                if byte == 0x1a:
+                    if i + 1 >= end:
+                        break
+                    if buffer[i + 1] != 0x1a:
+                        break  # Start of the next frame: this one was truncated
+                    i += 1
+                unescaped.append(byte)
+                i += 1
+            if len(unescaped) < size:
+                if i >= end or (i + 1 >= end and buffer[i] == 0x1a):
+                    return payloads, buffer[start:]
+                pos = i
+                continue
+            frame = bytes(unescaped)
+            pos = i
+        payloads.append(frame[7:])
+
+
+@dataclass
+class StreamAircraft:
+    """What a stream decoder knows about one aircraft between position messages."""
+    callsign: Optional[str] = None
+    altitude: Optional[float] = None
+    speed: Optional[float] = None
+    last_seen: float = 0.0
+    cpr: List[Optional[Tuple[int, int, float]]] = field(default_factory=lambda: [None, None])  # Even, odd
+
+
+class StreamDecoder:
+    """Base class for decoders that turn a byte stream into position updates.
+
+    feed() returns (receive time, entry) pairs, where each entry is shaped
+    like an aircraft.json record so it can go through ingest_aircraft_data.
+    """
+
+    STALE_SECONDS = 300  # Forget aircraft not heard from for this long
+
+    def __init__(self):
+        self.aircraft: Dict[str, StreamAircraft] = {}
+        self.messages = 0
+        self.errors = 0
+
+    def feed(self, data: bytes, now: float) -> List[Tuple[float, Dict]]:
+        raise NotImplementedError
+
+    def _state(self, hex_id: str, now: float) -> StreamAircraft:
+        state = self.aircraft.get(hex_id)
+        if state is None:
+            state = self.aircraft[hex_id] = StreamAircraft()
+        state.last_seen = now
+        return state
+
+    @staticmethod
+    def _entry(hex_id: str, state: StreamAircraft, lat: float, lon: float) -> Dict:
+        entry = {'hex': hex_id, 'lat': lat, 'lon': lon, 'alt_baro': state.altitude, 'gs': state.speed}
+        if state.callsign:
+            entry['flight'] = state.callsign
+        return entry
+
+    def prune(self, now: float):
+        """Drop state for aircraft that have gone quiet."""
+        cutoff = now - self.STALE_SECONDS
+        for hex_id in [hex_id for hex_id, state in self.aircraft.items() if state.last_seen < cutoff]:
+            del self.aircraft[hex_id]
+
+
+class SBSDecoder(StreamDecoder):
+    """Decodes the SBS-1 (BaseStation) text stream readsb serves on port 30003.
+
+    MSG,1 carries the callsign, MSG,2 and MSG,3 positions and altitude, and
+    MSG,4 ground speed. A position update is emitted for every MSG,2/3 line
+    with a latitude and longitude.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._partial = b''
+
+    def feed(self, data: bytes, now: float) -> List[Tuple[float, Dict]]:
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+        updates = []
+        for line in lines:
+            fields = line.split(b',')
+            if len(fields) < 16 or fields[0] != b'MSG':
+                continue
+            self.messages += 1
+            try:
+                hex_id = fields[4].decode('ascii').strip().lower()
+                kind = fields[1]
+                state = self._state(hex_id, now)
+                if kind == b'1':
+                    state.callsign = fields[10].decode('ascii', 'replace').strip() or state.callsign
+                elif kind == b'4':
+                    if fields[12]:
+                        state.speed = float(fields[12])
+                elif kind in (b'2', b'3'):
+                    if fields[11]:
+                        state.altitude = float(fields[11])
+                    if fields[14] and fields[15]:
+                        updates.append((now, self._entry(hex_id, state, float(fields[14]), float(fields[15]))))
+            except ValueError:
+                self.errors += 1
+        return updates
+
+
+class BeastDecoder(StreamDecoder):
+    """Decodes ADS-B extended squitters from the Beast binary stream readsb serves on port 30005.
+
+    Only DF17/18 messages that pass the CRC check are used: identification
+    for callsigns, airborne velocity for ground speed and airborne positions,
+    which are resolved by CPR global decoding from an even and an odd frame
+    heard within CPR_PAIR_SECONDS of each other. Surface positions are ignored.
+    """
+
+    CPR_PAIR_SECONDS = 10
+
+    def __init__(self):
+        super().__init__()
+        self._partial = b''
+
+    def feed(self, data: bytes, now: float) -> List[Tuple[float, Dict]]:
+        payloads, self._partial = split_beast_frames(self._partial + data)
+        updates = []
+        for msg in payloads:
+            if len(msg) != 14 or (msg[0] >> 3) not in (17, 18):
+                continue
+            self.messages += 1
+            if modes_crc(msg[:11]) != int.from_bytes(msg[11:], 'big'):
+                self.errors += 1
+                continue
+            
+            hex_id = msg[1:4].hex()
+            if msg[0] >> 3 == 18 and msg[0] & 7 != 0:
+                hex_id = '~' + hex_id  # Non-ICAO address, as readsb marks it
+            me = int.from_bytes(msg[4:11], 'big')
+            type_code = me >> 51
+            state = self._state(hex_id, now)
+            
+            if 1 <= type_code <= 4:
+                callsign = ''.join(ADSB_CHARSET[(me >> shift) & 0x3F] for shift in range(42, -1, -6))
+                state.callsign = callsign.replace('#', '').strip() or state.callsign
+            elif type_code == 19:
+                subtype = (me >> 48) & 7
+                east_west, north_south = (me >> 32) & 0x3FF, (me >> 21) & 0x3FF
+                if subtype in (1, 2) and east_west and north_south:
+                    scale = 4 if subtype == 2 else 1
+                    state.speed = math.hypot(east_west - 1, north_south - 1) * scale
+            elif 9 <= type_code <= 18 or 20 <= type_code <= 22:
+                altitude = (me >> 36) & 0xFFF
+                if type_code >= 20:
+                    state.altitude = altitude * 3.28084  # GNSS height in metres
+                elif altitude & 0x10:
+                    state.altitude = (((altitude & 0xFE0) >> 1) | (altitude & 0xF)) * 25 - 1000
+                
+                odd = (me >> 34) & 1
+                state.cpr[odd] = ((me >> 17) & 0x1FFFF, me & 0x1FFFF, now)
+                other = state.cpr[1 - odd]
+                if other is None or now - other[2] > self.CPR_PAIR_SECONDS:
+                    continue
+                even_frame, odd_frame = (other, state.cpr[1]) if odd else (state.cpr[0], other)
+                position = cpr_global_position(even_frame[:2], odd_frame[:2], use_odd=bool(odd))
+                if position is not None:
+                    updates.append((now, self._entry(hex_id, state, position[0], position[1])))
+        return updates
+
+
+class StreamIngest:
+    """Reads readsb's SBS (port 30003) or Beast (port 30005) output over a persistent TCP connection.
+
+    A background thread decodes data as it arrives and queues position
+    updates with their receive time; the monitoring loop collects them with
+    drain() once per cycle. The connection is re-established after errors.
+    """
+
+    DECODERS = {'sbs': SBSDecoder, 'beast': BeastDecoder}
+    DEFAULT_PORTS = {'sbs': 30003, 'beast': 30005}
+    MAX_PENDING = 200000  # Oldest updates are dropped beyond this if the loop falls behind
+    PRUNE_INTERVAL = 60
+
+    def __init__(self, host: str, port: int, stream_format: str = 'sbs', reconnect_delay: float = 5.0,
+                 socket_timeout: float = 30.0, clock: Optional[Clock] = None):
+        self.host = host
+        self.port = port
+        self.stream_format = stream_format
+        self.decoder = self.DECODERS[stream_format]()
+        self.clock = clock or Clock()  # Stamps received messages; must match the monitor's clock
+        self.reconnect_delay = reconnect_delay
+        self.socket_timeout = socket_timeout
+        self.running = False
+        self.connected = False
+        self.thread = None
+        self._pending: List[Tuple[float, Dict]] = []
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self.connects = 0
+        self.bytes_received = 0
+        self.positions = 0
+        self.dropped = 0
+        self.connection_errors = 0
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def _run(self):
+        last_prune = self.clock.time()
+        while self.running:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=self.socket_timeout) as sock:
+                    self.connected = True
+                    self.connects += 1
+                    while self.running:
+                        data = sock.recv(65536)
+                        if not data:
+                            break
+                        now = self.clock.time()
+                        self.bytes_received += len(data)
+                        updates = self.decoder.feed(data, now)
+                        if updates:
+                            self._queue(updates)
+                        if now - last_prune > self.PRUNE_INTERVAL:
+                            self.decoder.prune(now)
+                            last_prune = now
+            except OSError as e:
+                self.connection_errors += 1
+                self.last_error = str(e)
+            self.connected = False
+            if self.running:
+                time.sleep(self.reconnect_delay)
+
+    def _queue(self, updates: List[Tuple[float, Dict]]):
+        with self._lock:
+            self._pending.extend(updates)
+            self.positions += len(updates)
+            overflow = len(self._pending) - self.MAX_PENDING
+            if overflow > 0:
+                del self._pending[:overflow]
+                self.dropped += overflow
+
+    def drain(self) -> List[Tuple[float, Dict]]:
+        """Take all position updates decoded since the last call, oldest first."""
+        with self._lock:
+            updates, self._pending = self._pending, []
+        return updates
+
+    def stats(self) -> Dict:
+        """Connection and decoding statistics for the health endpoint."""
+        return {
+            'format': self.stream_format,
+            'address': f"{self.host}:{self.port}",
+            'connected': self.connected,
+            'connects': self.connects,
+            'connection_errors': self.connection_errors,
+            'last_error': self.last_error,
+            'bytes': self.bytes_received,
+            'messages': self.decoder.messages,
+            'decode_errors': self.decoder.errors,
+            'positions': self.positions,
+            'dropped': self.dropped
+        }
+
+
+# Histogram bucket upper bounds in seconds, from sub-millisecond parses to multi-second fetches
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, optionally split by one label."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+                 label: Optional[str] = None):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label = label
+        self._series: Dict[str, List] = {}  # Label value -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, label_value: str = ''):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, label_value: str = ''):
+        """Context manager observing the seconds spent in its block."""
+        return _HistogramTimer(self, label_value)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = [(label_value, list(counts), total, count) for label_value, (counts, total, count) in
+                      sorted(self._series.items())]
+        for label_value, counts, total, count in series:
+            labels = f'{self.label}="{label_value}",' if self.label else ''
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{{{labels}le="{le}"}} {cumulative}')
+            suffix = f'{{{labels.rstrip(",")}}}' if labels else ''
+            lines.append(f'{self.name}_sum{suffix} {total}')
+            lines.append(f'{self.name}_count{suffix} {count}')
+        return lines
+
+
+class _HistogramTimer:
+    def __init__(self, histogram: Histogram, label_value: str):
+        self.histogram = histogram
+        self.label_value = label_value
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, self.label_value)
+
+
+class MonitorMetrics:
+    """Latency histograms for every stage of a monitoring cycle and the web routes."""
+
+    def __init__(self):
+        self.fetch = Histogram('aircraft_patterns_fetch_seconds', 'Time to download snapshots from every receiver')
+        self.parse = Histogram('aircraft_patterns_parse_seconds', 'Time to parse and merge downloaded snapshots')
+        self.ingest = Histogram('aircraft_patterns_ingest_seconds',
+                                'Time to validate and append a snapshot\'s positions to the tracks')
+        self.circle_detection = Histogram('aircraft_patterns_circle_detection_seconds',
+                                          'Time to run circle detection over the tracked aircraft')
+        self.grid_detection = Histogram('aircraft_patterns_grid_detection_seconds',
+                                        'Time to run grid detection over the tracked aircraft')
+        self.serialize = Histogram('aircraft_patterns_serialize_seconds',
+                                   'Time to build, serialize and gzip the /api/patterns payload for a cycle')
+        self.change_set = Histogram('aircraft_patterns_change_set_seconds',
+                                    'Time to diff the map view against the previous cycle and serialize the change set')
+        self.route = Histogram('aircraft_patterns_http_request_seconds',
+                               'Time to build and serialize a web response', label='route')
+        self.cycle = Histogram('aircraft_patterns_cycle_seconds', 'Duration of a monitoring cycle')
+        self.cycle_overrun = Histogram('aircraft_patterns_cycle_overrun_seconds',
+                                       'Time a monitoring cycle ran past the update interval (0 when on time)')
+
+    def histograms(self) -> List[Histogram]:
+        return [self.fetch, self.parse, self.ingest, self.circle_detection, self.grid_detection, self.serialize,
+                self.change_set, self.route, self.cycle, self.cycle_overrun]
+
+
+PROFILE_MODES = ('sample', 'cprofile')
+
+
+class SamplingProfiler:
+    """Samples the stack of every thread on a timer and counts identical stacks.
+
+    Frames are read from a background thread, so the profiled code runs
+    unmodified and the overhead is one stack walk per thread per interval.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Dict[str, int] = defaultdict(int)
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                # Request threads are numbered; drop the numbers so they share one root
+                stack.append(re.sub(r'-\d+', '', names.get(ident, 'thread')))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        """Stacks in the folded format read by flamegraph.pl, inferno and speedscope."""
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(self.stacks.items()))
+
+
+class CycleProfiler:
+    """Profiles a set number of monitoring cycles and the web requests served meanwhile.
+
+    'sample' runs a SamplingProfiler over every thread and writes one folded
+    stack file. 'cprofile' runs cProfile around each cycle and each request
+    and writes pstats files for the monitor and the web server. A requested
+    profile starts with the next cycle; stopping early takes effect when the
+    current cycle ends, on the monitoring thread that owns the profiler.
+    """
+
+    def __init__(self, directory: Union[str, Path], clock: Clock):
+        self.directory = Path(directory)
+        self.clock = clock
+        self.mode: Optional[str] = None
+        self.cycles = 0
+        self.cycles_done = 0
+        self.interval = 0.005
+        self.state = 'idle'  # 'idle', 'pending' (starts with the next cycle) or 'running'
+        self.stop_requested = False
+        self.started_at: Optional[datetime] = None
+        self.sampler: Optional[SamplingProfiler] = None
+        self.cycle_profile: Optional[cProfile.Profile] = None
+        self.in_cycle = False
+        self.request_profiles: List[cProfile.Profile] = []
+        self.skipped = 0  # Cycles or requests not profiled because another profiler held the interpreter
+        self.reports: List[str] = []
+        self._lock = threading.Lock()
+
+    def start(self, mode: str = 'sample', cycles: int = 10, interval: float = 0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"unknown profile mode {mode!r}, expected one of {', '.join(PROFILE_MODES)}")
+        if cycles < 1:
+            raise ValueError('cycles must be at least 1')
+        with self._lock:
+            if self.state != 'idle':
+                raise ValueError(f'a {self.mode} profile is already {self.state}')
+            self.mode, self.cycles, self.interval = mode, cycles, interval
+            self.cycles_done = self.skipped = 0
+            self.request_profiles = []
+            self.stop_requested = False
+            self.state = 'pending'
+
+    def stop(self):
+        """Finish the profile when the current cycle ends, or cancel one that has not started."""
+        with self._lock:
+            if self.state == 'pending':
+                self.state = 'idle'
+            elif self.state == 'running':
+                self.stop_requested = True
+
+    def _enable(self, profile: cProfile.Profile) -> bool:
+        # Python 3.12+ allows one active cProfile per interpreter, and it sees every thread
+        try:
+            profile.enable()
+        except ValueError:
+            self.skipped += 1
+            return False
+        return True
+
+    def begin_cycle(self):
+        """Called by the monitoring loop before each cycle."""
+        with self._lock:
+            if self.state == 'pending':
+                self.state = 'running'
+                self.started_at = self.clock.now()
+                if self.mode == 'sample':
+                    self.sampler = SamplingProfiler(self.interval)
+                    self.sampler.start()
+                else:
+                    self.cycle_profile = cProfile.Profile()
+            profile_cycle = self.state == 'running' and self.mode == 'cprofile'
+        if profile_cycle:
+            self.in_cycle = self._enable(self.cycle_profile)
+
+    def end_cycle(self) -> List[str]:
+        """Called by the monitoring loop after each cycle; returns the reports written, if any."""
+        if self.in_cycle:
+            self.cycle_profile.disable()
+            self.in_cycle = False
+        with self._lock:
+            if self.state != 'running':
+                return []
+            self.cycles_done += 1
+            if self.cycles_done < self.cycles and not self.stop_requested:
+                return []
+            self.state = 'idle'
+        return self._write_reports()
+
+    def begin_request(self) -> Optional[cProfile.Profile]:
+        """Start profiling a web request in cprofile mode; pass the result to end_request."""
+        if self.state != 'running' or self.mode != 'cprofile':
+            return None
+        profile = cProfile.Profile()
+        return profile if self._enable(profile) else None
+
+    def end_request(self, profile: cProfile.Profile):
+        profile.disable()
+        with self._lock:
+            if self.state == 'running':
+                self.request_profiles.append(profile)
+
+    def _write_reports(self) -> List[str]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = self.directory / f"{self.started_at.strftime('%Y%m%d-%H%M%S')}-{self.mode}"
+        paths = []
+        if self.mode == 'sample':
+            self.sampler.stop()
+            path = stem.with_name(stem.name + '.folded')
+            path.write_text(self.sampler.folded())
+            paths.append(path)
+        else:
+            path = stem.with_name(stem.name + '-monitor.prof')
+            self.cycle_profile.dump_stats(str(path))
+            paths.append(path)
+            if self.request_profiles:
+                stats = pstats.Stats(self.request_profiles[0])
+                stats.add(*self.request_profiles[1:])
+                path = stem.with_name(stem.name + '-web.prof')
+                stats.dump_stats(str(path))
+                paths.append(path)
+        self.reports = [str(path) for path in paths]
+        return self.reports
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'state': self.state,
+                'mode': self.mode,
+                'cycles': self.cycles,
+                'cycles_done': self.cycles_done,
+                'samples': self.sampler.samples if self.mode == 'sample' and self.sampler else None,
+                'requests_profiled': len(self.request_profiles),
+                'skipped': self.skipped,
+                'stop_requested': self.stop_requested,
+                'directory': str(self.directory),
+                'reports': self.reports
+            }
+
+
+def path_points(positions) -> List[Dict]:
+    """Track points as the web API sends them."""
+    return [{'lat': p.lat, 'lon': p.lon, 'alt': p.altitude, 'time': p.timestamp} for p in positions]
+
+
+def pixel_degrees(zoom: float) -> float:
+    """Degrees of longitude one pixel spans on a Web Mercator map at zoom."""
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def simplify_track(lats: np.ndarray, lons: np.ndarray, tolerance: float) -> np.ndarray:
+    """Indices of the points Douglas-Peucker keeps, tolerance in degrees of longitude.
+
+    Latitudes are stretched as Web Mercator stretches them, so the tolerance is
+    the same number of pixels in both directions.
+    """
+    count = len(lats)
+    if count < 3 or tolerance <= 0:
+        return np.arange(count)
+    x = lons
+    y = lats / math.cos(math.radians(float(lats.mean())))
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    segments = [(0, count - 1)]
+    while segments:
+        first, last = segments.pop()
+        if last - first < 2:
+            continue
+        dx, dy = x[last] - x[first], y[last] - y[first]
+        px, py = x[first + 1:last] - x[first], y[first + 1:last] - y[first]
+        length = math.hypot(dx, dy)
+        # Distance from the chord, or from its start when the track closes on itself
+        distance = np.abs(px * dy - py * dx) / length if length > 0 else np.hypot(px, py)
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            segments.append((first, split))
+            segments.append((split, last))
+    return np.flatnonzero(keep)
+
+
+def lon_ranges(west: float, east: float) -> List[Tuple[float, float]]:
+    """A box's longitude span as ranges within [-180, 180], two if it crosses the antimeridian."""
+    if east - west >= 360:
+        return [(-180.0, 180.0)]
+    west, east = (west + 180) % 360 - 180, (east + 180) % 360 - 180
+    return [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+
+
+MAX_VIEWPORT_PAYLOADS = 256  # Encoded map views kept for the current cycle
+
+
+def snap_viewport(bbox: Optional[Tuple[float, float, float, float]],
+                  zoom: Optional[float]) -> Tuple[Optional[Tuple[float, float, float, float]], Optional[float]]:
+    """A map view widened to whole tiles at a whole zoom level, so nearby views share a payload.
+
+    Rounding the zoom up only keeps more points, and widening the box only adds
+    aircraft just outside the view.
+    """
+    if zoom is not None:
+        zoom = float(math.ceil(zoom))
+    if bbox is not None:
+        step = 360.0 / 2 ** zoom if zoom is not None else 1.0  # One 256 pixel tile
+        west, south, east, north = bbox
+        bbox = (math.floor(west / step) * step, max(math.floor(south / step) * step, -90.0),
+                math.ceil(east / step) * step, min(math.ceil(north / step) * step, 90.0))
+    return bbox, zoom
+
+
+def any_in_bbox(lats: np.ndarray, lons: np.ndarray, west: float, south: float, east: float, north: float) -> bool:
+    """Whether any of the points lies inside the box."""
+    in_lat = (lats >= south) & (lats <= north)
+    return any(bool(np.any(in_lat & (lons >= low) & (lons <= high))) for low, high in lon_ranges(west, east))
+
+
+class SpatialIndex:
+    """Aircraft bucketed by the grid cell of their last position, for viewport queries."""
+
+    CELL_DEGREES = 1.0
+
+    def __init__(self, cycle: int):
+        self.cycle = cycle
+        self.cells: Dict[Tuple[int, int], List[Tuple[str, float, float]]] = defaultdict(list)
+
+    def add(self, hex_id: str, lat: float, lon: float):
+        self.cells[(math.floor(lat / self.CELL_DEGREES), math.floor(lon / self.CELL_DEGREES))].append((hex_id, lat, lon))
+
+    def query(self, west: float, south: float, east: float, north: float) -> Set[str]:
+        """Hex ids inside the box; a box with west > east crosses the antimeridian."""
+        found = set()
+        rows = range(math.floor(south / self.CELL_DEGREES), math.floor(north / self.CELL_DEGREES) + 1)
+        for low, high in lon_ranges(west, east):
+            columns = range(math.floor(low / self.CELL_DEGREES), math.floor(high / self.CELL_DEGREES) + 1)
+            if len(rows) * len(columns) > len(self.cells):
+                # A box wider than the traffic: scanning the occupied cells is cheaper
+                cells = [points for (row, column), points in self.cells.items() if row in rows and column in columns]
+            else:
+                cells = [self.cells.get((row, column), ()) for row in rows for column in columns]
+            for points in cells:
+                found.update(hex_id for hex_id, lat, lon in points if south <= lat <= north and low <= lon <= high)
+        return found
+
+
+class ChangeTracker:
+    """Diffs the map view between cycles into change sets for live clients.
+
+    For every aircraft on the map it remembers the kind ('circle', 'grid' or
+    'aircraft'), the attributes last sent and the times of the first and last
+    track points sent. A change set then only carries new track points,
+    changed attributes, aircraft that appeared or disappeared, and patterns
+    that started or ended, so its size follows the rate of change rather than
+    the size of the fleet. The last HISTORY change sets are kept so clients
+    without a push connection can catch up from a cursor.
+    """
+
+    HISTORY = 60  # Change sets kept for /api/patterns?since=, 5 minutes at the default interval
+
+    def __init__(self):
+        self.cycle: Optional[int] = None  # Cycle of the last change set
+        self.sent: Dict[str, Tuple[str, Dict, float, float]] = {}  # hex_id -> (kind, attributes, first time, last time)
+        self.history: deque = deque(maxlen=self.HISTORY)
+
+    def changes(self, cycle: int, entries, timestamp: str, aircraft_count: int) -> Dict:
+        """Change set since the previous call.
+
+        entries yields (kind, attributes, track, start) for every aircraft on
+        the map, where track[start:] are the points the map shows.
+        """
+        added, updated, started, ended = [], [], [], []
+        current = {}
+        for kind, attributes, track, start in entries:
+            hex_id = attributes['hex_id']
+            if hex_id in current:  # Aircraft in a circle and a grid show as circling
+                continue
+            timestamps = track.timestamps
+            first_time, last_time = float(timestamps[start]), float(timestamps[-1])
+            current[hex_id] = (kind, attributes, first_time, last_time)
+            
+            previous = self.sent.get(hex_id)
+            if previous is None or previous[0] != kind:
+                added.append({'kind': kind, **attributes, 'path': path_points(track[start:])})
+                if kind != 'aircraft':
+                    started.append({'hex_id': hex_id, 'kind': kind})
+                if previous is not None and previous[0] != 'aircraft':
+                    ended.append({'hex_id': hex_id, 'kind': previous[0]})
+                continue
+            
+            _, sent_attributes, sent_first, sent_last = previous
+            update = {key: value for key, value in attributes.items() if sent_attributes.get(key) != value}
+            new_from = max(start, int(np.searchsorted(timestamps, sent_last, side='right')))
+            if new_from < len(track):
+                update['path'] = path_points(track[new_from:])
+            if first_time != sent_first:
+                update['start'] = first_time  # Points before this have left the track
+            if update:
+                update['hex_id'] = hex_id
+                updated.append(update)
+        
+        removed = [hex_id for hex_id in self.sent if hex_id not in current]
+        ended.extend({'hex_id': hex_id, 'kind': self.sent[hex_id][0]} for hex_id in removed
+                     if self.sent[hex_id][0] != 'aircraft')
+        changes = {
+            'cycle': cycle,
+            'base': self.cycle,  # Clients must hold this cycle's view to apply the change set
+            'timestamp': timestamp,
+            'aircraft_count': aircraft_count,
+            'added': added,
+            'updated': updated,
+            'removed': removed,
+            'started': started,
+            'ended': ended
+        }
+        self.sent = current
+        self.cycle = cycle
+        self.history.append(changes)
+        return changes
+
+    @staticmethod
+    def _merge_update(target: Dict, update: Dict):
+        """Fold a later update into an earlier update or added entry, without touching either's stored lists."""
+        for key, value in update.items():
+            if key == 'path':
+                target['path'] = target.get('path', []) + value
+            elif key != 'hex_id':
+                target[key] = value
+        if 'start' in update and 'path' in target:
+            target['path'] = [point for point in target['path'] if point['time'] >= update['start']]
+
+    def since(self, cycle: int) -> Optional[Dict]:
+        """Everything that changed after cycle, merged into one change set.
+
+        Dropped aircraft come back as tombstones in 'removed'. Returns None
+        when cycle is not in the history, so the caller must send a full
+        snapshot instead.
+        """
+        history = list(self.history)
+        if cycle == self.cycle:
+            pending = []
+        else:
+            first = next((i for i, changes in enumerate(history) if changes['base'] == cycle), None)
+            if first is None:
+                return None
+            pending = history[first:]
+        
+        added: Dict[str, Dict] = {}
+        updated: Dict[str, Dict] = {}
+        removed: Dict[str, None] = {}  # Ordered set of tombstones
+        started, ended = [], []
+        for changes in pending:
+            for hex_id in changes['removed']:
+                added.pop(hex_id, None)
+                updated.pop(hex_id, None)
+                removed[hex_id] = None
+            for entry in changes['added']:
+                hex_id = entry['hex_id']
+                added[hex_id] = dict(entry)
+                updated.pop(hex_id, None)
+                removed.pop(hex_id, None)
+            for update in changes['updated']:
+                hex_id = update['hex_id']
+                if hex_id in added:
+                    self._merge_update(added[hex_id], update)
+                    added[hex_id].pop('start', None)  # Already applied to the full path
+                else:
+                    self._merge_update(updated.setdefault(hex_id, {'hex_id': hex_id}), update)
+            started.extend(changes['started'])
+            ended.extend(changes['ended'])
+        
+        latest = history[-1] if history else {}
+        return {
+            'cycle': self.cycle,
+            'since': cycle,
+            'timestamp': latest.get('timestamp'),
+            'aircraft_count': latest.get('aircraft_count', 0),
+            'added': list(added.values()),
+            'updated': list(updated.values()),
+            'removed': list(removed),
+            'started': started,
+            'ended': ended
+        }
+
+
+class LiveUpdates:
+    """Hands the latest change set, serialized once as a server-sent event, to every subscriber."""
+
+    def __init__(self):
+        self.cycle: Optional[int] = None
+        self.event = b''
+        self.subscribers = 0
+        self.events_sent = 0
+        self.bytes_sent = 0
+        self._condition = threading.Condition()
+
+    def publish(self, changes: Dict):
+        data = json.dumps(changes, separators=(',', ':'))
+        event = f"id: {changes['cycle']}\nevent: changes\ndata: {data}\n\n".encode()
+        with self._condition:
+            self.cycle, self.event = changes['cycle'], event
+            self._condition.notify_all()
+
+    def wait(self, after_cycle: Optional[int], timeout: float) -> Optional[Tuple[int, bytes]]:
+        """The latest event once its cycle differs from after_cycle, or None on timeout.
+
+        A subscriber that falls behind skips straight to the latest event; the
+        gap in cycles tells the client to reload the full view.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.cycle != after_cycle, timeout):
+                return None
+            self.events_sent += 1
+            self.bytes_sent += len(self.event)
+            return self.cycle, self.event
+
+    def subscribe(self) -> Optional[int]:
+        """Register a subscriber and return the cycle it starts after."""
+        with self._condition:
+            self.subscribers += 1
+            return self.cycle
+
+    def unsubscribe(self):
+        with self._condition:
+            self.subscribers -= 1
+
+
+class TAR1090Monitor:
+    def __init__(self, server_url: Union[str, List[str]], update_interval: int = 5, feed_format: str = 'json',
+                 clock: Optional[Clock] = None):
+        # Several receivers can be given as a list or a comma-separated string
+        if isinstance(server_url, str):
+            server_url = server_url.split(',')
+        self.server_urls = [url.strip().rstrip('/') for url in server_url if url.strip()]
+        self.server_url = self.server_urls[0]
+        self.update_interval = update_interval
+        self.clock = clock or Clock()  # Every timestamp the monitor takes comes from here
+        self.aircraft: Dict[str, Aircraft] = {}
+        self.track_capacity = DEFAULT_TRACK_CAPACITY  # Max points per aircraft track
+        self.detector = CircleDetector()
+        self.grid_detector = GridDetector()
+        self.running = False
+        self.session = requests.Session()
+        self.session.timeout = 10
+        
+        # Data quality settings
+        self.max_speed_kmh = 1000  # Max realistic speed in km/h (about 540 knots)
+        self.max_position_jump_km = 5.0  # Max distance jump between updates
+        self.min_update_interval = 0.5  # Min seconds between position updates
+
+        # Statistics
+        self.total_requests = 0
+        self.failed_requests = 0
+        self.last_update = None
+        self.last_fetch_at = 0.0  # Wall-clock time of the last successful fetch, even when replaying
+        self.feed_time: Optional[float] = None  # Feed 'now' of the last ingested snapshot, the clock of track timestamps
+        
+        # One feed per receiver; the first shares the monitor's session. Several
+        # receivers are polled concurrently, each over its own keep-alive session
+        self.feeds = [
+            ReceiverFeed(url, self.session if i == 0 else None, timeout=self.session.timeout, feed_format=feed_format)
+            for i, url in enumerate(self.server_urls)
+        ]
+        self.poll_executor = ThreadPoolExecutor(max_workers=len(self.feeds)) if len(self.feeds) > 1 else None
+        self.unchanged_cycles = 0  # Polls skipped because no receiver's snapshot had changed
+        
+        # Cost of merging receivers' snapshots
+        self.merges = 0
+        self.merge_seconds = 0.0
+        self.merge_entries = 0  # Positioned aircraft entries across all receivers
+        self.merge_duplicates = 0  # Entries dropped because another receiver had the same hex
+        
+        # Logging
+        self.circle_logs: List[CircleLog] = []
+        self.grid_logs: List[GridLog] = []
+        self.active_circles: Set[str] = set()  # Track aircraft currently circling
+        self.active_grids: Set[str] = set()  # Track aircraft currently in grid patterns
+        self.circle_start_times: Dict[str, float] = {}  # Track when circling started
+        self.grid_start_times: Dict[str, float] = {}  # Track when grid pattern started
+        # Use data directory for persistent storage
+        self.data_dir = Path("/app/data")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.log_file = self.data_dir / "circle_detections.csv"
         self.grid_log_file = self.data_dir / "grid_detections.csv"
-        self.tar1090_base_url = os.environ.get("TAR1090_URL")
+        self.profiler = CycleProfiler(self.data_dir / "profiles", self.clock)
+        self.heartbeat_file = self.data_dir / "heartbeat.json"  # Read by the container healthcheck
+        self.heartbeat_failing = False
+        # A heartbeat left on the volume by the previous run would pass the healthcheck until it aged out
+        try:
+            self.heartbeat_file.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing old heartbeat {self.heartbeat_file}: {e}")
+        self.tar1090_base_url = os.environ.get("TAR1090_URL", "").split(',')[0].strip() or None
         
         # Display settings
         self.terminal_size = shutil.get_terminal_size((80, 24))
@@ -2024,10 +4636,60 @@ class TAR1090Monitor:
         # Track filtered positions for statistics
         self.positions_filtered = 0
         self.positions_accepted = 0
+        self.track_points = 0  # Points across all tracks, kept up to date by ingest
+        
+        # Stage latency histograms served at /metrics
+        self.metrics = MonitorMetrics()
+        
+        # Detection snapshot shared by the monitoring loop, terminal and web API
+        self.cycle = 0  # Incremented once per successful ingest
+        self.cycle_timestamp = self.clock.now().isoformat()  # When the current cycle was ingested
+        self.detection_snapshot: Optional[DetectionSnapshot] = None
+        self.snapshot_lock = threading.Lock()
+        self.data_lock = threading.Lock()  # Held while tracks are updated, scanned by the detectors or read for the map
+        self.snapshot_hits = 0  # Reads served from the current snapshot
+        self.snapshot_misses = 0  # Reads that had to run the detectors
+        
+        # /api/patterns body for the current cycle, built by the first request that needs it
+        self.pattern_payloads: Dict[bool, EncodedPayload] = {}  # This cycle's /api/patterns body, keyed by columnar
+        self.payload_lock = threading.Lock()
+        self.payload_builds = 0
+        self.payload_hits = 0  # Requests served from an already encoded payload
+        self.not_modified = 0  # Requests answered 304 because the client's ETag matched
+        
+        # Per-cycle change sets pushed to live map clients while the web server runs
+        self.change_tracker = ChangeTracker()
+        self.live_updates = LiveUpdates()
+        self.delta_payloads: Dict[int, EncodedPayload] = {}  # Merged changes for this cycle, keyed by cursor
+        self.viewport_payloads: Dict[Tuple, EncodedPayload] = {}  # Map views for this cycle, keyed by snapped view
+        self.spatial_index: Optional[SpatialIndex] = None  # Last positions by grid cell, for viewport queries
+        
+        # Per-aircraft detection results keyed by track version, so only
+        # aircraft whose track changed are re-evaluated each cycle
+        self.circle_memo: Dict[str, Tuple[TrackBuffer, int, CircleDetection]] = {}
+        self.grid_memo: Dict[str, Tuple[TrackBuffer, int, GridDetection]] = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.min_track_points = 10  # Minimum points before circle detection runs
+        self.worker_pool: Optional[DetectionWorkerPool] = None  # Set to run detectors in worker processes
+        
+        # Set to ingest positions from an SBS/Beast stream instead of polling aircraft.json
+        self.stream: Optional[StreamIngest] = None
+        
+        # Record polled snapshots, or replay a recording instead of polling
+        self.recorder: Optional[SnapshotRecorder] = None
+        self.replay: Optional[SnapshotReplay] = None
+        
+        # Set while run_monitoring drives an AsyncPipeline
+        self.pipeline: Optional['AsyncPipeline'] = None
+        
+        # Replaced, never mutated, by the monitoring loop after every cycle
+        self.health = self._health_record(0.0)
         
         # Web server
         self.web_app = None
         self.web_thread = None
+        self.web_port: Optional[int] = None
 
     def validate_position(self, aircraft: Aircraft, new_pos: Position) -> bool:
         """Validate if a new position is realistic based on physics and data quality."""
@@ -2073,129 +4735,384 @@ class TAR1090Monitor:
         
         return True
     
-    def fetch_aircraft_data(self) -> bool:
-        """Fetch aircraft data from TAR1090 server."""
+    def _poll_feed(self, feed: ReceiverFeed) -> Tuple[Optional[bytes], Optional[Exception]]:
         try:
-            url = f"{self.server_url}/data/aircraft.json"
-            response = self.session.get(url)
-            response.raise_for_status()
+            return feed.download(), None
+        except requests.exceptions.RequestException as e:
+            return None, e
 
-            data = response.json()
-            self.total_requests += 1
-            self.last_update = datetime.now()
-
-            current_time = time.time()
-
-            # Process aircraft data
-            if 'aircraft' in data:
-                active_hex_ids = set()
-
-                for ac_data in data['aircraft']:
-                    if not ac_data.get('hex') or ac_data.get('lat') is None or ac_data.get('lon') is None:
-                        continue
-
-                    hex_id = ac_data['hex']
-                    active_hex_ids.add(hex_id)
-
-                    # Create or update aircraft
-                    if hex_id not in self.aircraft:
-                        self.aircraft[hex_id] = Aircraft(
-                            hex_id=hex_id,
-                            callsign=ac_data.get('flight', hex_id).strip(),
-                            path=[],
-                            last_update=current_time,
-                            type=ac_data.get('t'),
-                            category=ac_data.get('category')
-                        )
-
-                    aircraft = self.aircraft[hex_id]
-                    aircraft.callsign = ac_data.get('flight', hex_id).strip()
-                    aircraft.last_update = current_time
-                    aircraft.type = ac_data.get('t')
-                    aircraft.category = ac_data.get('category')
-
-                    # Add new position if different from last
-                    # Ensure altitude and speed are integers/floats, not strings
-                    altitude = ac_data.get('alt_baro') or ac_data.get('alt_geom')
-                    if altitude is not None:
-                        try:
-                            altitude = float(altitude)
-                        except (ValueError, TypeError):
-                            altitude = None
-                    
-                    speed = ac_data.get('gs')
-                    if speed is not None:
-                        try:
-                            speed = float(speed)
-                        except (ValueError, TypeError):
-                            speed = None
-                    
-                    new_pos = Position(
-                        lat=float(ac_data['lat']),
-                        lon=float(ac_data['lon']),
-                        timestamp=current_time,
-                        altitude=altitude,
-                        speed=speed
-                    )
-
-                    # Only add if position changed and is valid
-                    if not aircraft.path or (aircraft.path[-1].lat != new_pos.lat or
-                                             aircraft.path[-1].lon != new_pos.lon):
-                        if self.validate_position(aircraft, new_pos):
-                            aircraft.path.append(new_pos)
-                            self.positions_accepted += 1
-                        else:
-                            self.positions_filtered += 1
+    def poll_aircraft_data(self) -> List[Optional[bytes]]:
+        """Download aircraft.json from every receiver, returning None for each unchanged or failed one.
+        
+        Raises the error if every receiver failed.
+        """
+        if self.replay is not None:
+            return self._replay_poll()
+        
+        with self.metrics.fetch.time():
+            if self.poll_executor is None:
+                results = [self._poll_feed(feed) for feed in self.feeds]
+            else:
+                results = list(self.poll_executor.map(self._poll_feed, self.feeds))
+        
+        # Record before raising, so polls where every receiver failed stay on the replay's timeline
+        if self.recorder is not None:
+            self.recorder.write(self.clock.time(), [(feed.format, body, error is not None)
+                                                    for feed, (body, error) in zip(self.feeds, results)])
+        errors = [error for _, error in results if error is not None]
+        if len(errors) == len(results):
+            raise errors[0]
+        
+        self.total_requests += 1
+        self.last_update = self.clock.now()
+        self.last_fetch_at = time.time()
+        bodies = [body for body, _ in results]
+        if all(body is None for body in bodies) and not errors:
+            self.unchanged_cycles += 1
+        return bodies
 
-                    # Remove old positions outside time window
-                    cutoff_time = current_time - self.detector.time_window
-                    aircraft.path = [p for p in aircraft.path if p.timestamp >= cutoff_time]
+    def _replay_poll(self) -> List[Optional[bytes]]:
+        """Release the next recorded poll, stopping the monitor at the end of the recording."""
+        recorded = self.replay.next_poll(self.clock)
+        if recorded is None:
+            self.running = False
+            return [None] * len(self.feeds)
+        
+        for feed, (snapshot_format, body, failed) in zip(self.feeds, recorded):
+            with feed.lock:
+                if body is not None and feed.format != snapshot_format:
+                    feed.formats = [snapshot_format]
+                if failed:
+                    # As ReceiverFeed.download does, so the failed receiver's last snapshot is not merged
+                    feed.failures += 1
+                    feed.data = feed.now = None
+        if all(failed for _, _, failed in recorded):
+            raise requests.exceptions.ConnectionError('every receiver failed in the recorded poll')
+        
+        self.total_requests += 1
+        self.last_update = self.clock.now()
+        self.last_fetch_at = time.time()
+        bodies = [body for _, body, _ in recorded]
+        if all(body is None for body in bodies) and not any(failed for _, _, failed in recorded):
+            self.unchanged_cycles += 1
+        return bodies
 
-                # Remove aircraft not seen recently
-                cutoff_time = current_time - self.detector.time_window
-                self.aircraft = {
-                    hex_id: aircraft for hex_id, aircraft in self.aircraft.items()
-                    if aircraft.last_update >= cutoff_time
-                }
+    def parse_aircraft_data(self, bodies: List[Optional[bytes]]) -> Optional[Union[Dict, BinCraftSnapshot]]:
+        """Parse downloaded snapshots, returning the merged snapshot or None if none of them changed."""
+        with self.metrics.parse.time():
+            changed = False
+            snapshots = []
+            for feed, body in zip(self.feeds, bodies):
+                # A download on the fetch thread may clear feed.data, so read it under the same lock as the parse
+                with feed.lock:
+                    if body is not None and feed.parse(body):
+                        changed = True
+                    if feed.data is not None:
+                        snapshots.append(feed.data)
+            if not changed:
+                return None
+            if len(self.feeds) == 1:
+                return snapshots[0]
+            return self.merge_snapshots(snapshots)
 
+    def merge_snapshots(self, snapshots: List[Union[Dict, BinCraftSnapshot]]) -> Dict:
+        """Merge receivers' snapshots into one, keeping the freshest position for each hex."""
+        start = time.perf_counter()
+        snapshots = [
+            {'now': snapshot.now, 'aircraft': snapshot.to_dicts()} if isinstance(snapshot, BinCraftSnapshot) else snapshot
+            for snapshot in snapshots
+        ]
+        now = max(snapshot.get('now') or 0 for snapshot in snapshots) or self.clock.time()
+        
+        freshest: Dict[str, Tuple[float, Dict]] = {}
+        entries = 0
+        for snapshot in snapshots:
+            feed_now = snapshot.get('now') or now
+            for ac_data in snapshot.get('aircraft', ()):
+                if not ac_data.get('hex') or ac_data.get('lat') is None or ac_data.get('lon') is None:
+                    continue
+                entries += 1
+                hex_id = ac_data['hex'].lower()
+                seen_at = feed_now - float(ac_data.get('seen_pos') or 0)
+                current = freshest.get(hex_id)
+                if current is None or seen_at > current[0]:
+                    freshest[hex_id] = (seen_at, ac_data)
+        
+        # Re-express seen_pos against the merged 'now'
+        aircraft = [dict(ac_data, hex=hex_id, seen_pos=now - seen_at) for hex_id, (seen_at, ac_data) in freshest.items()]
+        
+        self.merges += 1
+        self.merge_seconds += time.perf_counter() - start
+        self.merge_entries += entries
+        self.merge_duplicates += entries - len(aircraft)
+        return {'now': now, 'aircraft': aircraft}
+
+    def ingest_aircraft_data(self, data: Union[Dict, BinCraftSnapshot, List[Tuple[float, Dict]]]):
+        """Add positions from an aircraft.json or binCraft snapshot, or from drained stream updates,
+        to the tracked aircraft."""
+        with self.data_lock, self.metrics.ingest.time():
+            self._ingest_aircraft_data(data)
+
+    def _ingest_aircraft_data(self, data: Union[Dict, BinCraftSnapshot, List[Tuple[float, Dict]]]):
+        if isinstance(data, BinCraftSnapshot):
+            self._ingest_records(data)
+        elif isinstance(data, list):
+            self._ingest_updates(data)
+        elif 'aircraft' in data:
+            self._ingest_entries(data)
+
+        # New data invalidates the detection snapshot
+        self.cycle += 1
+        self.cycle_timestamp = self.clock.now().isoformat()
+
+    def _ingest_entries(self, data: Dict):
+        """Ingest an aircraft.json snapshot."""
+        # Use the receiver's clock so positions are stamped when they were received
+        current_time = data.get('now') or self.clock.time()
+        self.feed_time = current_time
+
+        for ac_data in data['aircraft']:
+            if not ac_data.get('hex') or ac_data.get('lat') is None or ac_data.get('lon') is None:
+                continue
+
+            hex_id = ac_data['hex']
+
+            # Ensure altitude and speed are integers/floats, not strings
+            altitude = ac_data.get('alt_baro') or ac_data.get('alt_geom')
+            if altitude is not None:
+                try:
+                    altitude = float(altitude)
+                except (ValueError, TypeError):
+                    altitude = None
+            
+            speed = ac_data.get('gs')
+            if speed is not None:
+                try:
+                    speed = float(speed)
+                except (ValueError, TypeError):
+                    speed = None
+            
+            new_pos = Position(
+                lat=float(ac_data['lat']),
+                lon=float(ac_data['lon']),
+                timestamp=current_time - float(ac_data.get('seen_pos') or 0),
+                altitude=altitude,
+                speed=speed
+            )
+            self._ingest_position(hex_id, ac_data.get('flight', hex_id).strip(), ac_data.get('t'),
+                                  ac_data.get('category'), new_pos, current_time)
+
+        self._expire_aircraft(current_time)
+
+    def _ingest_records(self, snapshot: BinCraftSnapshot):
+        """Ingest a binCraft snapshot straight from its record columns."""
+        current_time = self.feed_time = snapshot.now
+        for hex_id, callsign, aircraft_type, category, lat, lon, seen_pos, altitude, speed in zip(*snapshot.columns()):
+            new_pos = Position(lat, lon, current_time - seen_pos, altitude, speed)
+            self._ingest_position(hex_id, callsign or hex_id, aircraft_type, category, new_pos, current_time)
+        
+        self._expire_aircraft(current_time)
+
+    def _ingest_updates(self, updates: List[Tuple[float, Dict]]):
+        """Ingest stream position updates, each stamped with the time its message was received,
+        so positions and last_update stay true when the loop drains a backlog."""
+        current_time = self.feed_time = self.clock.time()
+        for received_at, entry in updates:
+            new_pos = Position(float(entry['lat']), float(entry['lon']), received_at, entry.get('alt_baro'), entry.get('gs'))
+            self._ingest_position(entry['hex'], entry.get('flight') or entry['hex'], None, None, new_pos, received_at)
+        
+        self._expire_aircraft(current_time)
+
+    def _ingest_position(self, hex_id: str, callsign: str, aircraft_type: Optional[str], category: Optional[str],
+                         new_pos: Position, current_time: float):
+        """Add a reported position to an aircraft's track, creating the aircraft if it is new."""
+        # Create or update aircraft
+        aircraft = self.aircraft.get(hex_id)
+        points_before = len(aircraft.path) if aircraft is not None else 0
+        if aircraft is None:
+            aircraft = self.aircraft[hex_id] = Aircraft(
+                hex_id=hex_id,
+                callsign=callsign,
+                path=TrackBuffer(self.track_capacity),
+                last_update=current_time,
+                type=aircraft_type,
+                category=category
+            )
+        aircraft.callsign = callsign
+        aircraft.last_update = current_time
+        aircraft.type = aircraft_type
+        aircraft.category = category
+
+        # Only add if position changed and is valid
+        if not aircraft.path or (aircraft.path[-1].lat != new_pos.lat or
+                                 aircraft.path[-1].lon != new_pos.lon):
+            if self.validate_position(aircraft, new_pos):
+                aircraft.path.append(new_pos)
+                self.positions_accepted += 1
+            else:
+                self.positions_filtered += 1
+
+        # Remove old positions outside time window
+        cutoff_time = current_time - self.detector.time_window
+        aircraft.path.evict_before(cutoff_time)
+        self.track_points += len(aircraft.path) - points_before
+
+    def _expire_aircraft(self, current_time: float):
+        """Remove aircraft not seen recently."""
+        cutoff_time = current_time - self.detector.time_window
+        kept = {}
+        for hex_id, aircraft in self.aircraft.items():
+            if aircraft.last_update >= cutoff_time:
+                kept[hex_id] = aircraft
+            else:
+                self.track_points -= len(aircraft.path)
+        self.aircraft = kept
+
+    def ingest_stream(self) -> bool:
+        """Ingest the positions decoded from the stream since the previous cycle."""
+        updates = self.stream.drain()
+        if not updates and not self.stream.connected:
+            return False
+        
+        self.last_update = self.clock.now()
+        self.last_fetch_at = time.time()
+        if not updates:
+            self.unchanged_cycles += 1
+            return True
+        
+        self.ingest_aircraft_data(updates)
+        return True
+
+    def fetch_aircraft_data(self) -> bool:
+        """Fetch aircraft data from TAR1090 server, skipping snapshots that have not changed."""
+        if self.stream is not None:
+            return self.ingest_stream()
+        
+        try:
+            bodies = self.poll_aircraft_data()
+            if all(body is None for body in bodies):
+                return True
+            
+            data = self.parse_aircraft_data(bodies)
+            if data is None:
+                self.unchanged_cycles += 1
+                return True
+            
+            self.ingest_aircraft_data(data)
             return True
 
         except requests.exceptions.RequestException as e:
             self.failed_requests += 1
             print(f"Error fetching data: {e}")
             return False
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # Includes json.JSONDecodeError
             self.failed_requests += 1
-            print(f"Error parsing JSON: {e}")
+            print(f"Error parsing feed: {e}")
             return False
         except Exception as e:
             self.failed_requests += 1
             print(f"Unexpected error: {e}")
             return False
 
+    def get_detection_snapshot(self) -> DetectionSnapshot:
+        """Get detections for the current cycle, running the detectors at most once per cycle."""
+        with self.snapshot_lock:
+            snapshot = self.detection_snapshot
+            if snapshot is not None and snapshot.cycle == self.cycle:
+                self.snapshot_hits += 1
+                return snapshot
+            
+            self.snapshot_misses += 1
+            # Ingest waits on the data lock, so the tracks match the cycle being recorded
+            with self.data_lock:
+                cycle = self.cycle
+                with self.metrics.circle_detection.time():
+                    circles = self._detect_circling_aircraft()
+                with self.metrics.grid_detection.time():
+                    grids = self._detect_grid_aircraft()
+                snapshot = DetectionSnapshot(
+                    cycle=cycle,
+                    circles=circles,
+                    grids=grids,
+                    computed_at=self.clock.time(),
+                    timestamp=self.cycle_timestamp
+                )
+            self.detection_snapshot = snapshot
+            return snapshot
+    
     def get_circling_aircraft(self) -> List[Tuple[Aircraft, CircleDetection]]:
         """Get list of aircraft currently performing circles."""
-        circling = []
-
-        for aircraft in self.aircraft.values():
-            if len(aircraft.path) >= 10:  # Need sufficient data points
-                detection = self.detector.detect_circling(aircraft.path)
-                if detection.is_circling:
-                    circling.append((aircraft, detection))
-
-        return circling
+        return self.get_detection_snapshot().circles
     
     def get_grid_aircraft(self) -> List[Tuple[Aircraft, GridDetection]]:
         """Get list of aircraft currently flying grid patterns."""
-        grid_aircraft = []
-        
-        for aircraft in self.aircraft.values():
-            if len(aircraft.path) >= 20:  # Need more data for grid detection
-                detection = self.grid_detector.detect_grid_pattern(aircraft.path)
-                if detection.is_grid_pattern:
-                    grid_aircraft.append((aircraft, detection))
-        
-        return grid_aircraft
+        return self.get_detection_snapshot().grids
+    
+    def _memoized_detections(self, memo: Dict, aircraft_list: List[Aircraft], detect_all) -> List:
+        """Return a detection per aircraft, re-running detect_all only on aircraft whose tracks changed."""
+        detections = [None] * len(aircraft_list)
+        stale = []
+        for i, aircraft in enumerate(aircraft_list):
+            entry = memo.get(aircraft.hex_id)
+            if entry is not None and entry[0] is aircraft.path and entry[1] == aircraft.path.version:
+                detections[i] = entry[2]
+            else:
+                stale.append(i)
+        
+        self.memo_hits += len(aircraft_list) - len(stale)
+        self.memo_misses += len(stale)
+        if stale:
+            fresh = detect_all([aircraft_list[i] for i in stale])
+            for i, detection in zip(stale, fresh):
+                aircraft = aircraft_list[i]
+                detections[i] = detection
+                memo[aircraft.hex_id] = (aircraft.path, aircraft.path.version, detection)
+        
+        # Forget aircraft that are no longer tracked
+        for hex_id in [hex_id for hex_id in memo if hex_id not in self.aircraft]:
+            del memo[hex_id]
+        
+        return detections
+    
+    def _detect_circling_aircraft(self) -> List[Tuple[Aircraft, CircleDetection]]:
+        """Run circle detection over tracked aircraft whose tracks changed."""
+        # Need sufficient data points
+        min_points = max(10, self.min_track_points)
+        candidates = [aircraft for aircraft in list(self.aircraft.values()) if len(aircraft.path) >= min_points]
+        def detect_all(stale: List[Aircraft]) -> List[CircleDetection]:
+            if self.worker_pool is not None:
+                return self.worker_pool.detect('circle', stale)
+            return [self.detector.detect_circling(aircraft.path) for aircraft in stale]
+        
+        detections = self._memoized_detections(self.circle_memo, candidates, detect_all)
+        
+        return [
+            (aircraft, detection) for aircraft, detection in zip(candidates, detections)
+            if detection.is_circling
+        ]
+    
+    def _detect_grid_aircraft(self) -> List[Tuple[Aircraft, GridDetection]]:
+        """Run grid detection over tracked aircraft whose tracks changed."""
+        # Need more data for grid detection
+        candidates = [aircraft for aircraft in list(self.aircraft.values()) if len(aircraft.path) >= 20]
+        
+        def detect_all(stale: List[Aircraft]) -> List[GridDetection]:
+            if self.worker_pool is not None:
+                return self.worker_pool.detect('grid', stale)
+            if hasattr(self.grid_detector, 'detect_fleet'):
+                return self.grid_detector.detect_fleet([aircraft.path for aircraft in stale])
+            return [self.grid_detector.detect_grid_pattern(aircraft.path) for aircraft in stale]
+        
+        detections = self._memoized_detections(self.grid_memo, candidates, detect_all)
+        
+        return [
+            (aircraft, detection) for aircraft, detection in zip(candidates, detections)
+            if detection.is_grid_pattern
+        ]
+    
+    def feed_clock(self) -> float:
+        """Current time on the feed's clock, for comparing with track timestamps and last_update."""
+        return self.feed_time if self.feed_time is not None else self.clock.time()
     
     def generate_tar1090_url(self, aircraft: Aircraft, detection) -> str:
         """Generate a direct link to the aircraft on TAR1090."""
@@ -2205,7 +5122,7 @@ class TAR1090Monitor:
     
     def log_grid_detection(self, aircraft: Aircraft, detection: GridDetection):
         """Log a new grid pattern detection event."""
-        current_time = time.time()
+        current_time = self.clock.time()
         
         # Check if this is a new grid detection
         if aircraft.hex_id not in self.active_grids:
@@ -2215,14 +5132,14 @@ class TAR1090Monitor:
             # Calculate duration if we have start time
             duration = 0
             if aircraft.path:
-                duration = int(current_time - aircraft.path[0].timestamp)
+                duration = int(self.feed_clock() - aircraft.path[0].timestamp)
             
             # Get current position data
             current_pos = aircraft.path[-1] if aircraft.path else None
             
             # Create log entry
             log_entry = GridLog(
-                timestamp=datetime.now(),
+                timestamp=self.clock.now(),
                 hex_id=aircraft.hex_id,
                 callsign=aircraft.callsign,
                 pattern_type=detection.pattern_type,
@@ -2243,14 +5160,14 @@ class TAR1090Monitor:
             
             # Store alert for display
             alert_msg = f"📐 NEW GRID: {aircraft.callsign} - {detection.pattern_type}, {detection.num_legs} legs, {detection.coverage_area:.1f}km²"
-            self.recent_alerts.append((datetime.now(), alert_msg, log_entry.tar1090_url))
+            self.recent_alerts.append((self.clock.now(), alert_msg, log_entry.tar1090_url))
             # Keep only last 5 alerts
             self.recent_alerts = self.recent_alerts[-5:]
             self.last_alert_time = current_time
     
     def log_circle_detection(self, aircraft: Aircraft, detection: CircleDetection):
         """Log a new circle detection event."""
-        current_time = time.time()
+        current_time = self.clock.time()
         
         # Check if this is a new circle detection
         if aircraft.hex_id not in self.active_circles:
@@ -2260,14 +5177,14 @@ class TAR1090Monitor:
             # Calculate duration if we have start time
             duration = 0
             if aircraft.path:
-                duration = int(current_time - aircraft.path[0].timestamp)
+                duration = int(self.feed_clock() - aircraft.path[0].timestamp)
             
             # Get current position data
             current_pos = aircraft.path[-1] if aircraft.path else None
             
             # Create log entry
             log_entry = CircleLog(
-                timestamp=datetime.now(),
+                timestamp=self.clock.now(),
                 hex_id=aircraft.hex_id,
                 callsign=aircraft.callsign,
                 center_lat=detection.center_lat,
@@ -2285,7 +5202,7 @@ class TAR1090Monitor:
             
             # Store alert for display
             alert_msg = f"🚨 NEW: {aircraft.callsign} - {detection.radius:.1f}km circle, {detection.turns:.1f} turns"
-            self.recent_alerts.append((datetime.now(), alert_msg, log_entry.tar1090_url))
+            self.recent_alerts.append((self.clock.now(), alert_msg, log_entry.tar1090_url))
             # Keep only last 5 alerts
             self.recent_alerts = self.recent_alerts[-5:]
             self.last_alert_time = current_time
@@ -2302,7 +5219,7 @@ class TAR1090Monitor:
         stopped_circling = self.active_circles - current_circling
         for hex_id in stopped_circling:
             if hex_id in self.circle_start_times:
-                duration = int(time.time() - self.circle_start_times[hex_id])
+                duration = int(self.clock.time() - self.circle_start_times[hex_id])
                 aircraft = self.aircraft.get(hex_id)
                 if aircraft:
                     print(f"✅ {aircraft.callsign} stopped circling after {duration}s")
@@ -2322,7 +5239,7 @@ class TAR1090Monitor:
         stopped_grids = self.active_grids - current_grids
         for hex_id in stopped_grids:
             if hex_id in self.grid_start_times:
-                duration = int(time.time() - self.grid_start_times[hex_id])
+                duration = int(self.clock.time() - self.grid_start_times[hex_id])
                 aircraft = self.aircraft.get(hex_id)
                 if aircraft:
                     print(f"✅ {aircraft.callsign} stopped grid pattern after {duration}s")
@@ -2419,7 +5336,7 @@ class TAR1090Monitor:
     
     def print_compact_status(self, circling_aircraft):
         """Print a compact single-line status."""
-        current_time = time.time()
+        current_time = self.clock.time()
         status_parts = []
         
         if self.last_update:
@@ -2434,7 +5351,7 @@ class TAR1090Monitor:
             status_parts.append("🔍 Monitoring...")
         
         # Add timestamp
-        timestamp = datetime.now().strftime('%H:%M:%S')
+        timestamp = self.clock.now().strftime('%H:%M:%S')
         status_line = f"[{timestamp}] " + " | ".join(status_parts)
         
         # Truncate if too long
@@ -2448,7 +5365,6 @@ class TAR1090Monitor:
         """Print current monitoring status with user-friendly output."""
         circling_aircraft = self.get_circling_aircraft()
         grid_aircraft = self.get_grid_aircraft()
-        current_time = time.time()
         
         # Calculate filter rate
         total_positions = self.positions_accepted + self.positions_filtered
@@ -2461,7 +5377,8 @@ class TAR1090Monitor:
 
         # Categorize aircraft for better summary
         aircraft_with_data = [ac for ac in self.aircraft.values() if len(ac.path) >= 3]
-        recent_aircraft = [ac for ac in self.aircraft.values() if current_time - ac.last_update < 60]
+        feed_time = self.feed_clock()  # last_update is on the feed's clock, which may be skewed from ours
+        recent_aircraft = [ac for ac in self.aircraft.values() if feed_time - ac.last_update < 60]
 
         # Build output buffer
         output_lines = []
@@ -2472,7 +5389,7 @@ class TAR1090Monitor:
 
         # Status summary
         try:
-            time_since_update = (datetime.now() - self.last_update).total_seconds() if self.last_update else float('inf')
+            time_since_update = (self.clock.now() - self.last_update).total_seconds() if self.last_update else float('inf')
             status_color = "🟢" if time_since_update < 30 else "🔴"
         except Exception:
             status_color = "🔴"
@@ -2480,6 +5397,10 @@ class TAR1090Monitor:
         output_lines.append(f"📡 Aircraft: {len(self.aircraft)} total | {len(recent_aircraft)} active | {len(aircraft_with_data)} tracked")
         if total_positions > 100:  # Only show after enough data
             output_lines.append(f"🔧 Data Quality: {filter_rate:.1f}% positions filtered (noise reduction)")
+        if self.unchanged_cycles:
+            output_lines.append(f"💤 Unchanged feed: {self.unchanged_cycles} polls skipped, "
+                                f"{sum(feed.bytes_saved for feed in self.feeds) / 1024:.0f} KB and "
+                                f"{sum(feed.parse_ms_saved for feed in self.feeds):.0f} ms saved")
         
         # Recent alerts (if any)
         if self.recent_alerts and not quiet_mode:
@@ -2550,110 +5471,339 @@ class TAR1090Monitor:
         if quiet_mode:
             self.clear_screen()
             if circling_aircraft:
-                print(f"🔄 [{datetime.now().strftime('%H:%M:%S')}] {len(circling_aircraft)} aircraft circling:")
+                print(f"🔄 [{self.clock.now().strftime('%H:%M:%S')}] {len(circling_aircraft)} aircraft circling:")
                 for aircraft, detection in circling_aircraft[:3]:
                     print(f"  • {aircraft.callsign}: {detection.radius:.1f}km @ {detection.turns:.1f} turns")
             else:
-                print(f"🔍 [{datetime.now().strftime('%H:%M:%S')}] Monitoring {len(self.aircraft)} aircraft...")
+                print(f"🔍 [{self.clock.now().strftime('%H:%M:%S')}] Monitoring {len(self.aircraft)} aircraft...")
 
-    def get_pattern_data_json(self, include_all_aircraft=True, max_track_points=50):
-        """Get current pattern data as JSON for the web viewer."""
-        data = {
-            'timestamp': datetime.now().isoformat(),
-            'circles': [],
-            'grids': [],
-            'all_aircraft': [],
-            'aircraft_count': len(self.aircraft),
-            'server_url': self.server_url
+    def _map_attributes(self, aircraft: Aircraft, detection=None) -> Dict:
+        """Everything the map shows for an aircraft except its path."""
+        last = aircraft.path[-1] if aircraft.path else None
+        attributes = {
+            'hex_id': aircraft.hex_id,
+            'callsign': aircraft.callsign,
+            'tar1090_radar_url': f"{self.tar1090_base_url}/?icao={aircraft.hex_id}&zoom=12",
+            'current_alt': last.altitude if last else None,
+            'current_speed': last.speed if last else None,
+            'type': aircraft.type,
+            'category': aircraft.category
         }
-        
-        # Add circling aircraft
-        for aircraft, detection in self.get_circling_aircraft():
-            # Generate TAR1090 radar URL for circling aircraft
-            tar1090_radar_url = f"{self.tar1090_base_url}/?icao={aircraft.hex_id}&zoom=12"
-            
-            circle_data = {
-                'hex_id': aircraft.hex_id,
-                'callsign': aircraft.callsign,
+        if isinstance(detection, CircleDetection):
+            attributes.update({
                 'center_lat': detection.center_lat,
                 'center_lon': detection.center_lon,
                 'radius': detection.radius,
-                'turns': detection.turns,
-                'tar1090_radar_url': tar1090_radar_url,
-                'path': [
-                    {'lat': p.lat, 'lon': p.lon, 'alt': p.altitude, 'time': p.timestamp}
-                    for p in aircraft.path
-                ],
-                'current_alt': aircraft.path[-1].altitude if aircraft.path else None,
-                'current_speed': aircraft.path[-1].speed if aircraft.path else None,
-                'type': aircraft.type,
-                'category': aircraft.category
-            }
-            data['circles'].append(circle_data)
-        
-        # Add grid aircraft
-        for aircraft, detection in self.get_grid_aircraft():
-            # Generate TAR1090 radar URL for grid aircraft
-            tar1090_radar_url = f"{self.tar1090_base_url}/?icao={aircraft.hex_id}&zoom=12"
-            
-            grid_data = {
-                'hex_id': aircraft.hex_id,
-                'callsign': aircraft.callsign,
+                'turns': detection.turns
+            })
+        elif isinstance(detection, GridDetection):
+            attributes.update({
                 'pattern_type': detection.pattern_type,
                 'center_lat': detection.center_lat,
                 'center_lon': detection.center_lon,
                 'grid_bearing': detection.grid_bearing,
                 'line_spacing': detection.line_spacing,
                 'num_legs': detection.num_legs,
-                'tar1090_radar_url': tar1090_radar_url,
-                'coverage_area': detection.coverage_area,
-                'path': [
-                    {'lat': p.lat, 'lon': p.lon, 'alt': p.altitude, 'time': p.timestamp}
-                    for p in aircraft.path
-                ],
-                'current_alt': aircraft.path[-1].altitude if aircraft.path else None,
-                'current_speed': aircraft.path[-1].speed if aircraft.path else None,
-                'type': aircraft.type,
-                'category': aircraft.category
-            }
-            data['grids'].append(grid_data)
+                'coverage_area': detection.coverage_area
+            })
+        else:
+            attributes['in_pattern'] = False
+        return attributes
+    
+    @contextmanager
+    def map_state(self):
+        """Hold the data lock, yielding the detection snapshot for the tracks it guards.
+
+        Tracks change in place on ingest, so everything read for the map happens in
+        here. If a cycle was ingested between detecting and locking, detect again so
+        detections and tracks belong to the same cycle.
+        """
+        while True:
+            snapshot = self.get_detection_snapshot()
+            self.data_lock.acquire()
+            if snapshot.cycle == self.cycle:
+                break
+            self.data_lock.release()
+        try:
+            yield snapshot
+        finally:
+            self.data_lock.release()
+    
+    def _map_entries(self, snapshot: DetectionSnapshot, include_all_aircraft=True, max_track_points=50,
+                     visible: Optional[Set[str]] = None):
+        """(kind, attributes, track, start) for every aircraft on the map; the map shows track[start:].
+
+        Call within map_state(), passing its snapshot. visible, if given, limits
+        aircraft outside patterns to those hex ids.
+        """
+        in_pattern = set()
+        for kind, detections in (('circle', snapshot.circles), ('grid', snapshot.grids)):
+            for aircraft, detection in detections:
+                in_pattern.add(aircraft.hex_id)
+                yield kind, self._map_attributes(aircraft, detection), aircraft.path, 0
         
-        # Add all aircraft if requested
         if include_all_aircraft:
-            # Get hex IDs of aircraft already in patterns
-            pattern_aircraft = set()
-            for circle in data['circles']:
-                pattern_aircraft.add(circle['hex_id'])
-            for grid in data['grids']:
-                pattern_aircraft.add(grid['hex_id'])
-            
-            # Add all other aircraft
-            for hex_id, aircraft in self.aircraft.items():
-                if hex_id not in pattern_aircraft and aircraft.path:
+            for hex_id, aircraft in list(self.aircraft.items()):
+                if hex_id not in in_pattern and aircraft.path and (visible is None or hex_id in visible):
                     # Limit track points for performance
-                    track_points = aircraft.path[-max_track_points:] if len(aircraft.path) > max_track_points else aircraft.path
-                    
-                    # Generate TAR1090 radar URL for live aircraft
-                    tar1090_radar_url = f"{self.tar1090_base_url}/?icao={aircraft.hex_id}&zoom=12"
-                    
-                    aircraft_data = {
-                        'hex_id': aircraft.hex_id,
-                        'callsign': aircraft.callsign,
-                        'path': [
-                            {'lat': p.lat, 'lon': p.lon, 'alt': p.altitude, 'time': p.timestamp}
-                            for p in track_points
-                        ],
-                        'current_alt': aircraft.path[-1].altitude if aircraft.path else None,
-                        'current_speed': aircraft.path[-1].speed if aircraft.path else None,
-                        'type': aircraft.type,
-                        'category': aircraft.category,
-                        'tar1090_radar_url': tar1090_radar_url,
-                        'in_pattern': False
-                    }
-                    data['all_aircraft'].append(aircraft_data)
-        
+                    start = max(len(aircraft.path) - max_track_points, 0)
+                    yield 'aircraft', self._map_attributes(aircraft), aircraft.path, start
+    
+    def get_spatial_index(self) -> SpatialIndex:
+        """Index of the aircraft's last positions, rebuilt at most once per cycle. Call with the data lock held."""
+        index = self.spatial_index
+        if index is None or index.cycle != self.cycle:
+            index = SpatialIndex(self.cycle)
+            for hex_id, aircraft in list(self.aircraft.items()):
+                if aircraft.path:
+                    index.add(hex_id, float(aircraft.path.lat[-1]), float(aircraft.path.lon[-1]))
+            self.spatial_index = index
+        return index
+    
+    @staticmethod
+    def _shown_positions(track: TrackBuffer, start: int, zoom: Optional[float]) -> List[Position]:
+        """track[start:], simplified to about one point per pixel when a map zoom level is given.
+        Call with the data lock held."""
+        positions = track[start:]
+        if zoom is None or len(positions) < 3:
+            return positions
+        keep = simplify_track(track.lat[start:], track.lon[start:], pixel_degrees(zoom))
+        return [positions[i] for i in keep]
+    
+    def get_pattern_data_json(self, include_all_aircraft=True, max_track_points=50,
+                              bbox: Optional[Tuple[float, float, float, float]] = None, zoom: Optional[float] = None):
+        """Get current pattern data as JSON for the web viewer.
+
+        bbox (west, south, east, north) leaves out aircraft outside patterns whose
+        last position is outside the box, and cuts patterns with no point in the
+        box down to their last two points so the pattern list stays complete.
+        zoom simplifies every path to about one point per pixel at that map zoom level.
+        """
+        with self.map_state() as snapshot:
+            data = {
+                'cycle': snapshot.cycle,
+                'timestamp': snapshot.timestamp,
+                'circles': [],
+                'grids': [],
+                'all_aircraft': [],
+                'aircraft_count': len(self.aircraft),
+                'server_url': self.server_url
+            }
+            lists = {'circle': data['circles'], 'grid': data['grids'], 'aircraft': data['all_aircraft']}
+            visible = self.get_spatial_index().query(*bbox) if bbox else None
+            for kind, attributes, track, start in self._map_entries(snapshot, include_all_aircraft, max_track_points, visible):
+                if bbox and kind != 'aircraft' and not any_in_bbox(track.lat[start:], track.lon[start:], *bbox):
+                    start = max(start, len(track) - 2)
+                lists[kind].append({**attributes, 'path': path_points(self._shown_positions(track, start, zoom))})
         return data
     
+    def update_live_view(self):
+        """Push what changed on the map since the previous cycle to live clients."""
+        if self.web_app is None or self.cycle == self.change_tracker.cycle:
+            return
+        with self.metrics.change_set.time():
+            with self.map_state() as snapshot:
+                changes = self.change_tracker.changes(snapshot.cycle, self._map_entries(snapshot),
+                                                      snapshot.timestamp, len(self.aircraft))
+            self.live_updates.publish(changes)
+    
+    def get_pattern_payload(self, columnar: bool = False) -> EncodedPayload:
+        """/api/patterns body for the current cycle, serialized and compressed at most once per cycle
+        in each format."""
+        with self.payload_lock:
+            payload = self.pattern_payloads.get(columnar)
+            if payload is not None and payload.cycle == self.cycle:
+                self.payload_hits += 1
+                return payload
+            
+            with self.metrics.serialize.time():
+                # Label the payload with the cycle its data was read under, which may be newer than self.cycle was above
+                data = self.get_pattern_data_json()
+                payload = EncodedPayload.encode(data['cycle'], data, columnar)
+            self.payload_builds += 1
+            self.pattern_payloads[columnar] = payload
+            return payload
+    
+    def get_viewport_payload(self, bbox: Optional[Tuple[float, float, float, float]], zoom: Optional[float],
+                             columnar: bool = False) -> EncodedPayload:
+        """/api/patterns body for a map view, built at most once per cycle for each view snapped by
+        snap_viewport."""
+        bbox, zoom = snap_viewport(bbox, zoom)
+        key = (bbox, zoom, columnar)
+        with self.payload_lock:
+            if any(payload.cycle != self.cycle for payload in self.viewport_payloads.values()):
+                self.viewport_payloads = {}
+            payload = self.viewport_payloads.get(key)
+            if payload is not None:
+                self.payload_hits += 1
+                return payload
+            
+            with self.metrics.serialize.time():
+                data = self.get_pattern_data_json(bbox=bbox, zoom=zoom)
+                payload = EncodedPayload.encode(data['cycle'], data, columnar)
+            self.payload_builds += 1
+            if len(self.viewport_payloads) >= MAX_VIEWPORT_PAYLOADS:
+                del self.viewport_payloads[next(iter(self.viewport_payloads))]  # Oldest first
+            self.viewport_payloads[key] = payload
+            return payload
+    
+    def get_changes_payload(self, since: int) -> Optional[EncodedPayload]:
+        """Changes after cycle since, merged and encoded once per cycle for each cursor.
+
+        None when since has aged out of the change history (or was never in it).
+        """
+        with self.payload_lock:
+            cycle = self.change_tracker.cycle
+            if any(payload.cycle != cycle for payload in self.delta_payloads.values()):
+                self.delta_payloads = {}
+            payload = self.delta_payloads.get(since)
+            if payload is not None:
+                self.payload_hits += 1
+                return payload
+            
+            changes = self.change_tracker.since(since)
+            if changes is None:
+                return None
+            with self.metrics.serialize.time():
+                payload = EncodedPayload.encode(cycle, changes)
+            self.payload_builds += 1
+            self.delta_payloads[since] = payload
+            return payload
+    
+    def _health_record(self, cycle_seconds: float) -> HealthRecord:
+        details = {
+            'feed': {
+                'unchanged_cycles': self.unchanged_cycles,
+                'bytes_saved': sum(feed.bytes_saved for feed in self.feeds),
+                'parse_ms_saved': round(sum(feed.parse_ms_saved for feed in self.feeds), 1),
+                'receivers': [
+                    {
+                        'url': feed.server_url,
+                        'requests': feed.requests,
+                        'failures': feed.failures,
+                        'unchanged': feed.unchanged,
+                        'aircraft': feed.aircraft_count,
+                        'format': feed.format,
+                        'formats': feed.stats()
+                    }
+                    for feed in self.feeds
+                ],
+                'merge': {
+                    'snapshots': self.merges,
+                    'avg_ms': round(self.merge_seconds / max(self.merges, 1) * 1000, 2),
+                    'entries': self.merge_entries,
+                    'duplicates_removed': self.merge_duplicates
+                }
+            },
+            'detection_cache': {
+                'cycle': self.cycle,
+                'hits': self.snapshot_hits,
+                'misses': self.snapshot_misses,
+                'aircraft_hits': self.memo_hits,
+                'aircraft_misses': self.memo_misses,
+                'aircraft_hit_ratio': round(self.memo_hits / max(self.memo_hits + self.memo_misses, 1), 3)
+            }
+        }
+        if self.pipeline is not None:
+            details['pipeline'] = self.pipeline.stats()
+        if self.stream is not None:
+            details['stream'] = self.stream.stats()
+        
+        return HealthRecord(
+            published_at=self.clock.time(),
+            cycle=self.cycle,
+            cycle_seconds=round(cycle_seconds, 4),
+            last_update=self.last_update.timestamp() if self.last_update else 0,
+            aircraft_count=len(self.aircraft),
+            active_circles=len(self.active_circles),
+            active_grids=len(self.active_grids),
+            total_requests=self.total_requests,
+            failed_requests=self.failed_requests,
+            failure_rate=round(self.failed_requests / max(self.total_requests, 1), 3),
+            details=details
+        )
+    
+    def publish_health(self, cycle_seconds: float):
+        """Publish the status /api/health serves; called by the monitoring loop after each cycle."""
+        self.health = self._health_record(cycle_seconds)
+        self.write_heartbeat(self.health)
+    
+    def write_heartbeat(self, health: HealthRecord):
+        """Atomically replace the heartbeat file, so the healthcheck never reads a partial write.
+
+        Times are on the local wall clock the healthcheck compares them with,
+        not the feed's or a replay's clock.
+        """
+        heartbeat = {
+            'pid': os.getpid(),
+            'published_at': time.time(),
+            'update_interval': self.update_interval,
+            'cycle': health.cycle,
+            'cycle_seconds': health.cycle_seconds,
+            'last_fetch_at': self.last_fetch_at,
+            'aircraft_count': health.aircraft_count,
+            'total_requests': health.total_requests,
+            'failure_rate': health.failure_rate,
+            'web_port': self.web_port
+        }
+        temp_file = self.heartbeat_file.with_name(self.heartbeat_file.name + '.tmp')
+        try:
+            temp_file.write_text(json.dumps(heartbeat))
+            os.replace(temp_file, self.heartbeat_file)
+        except OSError as e:
+            if not self.heartbeat_failing:
+                print(f"Error writing heartbeat {self.heartbeat_file}: {e}")
+            self.heartbeat_failing = True
+        else:
+            self.heartbeat_failing = False
+    
+    def start_profile(self, mode: str = 'sample', cycles: int = 10):
+        """Profile the next cycles; see CycleProfiler."""
+        if mode == 'cprofile' and self.pipeline is not None:
+            raise ValueError('cProfile only sees the thread that enables it; use sample mode with the async pipeline')
+        self.profiler.start(mode, cycles)
+    
+    def _end_profiled_cycle(self):
+        for path in self.profiler.end_cycle():
+            print(f"\n🔬 Profile written to {path}")
+    
+    def render_metrics(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+        for histogram in self.metrics.histograms():
+            lines.extend(histogram.render())
+        
+        values = [
+            ('aircraft_patterns_aircraft', 'gauge', 'Aircraft currently tracked', len(self.aircraft)),
+            ('aircraft_patterns_track_points', 'gauge', 'Points held across all tracks', self.track_points),
+            ('aircraft_patterns_active_circles', 'gauge', 'Aircraft currently circling', len(self.active_circles)),
+            ('aircraft_patterns_active_grids', 'gauge', 'Aircraft currently flying grids', len(self.active_grids)),
+            ('aircraft_patterns_positions_accepted_total', 'counter', 'Positions appended to tracks',
+             self.positions_accepted),
+            ('aircraft_patterns_positions_filtered_total', 'counter', 'Positions rejected by validation',
+             self.positions_filtered),
+            ('aircraft_patterns_requests_total', 'counter', 'Polls with at least one receiver answering',
+             self.total_requests),
+            ('aircraft_patterns_failed_requests_total', 'counter', 'Failed fetch cycles', self.failed_requests),
+            ('aircraft_patterns_unchanged_cycles_total', 'counter', 'Polls skipped because nothing changed',
+             self.unchanged_cycles),
+            ('aircraft_patterns_ingest_cycles_total', 'counter', 'Snapshots ingested', self.cycle),
+            ('aircraft_patterns_payload_builds_total', 'counter', '/api/patterns payloads serialized',
+             self.payload_builds),
+            ('aircraft_patterns_payload_hits_total', 'counter', '/api/patterns requests served from the cycle\'s payload',
+             self.payload_hits),
+            ('aircraft_patterns_not_modified_total', 'counter', 'Requests answered 304 Not Modified', self.not_modified),
+            ('aircraft_patterns_live_subscribers', 'gauge', 'Clients connected to /api/patterns/stream',
+             self.live_updates.subscribers),
+            ('aircraft_patterns_live_events_total', 'counter', 'Change set events sent to live clients',
+             self.live_updates.events_sent),
+            ('aircraft_patterns_live_bytes_total', 'counter', 'Bytes of change set events sent to live clients',
+             self.live_updates.bytes_sent),
+        ]
+        for name, metric_type, help_text, value in values:
+            lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}', f'{name} {value}'])
+        return '\n'.join(lines) + '\n'
+    
     def start_web_server(self, port=8888):
         """Start a Flask web server to serve the map viewer."""
         # Determine static folder path - check for Docker environment first
@@ -2679,6 +5829,55 @@ class TAR1090Monitor:
         
         CORS(app)
         self.web_app = app
+        self.web_port = port
+        
+        # Time every response for the per-route histogram, and profile it while a cProfile capture runs
+        @app.before_request
+        def start_timer():
+            g.request_start = time.perf_counter()
+            g.profile = self.profiler.begin_request()
+        
+        @app.after_request
+        def observe_request(response):
+            if g.get('profile') is not None:
+                self.profiler.end_request(g.profile)
+            if request.url_rule is not None and 'request_start' in g:
+                self.metrics.route.observe(time.perf_counter() - g.request_start, request.url_rule.rule)
+            return response
+        
+        def admin_allowed() -> bool:
+            """Admin routes need ADMIN_TOKEN when it is set, otherwise a direct request from this host."""
+            token = os.environ.get('ADMIN_TOKEN')
+            if token:
+                supplied = request.headers.get('X-Admin-Token') or request.headers.get('Authorization', '')
+                return hmac.compare_digest(supplied.removeprefix('Bearer ').encode(), token.encode())
+            # ProxyFix rewrites remote_addr from X-Forwarded-For, so check the socket's peer
+            # and refuse anything that came through a proxy
+            peer = request.environ.get('werkzeug.proxy_fix.orig', {}).get('REMOTE_ADDR', request.remote_addr)
+            return peer in ('127.0.0.1', '::1') and 'X-Forwarded-For' not in request.headers
+        
+        @app.route('/api/admin/profile', methods=['GET', 'POST', 'DELETE'])
+        def profile():
+            """GET the profiler's status, POST ?mode=sample|cprofile&cycles=N to start, DELETE to stop early."""
+            if not admin_allowed():
+                return jsonify({'error': 'forbidden'}), 403
+            if request.method == 'POST':
+                mode, cycles = request.args.get('mode', 'sample'), request.args.get('cycles', '10')
+                if mode not in PROFILE_MODES or not cycles.isdigit() or int(cycles) < 1:
+                    return jsonify({'error': f"expected mode in {', '.join(PROFILE_MODES)} and cycles >= 1"}), 400
+                try:
+                    self.start_profile(mode, int(cycles))
+                except ValueError as e:  # Already profiling, or cprofile under the async pipeline
+                    return jsonify({'error': str(e)}), 409
+                return jsonify(self.profiler.status()), 202
+            if request.method == 'DELETE':
+                self.profiler.stop()
+            return jsonify(self.profiler.status())
+        
+        @app.route('/metrics')
+        def metrics():
+            """Prometheus metrics; everything is kept current as it happens, so scraping costs nothing."""
+            return Response(self.render_metrics(), mimetype='text/plain; version=0.0.4')
         
         @app.route('/')
         def index():
@@ -2688,39 +5887,126 @@ class TAR1090Monitor:
         def send_static(path):
             return app.send_static_file(path)
         
+        def send_payload(payload: EncodedPayload) -> Response:
+            """Serve an encoded payload, gzipped when the client accepts it, or 304 if the client already has it."""
+            gzipped = 'gzip' in request.accept_encodings
+            etag = payload.etag + ('-gzip' if gzipped else '')  # Each encoding is its own representation
+            if request.if_none_match.contains(etag):
+                self.not_modified += 1
+                response = Response(status=304)
+            else:
+                response = Response(payload.gzip_body if gzipped else payload.body, mimetype=payload.mimetype)
+                if gzipped:
+                    response.headers['Content-Encoding'] = 'gzip'
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'  # Cache, but revalidate every time
+            response.vary.add('Accept-Encoding')
+            response.vary.add('Accept')
+            return response
+        
+        def viewport_args() -> Tuple[Optional[Tuple[float, ...]], Optional[float]]:
+            """?bbox=west,south,east,north (Leaflet's toBBoxString order) and ?zoom=, both optional."""
+            bbox, zoom = request.args.get('bbox'), request.args.get('zoom')
+            if bbox is not None:
+                bbox = tuple(float(value) for value in bbox.split(','))
+                if len(bbox) != 4 or not all(math.isfinite(value) for value in bbox) or bbox[1] > bbox[3]:
+                    raise ValueError('bbox must be west,south,east,north')
+            if zoom is not None:
+                zoom = float(zoom)
+                if not 0 <= zoom <= 30:
+                    raise ValueError('zoom must be between 0 and 30')
+            return bbox, zoom
+        
+        def columnar_requested() -> bool:
+            """Whether ?format=columnar, or failing a format the Accept header, asks for the compact encoding."""
+            wire_format = request.args.get('format')
+            if wire_format is None:
+                return request.accept_mimetypes.best_match(['application/json', COLUMNAR_MEDIA_TYPE]) == COLUMNAR_MEDIA_TYPE
+            if wire_format not in ('json', 'columnar'):
+                raise ValueError('format must be json or columnar')
+            return wire_format == 'columnar'
+        
         @app.route('/api/patterns')
         def get_patterns():
-            return jsonify(self.get_pattern_data_json())
+            """Full pattern data, with ?since=<cycle> only what changed after that cycle,
+            or with ?bbox=&zoom= only what the map view shows. Change sets are always JSON;
+            snapshots can be asked for in the columnar encoding."""
+            since = request.args.get('since')
+            if since is not None:
+                try:
+                    since = int(since)
+                except ValueError:
+                    return jsonify({'error': 'since must be a cycle number'}), 400
+                # A cursor that has aged out of the change history gets a full snapshot
+                return send_payload(self.get_changes_payload(since) or self.get_pattern_payload())
+            
+            try:
+                bbox, zoom = viewport_args()
+                columnar = columnar_requested()
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if bbox is None and zoom is None:
+                return send_payload(self.get_pattern_payload(columnar))
+            return send_payload(self.get_viewport_payload(bbox, zoom, columnar))
+        
+        @app.route('/api/patterns/stream')
+        def stream_patterns():
+            """Server-sent events: one 'changes' event per cycle with what changed on the map."""
+            def events():
+                cycle = self.live_updates.subscribe()
+                try:
+                    yield b'retry: 5000\n\n'
+                    while True:
+                        event = self.live_updates.wait(cycle, timeout=15)
+                        if event is None:
+                            yield b': keep-alive\n\n'  # Also how a closed connection is noticed
+                        else:
+                            cycle, data = event
+                            yield data
+                finally:
+                    self.live_updates.unsubscribe()
+            
+            response = Response(events(), mimetype='text/event-stream')
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Accel-Buffering'] = 'no'  # Stop nginx buffering the stream
+            return response
         
         @app.route('/api/health')
         def health_check():
-            """Health check endpoint for monitoring."""
-            # Count active patterns
-            circling_count = len(self.get_circling_aircraft())
-            grid_count = len(self.get_grid_aircraft())
-            
+            """Health check endpoint for monitoring, served from the record the monitoring loop last published."""
+            health = self.health
+            now = self.clock.time()
             health_status = {
                 'status': 'healthy',
-                'timestamp': time.time(),
+                'timestamp': now,
                 'checks': {
                     'web_server': True,
-                    'tar1090_connection': self.last_update is not None,
-                    'last_update': self.last_update.timestamp() if self.last_update else 0,
-                    'aircraft_count': len(self.aircraft),
-                    'active_circles': circling_count,
-                    'active_grids': grid_count,
-                    'total_requests': self.total_requests,
-                    'failed_requests': self.failed_requests
+                    'tar1090_connection': health.last_update > 0,
+                    'last_update': health.last_update,
+                    'last_cycle': health.published_at,
+                    'cycle_seconds': health.cycle_seconds,
+                    'aircraft_count': health.aircraft_count,
+                    'active_circles': health.active_circles,
+                    'active_grids': health.active_grids,
+                    'total_requests': health.total_requests,
+                    'failed_requests': health.failed_requests,
+                    'failure_rate': health.failure_rate,
+                    **health.details
                 }
             }
             
             # Check if we haven't received updates in a while (5 minutes)
-            if self.last_update and (time.time() - self.last_update.timestamp()) > 300:
+            if health.last_update and (now - health.last_update) > 300:
                 health_status['status'] = 'degraded'
                 health_status['checks']['tar1090_connection'] = False
             
+            # Check if the monitoring loop has stopped publishing
+            if now - health.published_at > max(300, 10 * self.update_interval):
+                health_status['status'] = 'degraded'
+                health_status['checks']['monitor_stalled'] = True
+            
             # Check if too many requests are failing
-            if self.total_requests > 10 and (self.failed_requests / self.total_requests) > 0.5:
+            if health.total_requests > 10 and health.failure_rate > 0.5:
                 health_status['status'] = 'degraded'
                 health_status['checks']['high_failure_rate'] = True
             
@@ -2862,25 +6148,32 @@ class TAR1090Monitor:
         
         @app.route('/api/aircraft')
         def get_aircraft():
-            # Return all aircraft with paths for debugging
+            # Return all aircraft with paths for debugging, optionally limited to ?bbox= and simplified for ?zoom=
+            try:
+                bbox, zoom = viewport_args()
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
             aircraft_data = []
-            for aircraft in self.aircraft.values():
-                if len(aircraft.path) > 2:
-                    aircraft_data.append({
-                        'hex_id': aircraft.hex_id,
-                        'callsign': aircraft.callsign,
-                        'path': [
-                            {'lat': p.lat, 'lon': p.lon, 'alt': p.altitude}
-                            for p in aircraft.path[-50:]  # Last 50 points
-                        ]
-                    })
+            with self.data_lock:  # Tracks change in place on ingest
+                visible = self.get_spatial_index().query(*bbox) if bbox else None
+                for hex_id, aircraft in list(self.aircraft.items()):
+                    if len(aircraft.path) > 2 and (visible is None or hex_id in visible):
+                        positions = self._shown_positions(aircraft.path, max(len(aircraft.path) - 50, 0), zoom)  # Last 50 points
+                        aircraft_data.append({
+                            'hex_id': aircraft.hex_id,
+                            'callsign': aircraft.callsign,
+                            'path': [
+                                {'lat': p.lat, 'lon': p.lon, 'alt': p.altitude}
+                                for p in positions
+                            ]
+                        })
             return jsonify(aircraft_data)
         
         # Run Flask in a separate thread
         def run_flask():
             app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
         
-        self.web_thread = threading.Thread(target=run_flask, daemon=True)
+        self.web_thread = threading.Thread(target=run_flask, name='web-server', daemon=True)
         self.web_thread.start()
         
         # Open browser after a short delay
@@ -2888,15 +6181,22 @@ class TAR1090Monitor:
         webbrowser.open(f'http://localhost:{port}')
         print(f"\n🌐 Web viewer started at http://localhost:{port}")
     
-    def run_monitoring(self, show_all_aircraft=False, quiet_mode=False, compact_mode=False, no_clear=False):
-        """Run continuous monitoring loop."""
+    def run_monitoring(self, show_all_aircraft=False, quiet_mode=False, compact_mode=False, no_clear=False,
+                       use_async=False):
+        """Run continuous monitoring loop, or the asyncio pipeline if use_async is set."""
         self.running = True
         self.compact_mode = compact_mode
         self.no_clear = no_clear
         
         # Initial startup message
         if not compact_mode:
-            print(f"🛰️  Connecting to {self.server_url}")
+            if self.stream is not None:
+                print(f"🛰️  Streaming {self.stream.stream_format.upper()} from {self.stream.host}:{self.stream.port}")
+            elif self.replay is not None:
+                speed = f"{self.replay.speed:g}x" if self.replay.speed > 0 else "full speed"
+                print(f"⏪ Replaying {self.replay.directory} at {speed}")
+            else:
+                print(f"🛰️  Connecting to {', '.join(self.server_urls)}")
             print(f"⏱️  Update interval: {self.update_interval} seconds")
             print(f"🎯 Circle Detection: {self.detector.min_radius}-{self.detector.max_radius}km radius, {self.detector.min_turns}+ turns")
             print(f"📐 Grid Detection: {self.grid_detector.min_legs}+ legs, {self.grid_detector.min_leg_length}+km length")
@@ -2905,12 +6205,19 @@ class TAR1090Monitor:
             print("🔄 Starting monitoring...\n")
 
         try:
+            if use_async:
+                self.pipeline = AsyncPipeline(self, show_all_aircraft=show_all_aircraft, quiet_mode=quiet_mode)
+                asyncio.run(self.pipeline.run())  # Returns once self.running is cleared
+            
             while self.running:
+                self.profiler.begin_cycle()
+                cycle_start = time.perf_counter()
                 success = self.fetch_aircraft_data()
                 if success:
                     # Update circle and grid tracking and logging
                     self.update_circle_tracking()
                     self.update_grid_tracking()
+                    self.update_live_view()
                     
                     # Print status based on mode
                     if not self.compact_mode or self.recent_alerts:
@@ -2919,7 +6226,12 @@ class TAR1090Monitor:
                     if not quiet_mode and not compact_mode:
                         print(f"\r❌ Connection failed. Retrying in {self.update_interval}s...", end="", flush=True)
 
-                time.sleep(self.update_interval)
+                cycle_seconds = time.perf_counter() - cycle_start
+                self.metrics.cycle.observe(cycle_seconds)
+                self.metrics.cycle_overrun.observe(max(0.0, cycle_seconds - self.update_interval))
+                self.publish_health(cycle_seconds)
+                self._end_profiled_cycle()
+                self.clock.sleep(self.update_interval)
 
         except KeyboardInterrupt:
             print("\n\n👋 Stopping monitor... Thanks for using Aircraft Patterns Detector!")
@@ -2928,6 +6240,178 @@ class TAR1090Monitor:
         except Exception as e:
             print(f"\n💥 Unexpected error: {e}")
             self.running = False
+        finally:
+            if self.worker_pool is not None:
+                self.worker_pool.shutdown()
+            if self.stream is not None:
+                self.stream.stop()
+            if self.recorder is not None:
+                self.recorder.close()
+
+
+class AsyncPipeline:
+    """Runs the monitor as fetch, parse, detect and output stages joined by bounded queues.
+
+    Every blocking step runs in a worker thread, so a stalled receiver only
+    holds up the fetch stage while detection, output and the web server keep
+    going. Fetches start on a fixed-rate schedule: when a fetch runs past the
+    next start time it counts as an overrun and the missed ticks are skipped
+    rather than bunched up. A full queue drops its oldest item, so later
+    stages always work on the freshest snapshot. A stage logs and skips a
+    snapshot it fails on, as the serial loop does, instead of stopping the monitor.
+    """
+
+    QUEUE_SIZE = 2
+
+    def __init__(self, monitor: TAR1090Monitor, show_all_aircraft=False, quiet_mode=False):
+        self.monitor = monitor
+        self.show_all_aircraft = show_all_aircraft
+        self.quiet_mode = quiet_mode
+        self.ticks = 0  # Fetches started
+        self.overruns = 0  # Fetches that ran past the next scheduled start
+        self.missed_ticks = 0  # Scheduled fetches skipped because of overruns
+        self.dropped = 0  # Queued items replaced by fresher ones before a stage got to them
+        self.stage_seconds: Dict[str, float] = defaultdict(float)  # Busy time per stage
+
+    def _put_latest(self, queue: asyncio.Queue, item):
+        """Queue an item, dropping the oldest queued item if the queue is full."""
+        if queue.full():
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(item)
+
+    async def _timed(self, stage: str, func, *args):
+        """Run a blocking call in a worker thread and add its duration to the stage's busy time."""
+        start = time.perf_counter()
+        try:
+            return await asyncio.to_thread(func, *args)
+        finally:
+            self.stage_seconds[stage] += time.perf_counter() - start
+
+    def _end_tick(self, tick_start: float):
+        """Publish health once the stage a tick's snapshot got to last is done with it."""
+        self.monitor.publish_health(asyncio.get_running_loop().time() - tick_start)
+
+    async def fetch_stage(self, raw: asyncio.Queue):
+        """Download aircraft.json at a fixed rate."""
+        monitor = self.monitor
+        loop = asyncio.get_running_loop()
+        interval = monitor.update_interval
+        next_tick = loop.time()
+        while monitor.running:
+            self.ticks += 1
+            monitor.profiler.begin_cycle()
+            tick_start = loop.time()
+            try:
+                bodies = await self._timed('fetch', monitor.poll_aircraft_data)
+            except requests.exceptions.RequestException as e:
+                monitor.failed_requests += 1
+                print(f"Error fetching data: {e}")
+                if not self.quiet_mode and not monitor.compact_mode:
+                    print(f"\r❌ Connection failed. Retrying in {interval}s...", end="", flush=True)
+                self._end_tick(tick_start)
+            except Exception as e:
+                monitor.failed_requests += 1
+                print(f"Unexpected error: {e}")
+                self._end_tick(tick_start)
+            else:
+                if any(body is not None for body in bodies):
+                    self._put_latest(raw, (tick_start, bodies))
+                else:
+                    self._end_tick(tick_start)
+            
+            monitor._end_profiled_cycle()
+            next_tick += interval
+            now = loop.time()
+            monitor.metrics.cycle_overrun.observe(max(0.0, now - next_tick))
+            if now > next_tick:
+                missed = int((now - next_tick) // interval) + 1
+                self.overruns += 1
+                self.missed_ticks += missed
+                next_tick += missed * interval
+            await asyncio.sleep(next_tick - now)
+
+    async def parse_stage(self, raw: asyncio.Queue, parsed: asyncio.Queue):
+        """Parse downloaded snapshots, dropping those whose feed 'now' has not changed."""
+        monitor = self.monitor
+        while True:
+            tick_start, bodies = await raw.get()
+            try:
+                data = await self._timed('parse', monitor.parse_aircraft_data, bodies)
+            except ValueError as e:  # Includes json.JSONDecodeError
+                monitor.failed_requests += 1
+                print(f"Error parsing feed: {e}")
+                data = None
+            except Exception as e:
+                monitor.failed_requests += 1
+                print(f"Unexpected error: {e}")
+                data = None
+            else:
+                if data is None:
+                    monitor.unchanged_cycles += 1
+            if data is None:
+                self._end_tick(tick_start)
+            else:
+                self._put_latest(parsed, (tick_start, data))
+
+    def _ingest_and_detect(self, data: Dict):
+        try:
+            self.monitor.ingest_aircraft_data(data)
+        except Exception as e:
+            # Counted like an ingest failure in fetch_aircraft_data
+            self.monitor.failed_requests += 1
+            print(f"Unexpected error: {e}")
+            return
+        self.monitor.update_circle_tracking()
+        self.monitor.update_grid_tracking()
+        self.monitor.update_live_view()
+
+    async def detect_stage(self, parsed: asyncio.Queue, detected: asyncio.Queue):
+        """Ingest parsed snapshots and run detection and logging."""
+        while True:
+            tick_start, data = await parsed.get()
+            try:
+                await self._timed('detect', self._ingest_and_detect, data)
+            except Exception as e:
+                print(f"Error in detection: {e}")
+            else:
+                self._put_latest(detected, self.monitor.cycle)
+            self._end_tick(tick_start)
+
+    async def output_stage(self, detected: asyncio.Queue):
+        """Print the terminal status after each detection pass."""
+        monitor = self.monitor
+        while True:
+            await detected.get()
+            if not monitor.compact_mode or monitor.recent_alerts:
+                await self._timed('output', monitor.print_status, self.show_all_aircraft, self.quiet_mode)
+
+    def stats(self) -> Dict:
+        """Scheduling and queue statistics for the health endpoint."""
+        return {
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'missed_ticks': self.missed_ticks,
+            'dropped': self.dropped,
+            'stage_seconds': {stage: round(seconds, 3) for stage, seconds in self.stage_seconds.items()}
+        }
+
+    async def run(self):
+        """Run all stages until the monitor stops or a stage fails."""
+        raw, parsed, detected = (asyncio.Queue(self.QUEUE_SIZE) for _ in range(3))
+        stages = [
+            asyncio.create_task(self.fetch_stage(raw)),
+            asyncio.create_task(self.parse_stage(raw, parsed)),
+            asyncio.create_task(self.detect_stage(parsed, detected)),
+            asyncio.create_task(self.output_stage(detected)),
+        ]
+        try:
+            done, _ = await asyncio.wait(stages, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()  # Re-raise a stage failure
+        finally:
+            for task in stages:
+                task.cancel()
 
 
 def main():
@@ -2945,6 +6429,8 @@ def main():
                         help='Minimum number of turns to detect (default: 1.5)')
     parser.add_argument('--time-window', type=int, default=300,
                         help='Time window for analysis in seconds (default: 300)')
+    parser.add_argument('--track-capacity', type=int, default=DEFAULT_TRACK_CAPACITY,
+                        help=f'Maximum track points kept per aircraft (default: {DEFAULT_TRACK_CAPACITY})')
     parser.add_argument('--show-all', action='store_true',
                         help='Show all tracked aircraft (warning: may be overwhelming with many aircraft)')
     parser.add_argument('--quiet', '-q', action='store_true',
@@ -2967,18 +6453,52 @@ def main():
                         help='Maximum position jump between updates in km (default: 5.0)')
     parser.add_argument('--smoothing', type=int, default=3,
                         help='Smoothing window size for circle detection (default: 3, 0=disabled)')
+    parser.add_argument('--detector-backend', choices=MONITOR_BACKENDS, default='python',
+                        help='Pattern detector implementation (default: python)')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Worker processes for pattern detection (default: 0 = run in the main process)')
     parser.add_argument('--min-grid-legs', type=int, default=3,
                         help='Minimum parallel legs for grid detection (default: 3)')
     parser.add_argument('--min-leg-length', type=float, default=2.0,
                         help='Minimum leg length in km for grid detection (default: 2.0)')
     parser.add_argument('--grid-time-window', type=int, default=600,
                         help='Time window for grid analysis in seconds (default: 600)')
+    parser.add_argument('--feed-format', choices=['auto', 'json', 'bincraft'], default='json',
+                        help='Polled snapshot format: aircraft.json, or auto for binCraft where served (default: json)')
+    parser.add_argument('--ingest', choices=['poll', 'sbs', 'beast'], default='poll',
+                        help='Position source: poll aircraft.json, or stream SBS (port 30003) or Beast (port 30005)')
+    parser.add_argument('--stream', metavar='HOST[:PORT]',
+                        help='Stream address for --ingest sbs/beast (default: the TAR1090 host on the standard port)')
+    parser.add_argument('--async-pipeline', action='store_true',
+                        help='Run fetch, parse, detection and output as concurrent asyncio stages')
+    parser.add_argument('--record', metavar='DIR',
+                        help='Record every polled snapshot to compressed chunks in DIR')
+    parser.add_argument('--replay', metavar='DIR',
+                        help='Replay snapshots recorded with --record instead of polling')
+    parser.add_argument('--speed', type=float, default=0,
+                        help='Replay speed as a multiple of real time (default: 0 = as fast as possible)')
+    parser.add_argument('--profile', choices=PROFILE_MODES,
+                        help='Profile the first cycles into /app/data/profiles: sample (folded stacks) or cprofile')
+    parser.add_argument('--profile-cycles', type=int, default=10,
+                        help='Cycles to profile with --profile (default: 10)')
     parser.add_argument('--web', action='store_true',
                         help='Start web map viewer')
     parser.add_argument('--web-port', type=int, default=8888,
                         help='Port for web viewer (default: 8888)')
 
     args = parser.parse_args()
+    if args.async_pipeline and args.ingest != 'poll':
+        parser.error('--async-pipeline only applies to --ingest poll')
+    if (args.record or args.replay) and args.ingest != 'poll':
+        parser.error('--record and --replay only apply to --ingest poll')
+    if args.record and args.replay:
+        parser.error('--record and --replay cannot be combined')
+    if args.replay and args.async_pipeline:
+        parser.error('--replay runs the synchronous monitoring loop; drop --async-pipeline')
+    if args.profile == 'cprofile' and args.async_pipeline:
+        parser.error('--profile cprofile only sees one thread; use --profile sample with --async-pipeline')
+    if args.profile_cycles < 1:
+        parser.error('--profile-cycles must be at least 1')
     
     # Handle log-related commands first
     if args.show_log:
@@ -3033,15 +6553,32 @@ def main():
             print("📋 No log files to clear.")
         sys.exit(0)
 
+    # A replay polls the recorded receivers on the recorded schedule
+    replay = None
+    if args.replay:
+        try:
+            replay = SnapshotReplay(args.replay, speed=args.speed)
+        except (OSError, ValueError) as e:
+            parser.error(f'cannot replay {args.replay}: {e}')
+        args.server = replay.manifest['server_urls']
+        args.interval = replay.manifest['update_interval']
+
     # Create monitor with custom settings
-    monitor = TAR1090Monitor(args.server, args.interval)
-    monitor.detector = CircleDetector(
+    monitor = TAR1090Monitor(args.server, args.interval, feed_format=args.feed_format,
+                             clock=VirtualClock() if replay is not None else None)
+    if replay is not None:
+        monitor.replay = replay
+    elif args.record:
+        monitor.recorder = SnapshotRecorder(args.record, monitor.server_urls, monitor.update_interval)
+    monitor.track_capacity = args.track_capacity
+    monitor.detector = CIRCLE_DETECTORS[args.detector_backend](
         min_radius=args.min_radius,
         max_radius=args.max_radius,
         min_turns=args.min_turns,
-        time_window=args.time_window
+        time_window=args.time_window,
+        smoothing_window=args.smoothing
     )
-    monitor.grid_detector = GridDetector(
+    monitor.grid_detector = GRID_DETECTORS[args.detector_backend](
         min_legs=args.min_grid_legs,
         min_leg_length=args.min_leg_length,
         time_window=args.grid_time_window
@@ -3051,29 +6588,21 @@ def main():
     monitor.max_speed_kmh = args.max_speed
     monitor.max_position_jump_km = args.max_jump
     
-    # Configure smoothing
-    if args.smoothing == 0:
-        # Disable smoothing
-        monitor.detector.smooth_path = lambda path: path
-
-    # Override minimum track points for detection
-    original_detect = monitor.detector.detect_circling
-
-    def enhanced_detect(flight_path):
-        if len(flight_path) < args.min_track_points:
-            from dataclasses import dataclass
-            @dataclass
-            class CircleDetection:
-                is_circling: bool
-                center_lat: float
-                center_lon: float
-                radius: float
-                turns: float
-
-            return CircleDetection(False, 0, 0, 0, 0)
-        return original_detect(flight_path)
-
-    monitor.detector.detect_circling = enhanced_detect
+    monitor.min_track_points = args.min_track_points
+    
+    # Stream positions from readsb instead of polling aircraft.json
+    if args.ingest != 'poll':
+        host, _, port = (args.stream or urlparse(monitor.server_url).hostname or 'localhost').partition(':')
+        monitor.stream = StreamIngest(host, int(port or StreamIngest.DEFAULT_PORTS[args.ingest]), args.ingest,
+                                      clock=monitor.clock)
+        monitor.stream.start()
+    
+    if args.profile:
+        monitor.start_profile(args.profile, args.profile_cycles)
+    
+    # Run detectors in worker processes if requested
+    if args.workers > 0:
+        monitor.worker_pool = DetectionWorkerPool(args.workers, monitor.detector, monitor.grid_detector)
 
     if args.test:
         print(f"🧪 Testing connection to {args.server}...")
@@ -3115,7 +6644,14 @@ def main():
         monitor.run_monitoring(show_all_aircraft=getattr(args, 'show_all', False),
                                quiet_mode=getattr(args, 'quiet', False),
                                compact_mode=getattr(args, 'compact', False),
-                               no_clear=getattr(args, 'no_clear', False))
+                               no_clear=getattr(args, 'no_clear', False),
+                               use_async=args.async_pipeline)
+        
+        if replay is not None and replay.finished:
+            stats = replay.stats()
+            print(f"\n⏪ Replayed {stats['polls']} polls covering {stats['recorded_seconds']:.0f}s "
+                  f"in {stats['elapsed_seconds']:.1f}s")
+            monitor.print_log_summary()
 
 
 if __name__ == "__main__":
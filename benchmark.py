@@ -0,0 +1,711 @@
+#!/usr/bin/env python3
+"""Benchmarks for the Aircraft Patterns Detector.
+
+Run ``python benchmark.py --help`` to list the available benchmarks.
+"""
+
+import argparse
+import gc
+import gzip
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from app import (BINCRAFT_BARO_VALID, BINCRAFT_CALLSIGN_VALID, BINCRAFT_GS_VALID, BINCRAFT_POSITION_VALID,
+                 CIRCLE_DETECTORS, GRID_DETECTORS, Aircraft, CircleDetector, DetectionWorkerPool, GridDetector,
+                 IncrementalCircleDetector, Position, ReceiverFeed, StreamIngest, TAR1090Monitor, TrackBuffer,
+                 VectorizedCircleDetector, VectorizedGridDetector, VirtualClock, bincraft_dtype, zstandard)
+from stream_replay import SyntheticTraffic
+from synthetic_traffic import Fleet, FleetConfig
+
+
+def make_track(num_points: int, interval: float, start_time: float = 0.0):
+    """Generate a gently turning track as a list of positions."""
+    lat = random.uniform(30, 50)
+    lon = random.uniform(-120, -70)
+    heading = random.uniform(0, 2 * math.pi)
+    positions = []
+    for i in range(num_points):
+        heading += random.uniform(-0.05, 0.05)
+        lat += 0.001 * math.cos(heading)
+        lon += 0.001 * math.sin(heading)
+        positions.append(Position(
+            lat=lat,
+            lon=lon,
+            timestamp=start_time + i * interval,
+            altitude=float(random.randint(10, 400) * 100),
+            speed=float(random.randint(80, 480))
+        ))
+    return positions
+
+
+def make_circle_track(num_points: int, interval: float, radius_km: float = 2.0, noise_km: float = 0.05):
+    """Generate a noisy circling track as a list of positions."""
+    center_lat = random.uniform(30, 50)
+    center_lon = random.uniform(-120, -70)
+    km_per_deg_lon = 111.32 * math.cos(math.radians(center_lat))
+    seconds_per_turn = random.uniform(60, 180)
+    positions = []
+    for i in range(num_points):
+        angle = 2 * math.pi * i * interval / seconds_per_turn
+        north = radius_km * math.cos(angle) + random.gauss(0, noise_km)
+        east = radius_km * math.sin(angle) + random.gauss(0, noise_km)
+        positions.append(Position(
+            lat=center_lat + north / 111.32,
+            lon=center_lon + east / km_per_deg_lon,
+            timestamp=i * interval,
+            altitude=3000.0,
+            speed=110.0
+        ))
+    return positions
+
+
+def make_survey_track(num_points: int, interval: float, leg_km: float = 6.0, spacing_km: float = 1.0,
+                      speed_kmh: float = 250.0, noise_km: float = 0.02):
+    """Generate a lawnmower survey track as a list of positions."""
+    origin_lat = random.uniform(30, 50)
+    origin_lon = random.uniform(-120, -70)
+    km_per_deg_lon = 111.32 * math.cos(math.radians(origin_lat))
+    rotation = random.uniform(0, math.pi)
+    step = speed_kmh / 3600 * interval
+    positions = []
+    along, across, direction = 0.0, 0.0, 1
+    for i in range(num_points):
+        # Fly along the leg, then step across to the next leg and reverse
+        along += direction * step
+        if along > leg_km or along < 0:
+            along = min(max(along, 0.0), leg_km)
+            across += spacing_km
+            direction = -direction
+        north = along * math.cos(rotation) - across * math.sin(rotation) + random.gauss(0, noise_km)
+        east = along * math.sin(rotation) + across * math.cos(rotation) + random.gauss(0, noise_km)
+        positions.append(Position(
+            lat=origin_lat + north / 111.32,
+            lon=origin_lon + east / km_per_deg_lon,
+            timestamp=i * interval,
+            altitude=5000.0,
+            speed=speed_kmh / 1.852
+        ))
+    return positions
+
+
+def to_buffer(track) -> TrackBuffer:
+    """Copy a list of positions into a track buffer."""
+    buffer = TrackBuffer(max(len(track), 1))
+    for p in track:
+        buffer.append(p)
+    return buffer
+
+
+def time_calls(func, items, repeat: int) -> float:
+    """Return the best average seconds per call of func over items."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, (time.perf_counter() - start) / len(items))
+    return best
+
+
+def measure_memory(build):
+    """Return (bytes allocated, result) for a builder function."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def bench_track_store(args):
+    """Compare List[Position] tracks with TrackBuffer tracks."""
+    num_points = int(args.window / args.interval)
+    print(f"Track store: {args.aircraft} aircraft x {args.window}s at {args.interval}s "
+          f"({num_points} points per track)")
+    tracks = [make_track(num_points, args.interval) for _ in range(args.aircraft)]
+
+    def build_lists():
+        # Fresh float objects, as parsing aircraft.json would produce
+        return [
+            [Position(p.lat + 0.0, p.lon + 0.0, p.timestamp + 0.0, p.altitude + 0.0, p.speed + 0.0) for p in track]
+            for track in tracks
+        ]
+
+    def build_buffers():
+        buffers = []
+        for track in tracks:
+            buffer = TrackBuffer(max(num_points, 1))
+            for p in track:
+                buffer.append(p)
+            buffers.append(buffer)
+        return buffers
+
+    list_bytes, lists = measure_memory(build_lists)
+    buffer_bytes, buffers = measure_memory(build_buffers)
+
+    # One poll: append a point to every track and evict points outside the window
+    poll_time = num_points * args.interval
+    new_points = [Position(t[-1].lat, t[-1].lon, poll_time, t[-1].altitude, t[-1].speed) for t in tracks]
+    cutoff = poll_time - args.window
+
+    start = time.perf_counter()
+    for i, track in enumerate(lists):
+        track.append(new_points[i])
+        lists[i] = [p for p in track if p.timestamp >= cutoff]
+    list_poll = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, buffer in enumerate(buffers):
+        buffer.append(new_points[i])
+        buffer.evict_before(cutoff)
+    buffer_poll = time.perf_counter() - start
+
+    print(f"{'layout':<18}{'memory MB':>12}{'bytes/point':>14}{'poll ms':>10}")
+    total_points = args.aircraft * num_points
+    for name, size, poll in (('List[Position]', list_bytes, list_poll), ('TrackBuffer', buffer_bytes, buffer_poll)):
+        print(f"{name:<18}{size / 1e6:>12.1f}{size / max(total_points, 1):>14.1f}{poll * 1000:>10.2f}")
+    print(f"Memory ratio: {list_bytes / max(buffer_bytes, 1):.1f}x smaller with TrackBuffer")
+
+
+def bench_circle(args):
+    """Compare the pure-Python and NumPy circle detectors."""
+    print(f"Circle detection: {args.tracks} tracks x {args.points} points")
+    tracks = []
+    for i in range(args.tracks):
+        if i % 2:
+            tracks.append(make_track(args.points, args.interval))
+        else:
+            tracks.append(make_circle_track(args.points, args.interval, radius_km=random.uniform(0.5, 8)))
+    buffers = [to_buffer(track) for track in tracks]
+
+    python_detector = CircleDetector()
+    numpy_detector = VectorizedCircleDetector()
+
+    # Check the backends agree before timing them
+    max_error = 0.0
+    mismatches = 0
+    for buffer in buffers:
+        expected = python_detector.detect_circling(buffer)
+        actual = numpy_detector.detect_circling(buffer)
+        if expected.is_circling != actual.is_circling:
+            mismatches += 1
+        for field in ('center_lat', 'center_lon', 'radius', 'turns'):
+            a, b = getattr(expected, field), getattr(actual, field)
+            max_error = max(max_error, abs(a - b) / max(abs(a), 1e-12))
+
+    python_time = time_calls(python_detector.detect_circling, buffers, args.repeat)
+    numpy_time = time_calls(numpy_detector.detect_circling, buffers, args.repeat)
+
+    print(f"{'backend':<10}{'us/track':>12}")
+    print(f"{'python':<10}{python_time * 1e6:>12.1f}")
+    print(f"{'numpy':<10}{numpy_time * 1e6:>12.1f}")
+    print(f"Speedup: {python_time / numpy_time:.1f}x")
+    print(f"Max relative difference: {max_error:.2e} (tolerance 1e-9), is_circling mismatches: {mismatches}")
+
+
+def bench_incremental(args):
+    """Per-cycle cost of batch vs incremental circle detection on a live fleet."""
+    num_points = int(args.window / args.interval)
+    total_points = num_points + args.cycles
+    print(f"Incremental detection: {args.aircraft} aircraft, {args.window}s window at {args.interval}s, "
+          f"{args.cycles} cycles")
+    tracks = []
+    for i in range(args.aircraft):
+        if i % 4 == 0:
+            tracks.append(make_circle_track(total_points, args.interval, radius_km=random.uniform(0.5, 8)))
+        else:
+            tracks.append(make_track(total_points, args.interval))
+
+    results = {}
+    for name, detector in (('numpy', VectorizedCircleDetector()), ('incremental', IncrementalCircleDetector())):
+        buffers = [TrackBuffer(num_points + 1) for _ in tracks]
+        for buffer, track in zip(buffers, tracks):
+            for p in track[:num_points]:
+                buffer.append(p)
+        detector.detect_circling(buffers[0])  # Warm up
+
+        elapsed = 0.0
+        for cycle in range(num_points, total_points):
+            now = cycle * args.interval
+            for buffer, track in zip(buffers, tracks):
+                buffer.append(track[cycle])
+                buffer.evict_before(now - args.window)
+            start = time.perf_counter()
+            detections = [detector.detect_circling(buffer) for buffer in buffers]
+            elapsed += time.perf_counter() - start
+        results[name] = (elapsed / args.cycles, detections)
+
+    print(f"{'backend':<14}{'ms/cycle':>10}")
+    for name, (per_cycle, _) in results.items():
+        print(f"{name:<14}{per_cycle * 1000:>10.2f}")
+    batch, incremental = results['numpy'][1], results['incremental'][1]
+    agree = sum(a.is_circling == b.is_circling for a, b in zip(batch, incremental))
+    both = [(a, b) for a, b in zip(batch, incremental) if a.is_circling and b.is_circling]
+    print(f"Speedup: {results['numpy'][0] / results['incremental'][0]:.1f}x, "
+          f"is_circling agreement: {agree}/{len(batch)}")
+    if both:
+        radius_error = max(abs(a.radius - b.radius) / a.radius for a, b in both)
+        turns_error = max(abs(a.turns - b.turns) for a, b in both)
+        print(f"Circling tracks: max radius difference {radius_error:.1%}, max turns difference {turns_error:.2f}")
+
+
+def bench_grid(args):
+    """Compare the pure-Python and NumPy grid detectors across a fleet."""
+    print(f"Grid detection: {args.aircraft} aircraft x {args.points} points "
+          f"({args.surveys:.0%} flying surveys)")
+    buffers = []
+    for i in range(args.aircraft):
+        if i < args.aircraft * args.surveys:
+            track = make_survey_track(args.points, args.interval, spacing_km=random.uniform(0.5, 3))
+        elif i % 2:
+            track = make_circle_track(args.points, args.interval, radius_km=random.uniform(0.5, 8))
+        else:
+            track = make_track(args.points, args.interval)
+        buffers.append(to_buffer(track))
+
+    python_detector = GridDetector()
+    numpy_detector = VectorizedGridDetector()
+    expected = [python_detector.detect_grid_pattern(b) for b in buffers]
+    actual = [numpy_detector.detect_grid_pattern(b) for b in buffers]
+    agree = sum(a.is_grid_pattern == b.is_grid_pattern for a, b in zip(expected, actual))
+    same_legs = sum(a.num_legs == b.num_legs for a, b in zip(expected, actual) if a.is_grid_pattern and b.is_grid_pattern)
+    detected = sum(a.is_grid_pattern for a in expected)
+
+    fleet = numpy_detector.detect_fleet(buffers)
+    assert fleet == actual, 'detect_fleet disagrees with detect_grid_pattern'
+
+    python_time = time_calls(python_detector.detect_grid_pattern, buffers, args.repeat) * len(buffers)
+    numpy_time = time_calls(numpy_detector.detect_grid_pattern, buffers, args.repeat) * len(buffers)
+    fleet_time = time_calls(numpy_detector.detect_fleet, [buffers], args.repeat)
+
+    print(f"{'backend':<14}{'ms/fleet':>10}{'us/track':>10}")
+    for name, elapsed in (('python', python_time), ('numpy', numpy_time), ('numpy fleet', fleet_time)):
+        print(f"{name:<14}{elapsed * 1000:>10.2f}{elapsed / len(buffers) * 1e6:>10.1f}")
+    print(f"Speedup: {python_time / fleet_time:.1f}x, is_grid_pattern agreement: {agree}/{len(buffers)} "
+          f"({detected} grids, {same_legs} with identical leg counts)")
+
+
+def bench_workers(args):
+    """Time one full detection cycle in-process and across worker pools of increasing size."""
+    print(f"Worker scaling: {args.aircraft} aircraft x {args.points} points, {args.backend} detectors, "
+          f"{os.cpu_count()} CPUs")
+    fleet = []
+    for i in range(args.aircraft):
+        if i % 10 == 0:
+            track = make_survey_track(args.points, args.interval, spacing_km=random.uniform(0.5, 3))
+        elif i % 2:
+            track = make_circle_track(args.points, args.interval, radius_km=random.uniform(0.5, 8))
+        else:
+            track = make_track(args.points, args.interval)
+        fleet.append(Aircraft(hex_id=f'{random.getrandbits(24):06x}', callsign='', path=to_buffer(track), last_update=0))
+
+    circle_detector = CIRCLE_DETECTORS[args.backend]()
+    grid_detector = GRID_DETECTORS[args.backend]()
+    payload = sum(3 * a.path.lat.nbytes + 4 for a in fleet)
+
+    def in_process(_):
+        circles = [circle_detector.detect_circling(a.path) for a in fleet]
+        grids = [grid_detector.detect_grid_pattern(a.path) for a in fleet]
+        return circles, grids
+
+    expected = in_process(None)
+    baseline = time_calls(in_process, [None], args.repeat)
+    print(f"{'workers':<10}{'ms/cycle':>10}{'speedup':>10}")
+    print(f"{'in-proc':<10}{baseline * 1000:>10.1f}{1.0:>9.2f}x")
+    for workers in args.workers:
+        pool = DetectionWorkerPool(workers, circle_detector, grid_detector)
+        try:
+            def pooled(_):
+                return pool.detect('circle', fleet), pool.detect('grid', fleet)
+
+            assert pooled(None) == expected, 'worker pool disagrees with in-process detection'
+            elapsed = time_calls(pooled, [None], args.repeat)
+        finally:
+            pool.shutdown()
+        print(f"{workers:<10}{elapsed * 1000:>10.1f}{baseline / elapsed:>9.2f}x")
+    print(f"Track payload shipped per detector pass: {payload / 1024:.0f} KiB")
+
+
+def make_receiver_snapshots(num_aircraft: int, receivers: int, coverage: float, cycles: int, interval: float):
+    """Generate aircraft.json bodies per cycle for receivers with overlapping coverage."""
+    fleet = []
+    for k in range(num_aircraft):
+        seen_by = [r for r in range(receivers) if random.random() < coverage] or [random.randrange(receivers)]
+        fleet.append((f'{k:06x}', random.uniform(30, 50), random.uniform(-120, -70),
+                      random.uniform(0, 2 * math.pi), random.uniform(50, 250), seen_by))
+
+    snapshots = []
+    for cycle in range(cycles):
+        bodies = []
+        for r in range(receivers):
+            now = 1_700_000_000 + cycle * interval + r * 0.1
+            aircraft = []
+            for hex_id, lat, lon, heading, speed_ms, seen_by in fleet:
+                if r not in seen_by:
+                    continue
+                seen_pos = random.uniform(0, 3)
+                dist_deg = speed_ms * (now - seen_pos - 1_700_000_000) / 111_000
+                aircraft.append({
+                    'hex': hex_id, 'flight': f'T{hex_id}', 'alt_baro': 5000, 'gs': speed_ms * 1.94,
+                    'lat': round(lat + dist_deg * math.cos(heading), 6),
+                    'lon': round(lon + dist_deg * math.sin(heading) / math.cos(math.radians(lat)), 6),
+                    'seen_pos': round(seen_pos, 1)
+                })
+            bodies.append(json.dumps({'now': now, 'aircraft': aircraft}).encode())
+        snapshots.append(bodies)
+    return snapshots
+
+
+def bench_merge(args):
+    """Cost per snapshot of parsing, merging and ingesting several receivers' feeds."""
+    print(f"Receiver merge: {args.aircraft} aircraft, {args.receivers} receivers "
+          f"({args.coverage:.0%} coverage each), {args.cycles} snapshots")
+    snapshots = make_receiver_snapshots(args.aircraft, args.receivers, args.coverage, args.cycles, args.interval)
+    monitor = TAR1090Monitor(','.join(f'http://receiver{r}' for r in range(args.receivers)))
+
+    parse_time = merge_time = ingest_time = 0.0
+    for bodies in snapshots:
+        start = time.perf_counter()
+        for feed, body in zip(monitor.feeds, bodies):
+            feed.parse(body)
+        parsed = time.perf_counter()
+        merged = monitor.merge_snapshots([feed.data for feed in monitor.feeds])
+        mid = time.perf_counter()
+        monitor.ingest_aircraft_data(merged)
+        end = time.perf_counter()
+        parse_time += parsed - start
+        merge_time += mid - parsed
+        ingest_time += end - mid
+
+    entries_per_snapshot = monitor.merge_entries / args.cycles
+    total = parse_time + merge_time + ingest_time
+    print(f"{'stage':<10}{'ms/snapshot':>14}")
+    for name, elapsed in (('parse', parse_time), ('merge', merge_time), ('ingest', ingest_time), ('total', total)):
+        print(f"{name:<10}{elapsed / args.cycles * 1000:>14.2f}")
+    print(f"{entries_per_snapshot:.0f} entries -> {len(monitor.aircraft)} aircraft per snapshot "
+          f"({monitor.merge_duplicates / args.cycles:.0f} duplicates removed), "
+          f"{entries_per_snapshot * args.cycles / total:,.0f} entries/s")
+    print(f"Positions accepted: {monitor.positions_accepted}, filtered: {monitor.positions_filtered}")
+
+
+def encode_bincraft(data: dict, stride: int = 112) -> bytes:
+    """Encode an aircraft.json snapshot as aircraft.binCraft."""
+    records = np.zeros(len(data['aircraft']) + 1, dtype=bincraft_dtype(stride))
+    now_ms = int(data['now'] * 1000)
+    header = records[:1].view('<u4')
+    header[0], header[1], header[2] = now_ms & 0xFFFFFFFF, now_ms >> 32, stride
+    for record, ac_data in zip(records[1:], data['aircraft']):
+        hex_id = ac_data['hex']
+        record['addr'] = int(hex_id.lstrip('~'), 16) | (0x1000000 if hex_id.startswith('~') else 0)
+        record['seen_pos'] = round(ac_data['seen_pos'] * 10)
+        record['lat'] = round(ac_data['lat'] * 1e6)
+        record['lon'] = round(ac_data['lon'] * 1e6)
+        record['alt_baro'] = round(ac_data['alt_baro'] / 25)
+        record['gs'] = round(ac_data['gs'] * 10)
+        record['flight'] = ac_data['flight'].encode()
+        record['validity'] = BINCRAFT_POSITION_VALID | BINCRAFT_CALLSIGN_VALID | BINCRAFT_BARO_VALID | BINCRAFT_GS_VALID
+    return records.tobytes()
+
+
+def bench_feed_format(args):
+    """Bytes per poll and parse cost per 1,000 aircraft of aircraft.json vs aircraft.binCraft."""
+    print(f"Feed format: {args.aircraft} aircraft, {args.cycles} snapshots")
+    json_bodies = [bodies[0] for bodies in make_receiver_snapshots(args.aircraft, 1, 1.0, args.cycles, args.interval)]
+    formats = {'json': json_bodies, 'bincraft': [encode_bincraft(json.loads(body)) for body in json_bodies]}
+
+    print(f"{'format':<10}{'bytes/poll':>12}{'gzip':>10}{'zstd':>10}{'parse ms/1k':>13}{'+ ingest ms/1k':>16}")
+    for name, bodies in formats.items():
+        size = sum(map(len, bodies)) / len(bodies)
+        gzipped = sum(len(gzip.compress(body)) for body in bodies) / len(bodies)
+        zstd = (f"{sum(len(zstandard.ZstdCompressor().compress(body)) for body in bodies) / len(bodies):>10,.0f}"
+                if zstandard is not None else f"{'n/a':>10}")
+
+        feed = ReceiverFeed('http://localhost', feed_format=name)
+        if name == 'bincraft':
+            feed.formats = ['bincraft']  # Time the raw decode; compression is reported separately
+        monitor = TAR1090Monitor('http://localhost')
+        parse_time = ingest_time = 0.0
+        for body in bodies:
+            start = time.perf_counter()
+            feed.parse(body)
+            mid = time.perf_counter()
+            monitor.ingest_aircraft_data(feed.data)
+            parse_time += mid - start
+            ingest_time += time.perf_counter() - mid
+
+        per_1000 = 1000 / (args.aircraft * len(bodies)) * 1000
+        print(f"{name:<10}{size:>12,.0f}{gzipped:>10,.0f}{zstd}{parse_time * per_1000:>13.2f}"
+              f"{(parse_time + ingest_time) * per_1000:>16.2f}")
+
+
+def bench_stream(args):
+    """Messages per second one core sustains decoding an SBS or Beast stream and ingesting it."""
+    print(f"Stream ingest: {args.format.upper()}, {args.aircraft} aircraft, {args.seconds}s of traffic")
+    traffic = SyntheticTraffic(args.aircraft, seed=args.seed)
+    start_time = 1_700_000_000.0
+    # One chunk per 5 s cycle, as the monitoring loop would drain them
+    cycles = []
+    for cycle in range(int(args.seconds / 5)):
+        ticks = range(cycle * 10, (cycle + 1) * 10)
+        cycles.append(b''.join(m for tick in ticks for m in traffic.messages(args.format, tick, start_time + tick * 0.5)))
+    total_bytes = sum(len(data) for data in cycles)
+
+    decoder = StreamIngest.DECODERS[args.format]()
+    monitor = TAR1090Monitor('http://localhost')
+    decode_time = ingest_time = 0.0
+    positions = 0
+    for cycle, data in enumerate(cycles):
+        now = start_time + (cycle + 1) * 5
+        start = time.perf_counter()
+        updates = []
+        for i in range(0, len(data), 65536):  # Socket-sized reads
+            updates.extend(decoder.feed(data[i:i + 65536], now))
+        mid = time.perf_counter()
+        monitor.ingest_aircraft_data({'now': now, 'aircraft': [entry for _, entry in updates]})
+        decode_time += mid - start
+        ingest_time += time.perf_counter() - mid
+        positions += len(updates)
+
+    messages = decoder.messages
+    print(f"{messages:,} messages ({total_bytes / 1e6:.1f} MB), {positions:,} positions, "
+          f"{decoder.errors} decode errors")
+    print(f"{'stage':<18}{'seconds':>10}{'msgs/s':>14}")
+    for name, elapsed in (('decode', decode_time), ('decode + ingest', decode_time + ingest_time)):
+        print(f"{name:<18}{elapsed:>10.2f}{messages / elapsed:>14,.0f}")
+    live_rate = args.aircraft * 2 * (1 + 0.5 + 0.1)  # Messages per second the traffic itself produces
+    print(f"Live traffic rate: {live_rate:,.0f} msgs/s, {live_rate / (messages / (decode_time + ingest_time)):.1%} of one core")
+
+
+def time_repeats(func, items, repeat: int) -> list:
+    """Return the average seconds per call of func over items, once per repetition."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        samples.append((time.perf_counter() - start) / len(items))
+    return samples
+
+
+def git_commit():
+    """Short hash of the checked-out commit, with '-dirty' for local changes, or None outside git."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+
+def bench_suite(args):
+    """Time the detection hot paths on a synthetic fleet and emit machine-readable results."""
+    config = FleetConfig(aircraft=args.aircraft, circling=args.circling, surveys=args.surveys,
+                         noise_km=args.noise, dropout=args.dropout, seed=args.seed)
+    fleet = Fleet(config)
+    snapshots = list(fleet.snapshots(args.window, args.interval))
+    bodies = [json.dumps(data).encode() for data in snapshots]
+    print(f"Benchmark suite: {args.aircraft} aircraft ({args.circling:.0%} circling, {args.surveys:.0%} surveys), "
+          f"{len(snapshots)} snapshots every {args.interval:g}s")
+
+    # Parse and ingest every snapshot, as fetch_aircraft_data would after the download
+    monitor = TAR1090Monitor('http://localhost', clock=VirtualClock())
+    feed = monitor.feeds[0]
+    parse_samples = []
+    for body in bodies:
+        start = time.perf_counter()
+        feed.parse(body)
+        monitor.ingest_aircraft_data(feed.data)
+        parse_samples.append(time.perf_counter() - start)
+        monitor.clock.set(feed.now)
+
+    tracks = [aircraft.path for aircraft in monitor.aircraft.values() if len(aircraft.path) >= 10]
+    circle_detector = CircleDetector()
+    grid_detector = GridDetector()
+
+    # One more position per aircraft, as the next poll would bring
+    last = snapshots[-1]['now']
+    candidates = []
+    for aircraft in monitor.aircraft.values():
+        p = aircraft.path[-1]
+        candidates.append((aircraft, Position(p.lat + 0.0005, p.lon, last + args.interval, p.altitude, p.speed)))
+
+    def pattern_json(_):
+        json.dumps(monitor.get_pattern_data_json(include_all_aircraft=True))
+
+    monitor.get_pattern_data_json()  # Detection runs once per cycle; time only the serialization
+    results = {
+        'fetch_parse_ingest': ('ms/snapshot', [s * 1000 for s in parse_samples]),
+        'circle_detector': ('us/track', [s * 1e6 for s in time_repeats(circle_detector.detect_circling, tracks,
+                                                                          args.repeat)]),
+        'grid_detector': ('us/track', [s * 1e6 for s in time_repeats(grid_detector.detect_grid_pattern, tracks,
+                                                                        args.repeat)]),
+        'validate_position': ('us/call', [s * 1e6 for s in time_repeats(lambda c: monitor.validate_position(*c),
+                                                                         candidates, args.repeat)]),
+        'pattern_json': ('ms/call', [s * 1000 for s in time_repeats(pattern_json, range(5), args.repeat)]),
+    }
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'config': {'aircraft': args.aircraft, 'circling': args.circling, 'surveys': args.surveys,
+                   'noise_km': args.noise, 'dropout': args.dropout, 'window': args.window,
+                   'interval': args.interval, 'repeat': args.repeat, 'seed': args.seed},
+        'tracks': len(tracks),
+        'detections': {'circles': len(monitor.get_circling_aircraft()), 'grids': len(monitor.get_grid_aircraft())},
+        'results': {
+            name: {'unit': unit, 'median': statistics.median(samples), 'min': min(samples),
+                   'p95': sorted(samples)[int(0.95 * (len(samples) - 1))], 'samples': len(samples)}
+            for name, (unit, samples) in results.items()
+        }
+    }
+
+    print(f"{'benchmark':<20}{'unit':>12}{'median':>12}{'min':>12}{'p95':>12}")
+    for name, result in report['results'].items():
+        print(f"{name:<20}{result['unit']:>12}{result['median']:>12.3f}{result['min']:>12.3f}{result['p95']:>12.3f}")
+    print(f"{report['tracks']} tracks, {report['detections']['circles']} circles and "
+          f"{report['detections']['grids']} grids detected, commit {report['commit']}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+def bench_compare(args):
+    """Compare two benchmark suite results, exiting non-zero if any benchmark slowed down past the threshold."""
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    if baseline['config'] != current['config']:
+        print("⚠️  The runs used different configurations; ratios may not be comparable")
+
+    print(f"{'benchmark':<20}{'unit':>12}{baseline['commit'] or 'baseline':>14}{current['commit'] or 'current':>14}"
+          f"{'ratio':>8}")
+    regressions = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"{name:<20}{result['unit']:>12}{'-':>14}{result['median']:>14.3f}{'new':>8}")
+            continue
+        ratio = result['median'] / before['median']
+        flag = ' ⚠️' if ratio > 1 + args.threshold else ''
+        print(f"{name:<20}{result['unit']:>12}{before['median']:>14.3f}{result['median']:>14.3f}{ratio:>7.2f}x{flag}")
+        if flag:
+            regressions.append(name)
+    if regressions:
+        print(f"Slower by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Aircraft Patterns Detector benchmarks')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    subparsers = parser.add_subparsers(dest='benchmark')
+    subparsers.required = True
+
+    track_store = subparsers.add_parser('track-store', help='Memory and per-poll cost of the track store')
+    track_store.add_argument('--aircraft', type=int, default=1000, help='Number of aircraft (default: 1000)')
+    track_store.add_argument('--window', type=int, default=600, help='Track window in seconds (default: 600)')
+    track_store.add_argument('--interval', type=float, default=1.0,
+                             help='Seconds between positions (default: 1.0)')
+    track_store.set_defaults(func=bench_track_store)
+
+    circle = subparsers.add_parser('circle', help='Pure-Python vs NumPy circle detector')
+    circle.add_argument('--tracks', type=int, default=200, help='Number of tracks (default: 200)')
+    circle.add_argument('--points', type=int, default=300, help='Points per track (default: 300)')
+    circle.add_argument('--interval', type=float, default=1.0, help='Seconds between positions (default: 1.0)')
+    circle.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    circle.set_defaults(func=bench_circle)
+
+    incremental = subparsers.add_parser('incremental', help='Batch vs incremental circle detection per cycle')
+    incremental.add_argument('--aircraft', type=int, default=400, help='Number of aircraft (default: 400)')
+    incremental.add_argument('--window', type=int, default=300, help='Detection window in seconds (default: 300)')
+    incremental.add_argument('--interval', type=float, default=1.0,
+                             help='Seconds between positions (default: 1.0)')
+    incremental.add_argument('--cycles', type=int, default=20, help='Cycles to time (default: 20)')
+    incremental.set_defaults(func=bench_incremental)
+
+    grid = subparsers.add_parser('grid', help='Pure-Python vs NumPy grid detector across a fleet')
+    grid.add_argument('--aircraft', type=int, default=400, help='Number of aircraft (default: 400)')
+    grid.add_argument('--points', type=int, default=600, help='Points per track (default: 600)')
+    grid.add_argument('--interval', type=float, default=1.0, help='Seconds between positions (default: 1.0)')
+    grid.add_argument('--surveys', type=float, default=0.1,
+                      help='Fraction of aircraft flying survey grids (default: 0.1)')
+    grid.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    grid.set_defaults(func=bench_grid)
+
+    workers = subparsers.add_parser('workers', help='Detection cycle time across worker pool sizes')
+    workers.add_argument('--aircraft', type=int, default=2000, help='Number of aircraft (default: 2000)')
+    workers.add_argument('--points', type=int, default=300, help='Points per track (default: 300)')
+    workers.add_argument('--interval', type=float, default=1.0, help='Seconds between positions (default: 1.0)')
+    workers.add_argument('--backend', choices=sorted(CIRCLE_DETECTORS), default='numpy',
+                         help='Detector backend (default: numpy)')
+    workers.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                         help='Pool sizes to time (default: 1 2 4 8)')
+    workers.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    workers.set_defaults(func=bench_workers)
+
+    merge = subparsers.add_parser('merge', help='Parse, merge and ingest cost for several receivers')
+    merge.add_argument('--aircraft', type=int, default=5000, help='Number of aircraft (default: 5000)')
+    merge.add_argument('--receivers', type=int, default=3, help='Number of receivers (default: 3)')
+    merge.add_argument('--coverage', type=float, default=0.5,
+                       help='Fraction of aircraft each receiver sees (default: 0.5)')
+    merge.add_argument('--cycles', type=int, default=10, help='Snapshots to time (default: 10)')
+    merge.add_argument('--interval', type=float, default=5.0, help='Seconds between snapshots (default: 5.0)')
+    merge.set_defaults(func=bench_merge)
+
+    feed_format = subparsers.add_parser('feed-format', help='Bytes per poll and parse cost, aircraft.json vs binCraft')
+    feed_format.add_argument('--aircraft', type=int, default=1000, help='Number of aircraft (default: 1000)')
+    feed_format.add_argument('--cycles', type=int, default=20, help='Snapshots to time (default: 20)')
+    feed_format.add_argument('--interval', type=float, default=5.0, help='Seconds between snapshots (default: 5.0)')
+    feed_format.set_defaults(func=bench_feed_format)
+
+    stream = subparsers.add_parser('stream', help='Messages per second decoded and ingested from an SBS/Beast stream')
+    stream.add_argument('--format', choices=sorted(StreamIngest.DECODERS), default='beast',
+                        help='Stream format (default: beast)')
+    stream.add_argument('--aircraft', type=int, default=500, help='Number of aircraft (default: 500)')
+    stream.add_argument('--seconds', type=int, default=60, help='Seconds of traffic to generate (default: 60)')
+    stream.set_defaults(func=bench_stream)
+
+    suite = subparsers.add_parser('suite', help='Time the hot paths on a synthetic fleet, optionally saving JSON results')
+    suite.add_argument('--aircraft', type=int, default=500, help='Number of aircraft (default: 500)')
+    suite.add_argument('--circling', type=float, default=0.2, help='Fraction circling (default: 0.2)')
+    suite.add_argument('--surveys', type=float, default=0.1, help='Fraction flying survey grids (default: 0.1)')
+    suite.add_argument('--noise', type=float, default=0.02, help='GPS noise in km (default: 0.02)')
+    suite.add_argument('--dropout', type=float, default=0.05,
+                       help='Probability a position is missing from a snapshot (default: 0.05)')
+    suite.add_argument('--window', type=float, default=600, help='Seconds of traffic (default: 600)')
+    suite.add_argument('--interval', type=float, default=5.0, help='Seconds between snapshots (default: 5.0)')
+    suite.add_argument('--repeat', type=int, default=5, help='Timing repetitions (default: 5)')
+    suite.add_argument('--output', metavar='FILE', help='Write results as JSON')
+    suite.set_defaults(func=bench_suite)
+
+    compare = subparsers.add_parser('compare', help='Compare two suite results, e.g. from two commits')
+    compare.add_argument('baseline', help='Baseline results JSON')
+    compare.add_argument('current', help='Current results JSON')
+    compare.add_argument('--threshold', type=float, default=0.1,
+                         help='Slowdown that counts as a regression (default: 0.1 = 10%%)')
+    compare.set_defaults(func=bench_compare)
+
+    args = parser.parse_args()
+    random.seed(args.seed)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Serve an SBS (port 30003) or Beast (port 30005) stream for offline testing.
+
+Replays a recorded stream, or synthesizes traffic with a mix of circling
+and straight-flying aircraft, to every client that connects:
+
+    python stream_replay.py --format beast --aircraft 50
+    python stream_replay.py --format sbs --file recording.sbs --rate 2000
+    python app.py --server http://localhost --ingest beast --stream localhost:30005
+"""
+
+import argparse
+import math
+import random
+import socketserver
+import time
+from datetime import datetime, timezone
+
+from app import ADSB_CHARSET, BEAST_FRAME_LENGTHS, cpr_nl, modes_crc, split_beast_frames
+
+KM_PER_DEG = 111.32
+
+
+def encode_altitude(altitude_ft: float) -> int:
+    """12-bit altitude field with the 25 ft (Q bit) encoding."""
+    n = max(0, min(int(round((altitude_ft + 1000) / 25)), 0x7FF))
+    return ((n & 0x7F0) << 1) | 0x10 | (n & 0x0F)
+
+
+def cpr_encode(lat: float, lon: float, odd: int):
+    """Airborne CPR encoding of a position, returning 17-bit (lat, lon)."""
+    dlat = 360 / (60 - odd)
+    yz = math.floor(131072 * (lat % dlat) / dlat + 0.5)
+    rlat = dlat * (yz / 131072 + math.floor(lat / dlat))
+    zones = cpr_nl(rlat) - odd
+    dlon = 360 / zones if zones > 0 else 360
+    xz = math.floor(131072 * (lon % dlon) / dlon + 0.5)
+    return yz & 0x1FFFF, xz & 0x1FFFF
+
+
+def extended_squitter(icao: int, me: int) -> bytes:
+    """DF17 message with a 56-bit ME field and its parity."""
+    msg = bytes([0x8D]) + icao.to_bytes(3, 'big') + me.to_bytes(7, 'big')
+    return msg + modes_crc(msg).to_bytes(3, 'big')
+
+
+def position_message(icao: int, lat: float, lon: float, altitude_ft: float, odd: int) -> bytes:
+    lat_cpr, lon_cpr = cpr_encode(lat, lon, odd)
+    me = (11 << 51) | (encode_altitude(altitude_ft) << 36) | (odd << 34) | (lat_cpr << 17) | lon_cpr
+    return extended_squitter(icao, me)
+
+
+def velocity_message(icao: int, speed_kt: float, track_deg: float) -> bytes:
+    east = speed_kt * math.sin(math.radians(track_deg))
+    north = speed_kt * math.cos(math.radians(track_deg))
+    east_west = min(int(round(abs(east))) + 1, 0x3FF)
+    north_south = min(int(round(abs(north))) + 1, 0x3FF)
+    me = ((19 << 51) | (1 << 48) | (int(east < 0) << 42) | (east_west << 32) |
+          (int(north < 0) << 31) | (north_south << 21))
+    return extended_squitter(icao, me)
+
+
+def identification_message(icao: int, callsign: str) -> bytes:
+    me = 4 << 51
+    for i, char in enumerate(callsign.upper().ljust(8)[:8]):
+        code = ADSB_CHARSET.find(char)
+        me |= (code if code > 0 else 32) << (42 - 6 * i)
+    return extended_squitter(icao, me)
+
+
+def beast_frame(payload: bytes, timestamp: int = 0, signal: int = 0x80) -> bytes:
+    """Wrap a Mode S payload in a Beast frame, escaping 0x1a bytes."""
+    kind = {length: kind for kind, length in BEAST_FRAME_LENGTHS.items()}[len(payload)]
+    body = (timestamp & 0xFFFFFFFFFFFF).to_bytes(6, 'big') + bytes([signal]) + payload
+    return bytes([0x1a, kind]) + body.replace(b'\x1a', b'\x1a\x1a')
+
+
+def sbs_line(kind: int, hex_id: str, when: float, callsign: str = '', altitude: str = '', speed: str = '',
+             track: str = '', lat: str = '', lon: str = '') -> bytes:
+    stamp = datetime.fromtimestamp(when, timezone.utc)
+    date, clock = stamp.strftime('%Y/%m/%d'), stamp.strftime('%H:%M:%S.%f')[:-3]
+    fields = ['MSG', str(kind), '1', '1', hex_id.upper(), '1', date, clock, date, clock,
+              callsign, altitude, speed, track, lat, lon, '', '', '0', '0', '0', '0']
+    return (','.join(fields) + '\r\n').encode()
+
+
+class SyntheticTraffic:
+    """Simulated aircraft, half circling and half flying straight, around a center point."""
+
+    LEG_SECONDS = 1200
+
+    def __init__(self, aircraft: int, center_lat: float = 40.0, center_lon: float = -74.0, seed: int = 1):
+        rng = random.Random(seed)
+        self.aircraft = []
+        for i in range(aircraft):
+            self.aircraft.append({
+                'icao': 0xA00000 + i,
+                'callsign': f'SIM{i:04d}',
+                'circling': i % 2 == 0,
+                'lat': center_lat + rng.uniform(-1.5, 1.5),
+                'lon': center_lon + rng.uniform(-2, 2),
+                'radius_km': rng.uniform(1, 5),
+                'speed_kt': rng.uniform(100, 250),
+                'track': rng.uniform(0, 360),
+                'altitude': rng.randrange(2000, 30000, 100),
+                'phase': rng.uniform(0, 2 * math.pi),
+            })
+
+    def state(self, aircraft: dict, t: float):
+        """Position and track of an aircraft t seconds into the simulation."""
+        speed_kms = aircraft['speed_kt'] * 1.852 / 3600
+        cos_lat = math.cos(math.radians(aircraft['lat']))
+        if aircraft['circling']:
+            angle = aircraft['phase'] + speed_kms * t / aircraft['radius_km']
+            lat = aircraft['lat'] + aircraft['radius_km'] * math.sin(angle) / KM_PER_DEG
+            lon = aircraft['lon'] + aircraft['radius_km'] * math.cos(angle) / (KM_PER_DEG * cos_lat)
+            track = (math.degrees(-angle) + 360) % 360
+        else:
+            # Straight flyers restart from their origin so they stay nearby
+            track = aircraft['track']
+            distance = speed_kms * (t % self.LEG_SECONDS)
+            lat = aircraft['lat'] + distance * math.cos(math.radians(track)) / KM_PER_DEG
+            lon = aircraft['lon'] + distance * math.sin(math.radians(track)) / (KM_PER_DEG * cos_lat)
+        return lat, lon, track
+
+    def messages(self, stream_format: str, tick: int, when: float):
+        """Encoded messages for half-second tick number tick, timestamped when.
+
+        Every aircraft sends a position each tick, velocity every second and
+        identification every five seconds.
+        """
+        stamp = int(when * 12e6)  # Beast timestamps count a 12 MHz clock
+        out = []
+        for aircraft in self.aircraft:
+            lat, lon, track = self.state(aircraft, tick * 0.5)
+            icao, hex_id = aircraft['icao'], f"{aircraft['icao']:06x}"
+            if stream_format == 'beast':
+                out.append(beast_frame(position_message(icao, lat, lon, aircraft['altitude'], tick % 2), stamp))
+                if tick % 2 == 0:
+                    out.append(beast_frame(velocity_message(icao, aircraft['speed_kt'], track), stamp))
+                if tick % 10 == 0:
+                    out.append(beast_frame(identification_message(icao, aircraft['callsign']), stamp))
+            else:
+                out.append(sbs_line(3, hex_id, when, altitude=str(aircraft['altitude']),
+                                    lat=f'{lat:.5f}', lon=f'{lon:.5f}'))
+                if tick % 2 == 0:
+                    out.append(sbs_line(4, hex_id, when, speed=f"{aircraft['speed_kt']:.0f}", track=f'{track:.0f}'))
+                if tick % 10 == 0:
+                    out.append(sbs_line(1, hex_id, when, callsign=aircraft['callsign']))
+        return out
+
+
+def recorded_messages(path: str, stream_format: str):
+    """Split a recorded stream into individual messages."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if stream_format == 'sbs':
+        return [line + b'\n' for line in data.splitlines() if line.strip()]
+    payloads, _ = split_beast_frames(data)
+    return [beast_frame(payload) for payload in payloads]
+
+
+class ReplayHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        options = self.server.options
+        print(f"Client connected: {self.client_address[0]}:{self.client_address[1]}")
+        try:
+            if options.file:
+                self.replay_file(options)
+            else:
+                self.replay_synthetic(options)
+        except OSError:
+            pass
+        print(f"Client disconnected: {self.client_address[0]}:{self.client_address[1]}")
+
+    def replay_file(self, options):
+        messages = recorded_messages(options.file, options.format)
+        batch = max(1, int(options.rate / 20))  # Send in 50 ms batches
+        while True:
+            for i in range(0, len(messages), batch):
+                self.request.sendall(b''.join(messages[i:i + batch]))
+                time.sleep(batch / options.rate)
+            if not options.loop:
+                return
+
+    def replay_synthetic(self, options):
+        traffic = SyntheticTraffic(options.aircraft, seed=options.seed)
+        start = time.time()
+        tick = 0
+        while True:
+            self.request.sendall(b''.join(traffic.messages(options.format, tick, time.time())))
+            tick += 1
+            time.sleep(max(0.0, start + tick * 0.5 - time.time()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve an SBS or Beast stream for offline testing')
+    parser.add_argument('--format', choices=['sbs', 'beast'], default='sbs', help='Stream format (default: sbs)')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, help='Port to listen on (default: 30003 for sbs, 30005 for beast)')
+    parser.add_argument('--file', help='Recorded stream to replay instead of synthetic traffic')
+    parser.add_argument('--rate', type=float, default=1000, help='Messages per second when replaying a file (default: 1000)')
+    parser.add_argument('--loop', action='store_true', help='Replay the file in a loop')
+    parser.add_argument('--aircraft', type=int, default=50, help='Synthetic aircraft (default: 50)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for synthetic traffic (default: 1)')
+    options = parser.parse_args()
+
+    port = options.port or (30005 if options.format == 'beast' else 30003)
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    with socketserver.ThreadingTCPServer((options.host, port), ReplayHandler) as server:
+        server.daemon_threads = True
+        server.options = options
+        source = options.file or f'{options.aircraft} synthetic aircraft'
+        print(f"Serving {options.format.upper()} on {options.host}:{port} from {source}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
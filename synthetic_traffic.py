@@ -0,0 +1,173 @@
+"""Synthetic aircraft fleets for benchmarks and detector checks.
+
+Every aircraft flies a known pattern (a circle, a lawnmower survey, a
+racetrack hold, a straight transit or standing still), so detections can be
+checked against what was flown.
+Positions get GPS noise and random dropouts, and snapshots come out in the
+same shape as tar1090's aircraft.json:
+
+    fleet = Fleet(FleetConfig(aircraft=500, circling=0.2, surveys=0.1))
+    for data in fleet.snapshots(seconds=600, interval=5):
+        monitor.ingest_aircraft_data(data)
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+
+from app import Position
+
+KM_PER_DEG = 111.32
+
+
+@dataclass
+class FleetConfig:
+    aircraft: int = 200
+    circling: float = 0.2  # Fraction of aircraft circling
+    circle_radii: Tuple[float, ...] = (0.5, 1.0, 2.0, 5.0)  # km, assigned in turn to circling aircraft
+    surveys: float = 0.1  # Fraction of aircraft flying lawnmower surveys
+    leg_km: float = 6.0
+    spacing_km: float = 1.0
+    survey_legs: int = 8  # Legs before a survey starts over
+    noise_km: float = 0.02  # Standard deviation of GPS noise
+    dropout: float = 0.05  # Probability a position is missing from a snapshot
+    center_lat: float = 40.0
+    center_lon: float = -74.0
+    spread_deg: float = 2.0
+    seed: int = 1
+
+
+@dataclass
+class FlightPlan:
+    """What one synthetic aircraft flies: 'circle', 'survey', 'racetrack', 'transit' or 'stationary'."""
+    hex_id: str
+    callsign: str
+    kind: str
+    lat: float  # Circle center, survey origin or transit start
+    lon: float
+    altitude: float
+    speed_kt: float
+    heading: float  # Degrees; transit track, survey leg or racetrack bearing
+    radius_km: float = 0.0  # Circle radius or racetrack turn radius
+    seconds_per_turn: float = 0.0
+    phase: float = 0.0
+    leg_km: float = 0.0
+    spacing_km: float = 0.0
+    legs: int = 0
+
+
+class Fleet:
+    """A fleet of labeled synthetic aircraft."""
+
+    def __init__(self, config: FleetConfig = None):
+        self.config = config or FleetConfig()
+        self.rng = random.Random(self.config.seed)
+        self.plans = [self._plan(i) for i in range(self.config.aircraft)]
+
+    def _plan(self, i: int) -> FlightPlan:
+        config, rng = self.config, self.rng
+        circling = int(config.aircraft * config.circling)
+        surveys = int(config.aircraft * config.surveys)
+        lat = config.center_lat + rng.uniform(-config.spread_deg, config.spread_deg)
+        lon = config.center_lon + rng.uniform(-config.spread_deg, config.spread_deg)
+        base = dict(hex_id=f'{0xA00000 + i:06x}', lat=lat, lon=lon, heading=rng.uniform(0, 360))
+        if i < circling:
+            radius = config.circle_radii[i % len(config.circle_radii)]
+            seconds_per_turn = rng.uniform(90, 240)
+            return FlightPlan(callsign=f'CIRC{i:04d}', kind='circle', altitude=rng.randrange(1500, 8000, 100),
+                              speed_kt=2 * math.pi * radius / seconds_per_turn * 3600 / 1.852,
+                              radius_km=radius, seconds_per_turn=seconds_per_turn,
+                              phase=rng.uniform(0, 2 * math.pi), **base)
+        if i < circling + surveys:
+            return FlightPlan(callsign=f'SURV{i:04d}', kind='survey', altitude=rng.randrange(3000, 12000, 100),
+                              speed_kt=rng.uniform(110, 160), leg_km=config.leg_km, spacing_km=config.spacing_km,
+                              legs=config.survey_legs, **base)
+        return FlightPlan(callsign=f'TRNS{i:04d}', kind='transit', altitude=rng.randrange(5000, 38000, 100),
+                          speed_kt=rng.uniform(150, 480), **base)
+
+    def position(self, plan: FlightPlan, t: float) -> Tuple[float, float]:
+        """Noise-free (lat, lon) of an aircraft t seconds into the simulation."""
+        cos_lat = math.cos(math.radians(plan.lat))
+        if plan.kind == 'circle':
+            angle = plan.phase + 2 * math.pi * t / plan.seconds_per_turn
+            north, east = plan.radius_km * math.cos(angle), plan.radius_km * math.sin(angle)
+        elif plan.kind == 'survey':
+            # Fly a leg, step across by the spacing, fly back; start over after the last leg
+            distance = plan.speed_kt * 1.852 / 3600 * t
+            period = plan.leg_km + plan.spacing_km
+            leg = int(distance // period) % plan.legs
+            within = distance % period
+            if within < plan.leg_km:
+                along = within if leg % 2 == 0 else plan.leg_km - within
+                across = leg * plan.spacing_km
+            else:
+                along = plan.leg_km if leg % 2 == 0 else 0.0
+                across = leg * plan.spacing_km + within - plan.leg_km
+            bearing = math.radians(plan.heading)
+            north = along * math.cos(bearing) - across * math.sin(bearing)
+            east = along * math.sin(bearing) + across * math.cos(bearing)
+        elif plan.kind == 'racetrack':
+            # Two straight legs joined by half circles, flown clockwise
+            distance = (plan.speed_kt * 1.852 / 3600 * t) % (2 * plan.leg_km + 2 * math.pi * plan.radius_km)
+            turn = math.pi * plan.radius_km
+            if distance < plan.leg_km:
+                along, across = distance, 0.0
+            elif distance < plan.leg_km + turn:
+                angle = (distance - plan.leg_km) / plan.radius_km
+                along = plan.leg_km + plan.radius_km * math.sin(angle)
+                across = plan.radius_km * (1 - math.cos(angle))
+            elif distance < 2 * plan.leg_km + turn:
+                along, across = 2 * plan.leg_km + turn - distance, 2 * plan.radius_km
+            else:
+                angle = (distance - 2 * plan.leg_km - turn) / plan.radius_km
+                along = -plan.radius_km * math.sin(angle)
+                across = plan.radius_km * (1 + math.cos(angle))
+            bearing = math.radians(plan.heading)
+            north = along * math.cos(bearing) - across * math.sin(bearing)
+            east = along * math.sin(bearing) + across * math.cos(bearing)
+        elif plan.kind == 'stationary':
+            north = east = 0.0
+        else:
+            distance = plan.speed_kt * 1.852 / 3600 * t
+            north = distance * math.cos(math.radians(plan.heading))
+            east = distance * math.sin(math.radians(plan.heading))
+        return plan.lat + north / KM_PER_DEG, plan.lon + east / (KM_PER_DEG * cos_lat)
+
+    def _observe(self, plan: FlightPlan, t: float) -> Tuple[float, float]:
+        lat, lon = self.position(plan, t)
+        noise = self.config.noise_km
+        if noise:
+            lat += self.rng.gauss(0, noise) / KM_PER_DEG
+            lon += self.rng.gauss(0, noise) / (KM_PER_DEG * math.cos(math.radians(plan.lat)))
+        return lat, lon
+
+    def track(self, plan: FlightPlan, seconds: float, interval: float, start: float = 0.0) -> List[Position]:
+        """Observed positions of one aircraft, with noise and dropouts."""
+        positions = []
+        for i in range(int(seconds / interval)):
+            if self.rng.random() < self.config.dropout:
+                continue
+            lat, lon = self._observe(plan, i * interval)
+            positions.append(Position(lat, lon, start + i * interval, float(plan.altitude), plan.speed_kt))
+        return positions
+
+    def snapshots(self, seconds: float, interval: float, start: float = 1_700_000_000.0) -> Iterator[Dict]:
+        """aircraft.json snapshots every interval seconds, with noise and dropouts."""
+        for i in range(int(seconds / interval)):
+            t = i * interval
+            aircraft = []
+            for plan in self.plans:
+                if self.rng.random() < self.config.dropout:
+                    continue
+                seen_pos = round(self.rng.uniform(0, min(interval, 2.0)), 1)
+                lat, lon = self._observe(plan, t - seen_pos)
+                aircraft.append({
+                    'hex': plan.hex_id, 'flight': plan.callsign.ljust(8), 'lat': round(lat, 6), 'lon': round(lon, 6),
+                    'alt_baro': plan.altitude, 'gs': round(plan.speed_kt, 1), 'seen_pos': seen_pos
+                })
+            yield {'now': start + t, 'aircraft': aircraft}
+
+    def labels(self) -> Dict[str, str]:
+        """Pattern flown by each hex id."""
+        return {plan.hex_id: plan.kind for plan in self.plans}
@@ -0,0 +1,65 @@
+"""Tests for the aircraft.binCraft decoder, on snapshots built with benchmark.encode_bincraft."""
+
+import pytest
+
+from app import BINCRAFT_POSITION_VALID, ReceiverFeed, bincraft_now, decode_bincraft
+from benchmark import encode_bincraft
+
+SNAPSHOT = {
+    'now': 1700000123.4,
+    'aircraft': [
+        {'hex': 'a1b2c3', 'flight': 'UAL123', 'lat': 40.123456, 'lon': -74.654321, 'alt_baro': 35000, 'gs': 451.3,
+         'seen_pos': 0.4},
+        {'hex': '~00abcd', 'flight': 'TISB1', 'lat': -33.9, 'lon': 151.2, 'alt_baro': 1200, 'gs': 98.0,
+         'seen_pos': 2.5},
+    ]
+}
+
+
+@pytest.mark.parametrize('stride', [112, 88])
+def test_round_trip(stride):
+    """Every field the encoder writes decodes back; records too short for the type field report none."""
+    body = encode_bincraft(SNAPSHOT, stride=stride)
+    assert bincraft_now(body) == pytest.approx(SNAPSHOT['now'], abs=1e-3)
+    snapshot = decode_bincraft(body)
+    assert snapshot.now == pytest.approx(SNAPSHOT['now'], abs=1e-3)
+    assert len(snapshot) == 2
+    for entry, expected in zip(snapshot.to_dicts(), SNAPSHOT['aircraft']):
+        assert entry['hex'] == expected['hex']
+        assert entry['flight'] == expected['flight']
+        assert entry['lat'] == pytest.approx(expected['lat'], abs=1e-6)
+        assert entry['lon'] == pytest.approx(expected['lon'], abs=1e-6)
+        assert entry['alt_baro'] == expected['alt_baro']
+        assert entry['gs'] == pytest.approx(expected['gs'])
+        assert entry['seen_pos'] == pytest.approx(expected['seen_pos'])
+        assert entry['t'] is None
+
+
+def test_records_without_position_are_dropped():
+    body = bytearray(encode_bincraft(SNAPSHOT))
+    body[112 + 73] &= ~BINCRAFT_POSITION_VALID & 0xFF  # First record's validity byte
+    assert [entry['hex'] for entry in decode_bincraft(bytes(body)).to_dicts()] == ['~00abcd']
+
+
+def test_rejects_malformed_headers():
+    with pytest.raises(ValueError):
+        decode_bincraft(b'\x00' * 8)
+    body = bytearray(encode_bincraft(SNAPSHOT))
+    body[8:12] = (90).to_bytes(4, 'little')
+    with pytest.raises(ValueError):
+        decode_bincraft(bytes(body))
+
+
+def test_feed_skips_unchanged_snapshots_and_falls_back():
+    """A repeated header 'now' skips the decode; an undecodable body falls back to aircraft.json."""
+    feed = ReceiverFeed('http://localhost', feed_format='bincraft')
+    feed.formats = ['bincraft', 'json']
+    body = encode_bincraft(SNAPSHOT)
+    assert feed.parse(body)
+    assert feed.aircraft_count == 2
+    assert not feed.parse(body)
+    assert feed.unchanged == 1
+
+    assert not feed.parse(b'\x00' * 4)
+    assert feed.format == 'json'
+    assert feed.now is None
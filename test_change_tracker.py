@@ -0,0 +1,113 @@
+"""Tests for the per-cycle change sets and since= cursors of ChangeTracker."""
+
+from app import ChangeTracker, Position, TrackBuffer
+
+
+class Fleet:
+    """Tracks and attributes of the aircraft on the map, advanced one cycle at a time."""
+
+    def __init__(self):
+        self.tracks = {}
+        self.kinds = {}
+        self.callsigns = {}
+
+    def add(self, hex_id, kind='aircraft', callsign='TEST'):
+        self.tracks[hex_id] = TrackBuffer(5)
+        self.kinds[hex_id] = kind
+        self.callsigns[hex_id] = callsign
+
+    def remove(self, hex_id):
+        del self.tracks[hex_id], self.kinds[hex_id], self.callsigns[hex_id]
+
+    def entries(self, cycle):
+        for hex_id, track in self.tracks.items():
+            track.append(Position(40.0 + cycle * 0.01, -74.0, float(cycle)))
+            yield self.kinds[hex_id], {'hex_id': hex_id, 'callsign': self.callsigns[hex_id]}, track, 0
+
+
+def advance(tracker, fleet, cycle):
+    return tracker.changes(cycle, fleet.entries(cycle), f't{cycle}', len(fleet.tracks))
+
+
+def test_change_sets_carry_only_what_changed():
+    tracker, fleet = ChangeTracker(), Fleet()
+    fleet.add('a')
+    fleet.add('b', kind='circle')
+    first = advance(tracker, fleet, 1)
+    assert first['base'] is None
+    assert [entry['hex_id'] for entry in first['added']] == ['a', 'b']
+    assert first['started'] == [{'hex_id': 'b', 'kind': 'circle'}]
+
+    fleet.callsigns['a'] = 'NEW'
+    second = advance(tracker, fleet, 2)
+    assert second['base'] == 1
+    assert second['added'] == []
+    updates = {update['hex_id']: update for update in second['updated']}
+    assert updates['a']['callsign'] == 'NEW'
+    assert 'callsign' not in updates['b']
+    assert [point['time'] for point in updates['b']['path']] == [2.0]
+
+    fleet.remove('b')
+    third = advance(tracker, fleet, 3)
+    assert third['removed'] == ['b']
+    assert third['ended'] == [{'hex_id': 'b', 'kind': 'circle'}]
+
+
+def test_full_track_buffers_report_their_new_start():
+    tracker, fleet = ChangeTracker(), Fleet()
+    fleet.add('a')
+    for cycle in range(1, 6):
+        advance(tracker, fleet, cycle)
+    [update] = advance(tracker, fleet, 6)['updated']
+    assert update['start'] == 2.0
+    assert [point['time'] for point in update['path']] == [6.0]
+
+
+def test_since_merges_change_sets_with_tombstones():
+    """A cursor gets one merged change set: new paths appended, dropped aircraft as tombstones."""
+    tracker, fleet = ChangeTracker(), Fleet()
+    fleet.add('a')
+    fleet.add('b')
+    advance(tracker, fleet, 1)
+    fleet.add('c')
+    advance(tracker, fleet, 2)
+    fleet.remove('b')
+    fleet.remove('c')
+    fleet.add('d')
+    advance(tracker, fleet, 3)
+    advance(tracker, fleet, 4)
+
+    merged = tracker.since(1)
+    assert merged['cycle'] == 4
+    assert merged['since'] == 1
+    assert merged['timestamp'] == 't4'
+    assert merged['removed'] == ['b', 'c']
+    assert [entry['hex_id'] for entry in merged['added']] == ['d']
+    assert [point['time'] for point in merged['added'][0]['path']] == [3.0, 4.0]
+    [update] = merged['updated']
+    assert update['hex_id'] == 'a'
+    assert [point['time'] for point in update['path']] == [2.0, 3.0, 4.0]
+
+    # An aircraft that comes back is added again rather than left as a tombstone
+    fleet.add('b')
+    advance(tracker, fleet, 5)
+    merged = tracker.since(1)
+    assert merged['removed'] == ['c']
+    assert sorted(entry['hex_id'] for entry in merged['added']) == ['b', 'd']
+
+
+def test_since_current_old_and_future_cursors():
+    """The current cycle gets an empty change set; cursors outside the history get None."""
+    tracker, fleet = ChangeTracker(), Fleet()
+    fleet.add('a')
+    assert tracker.since(1) is None
+    for cycle in range(1, ChangeTracker.HISTORY + 3):
+        advance(tracker, fleet, cycle)
+    latest = ChangeTracker.HISTORY + 2
+
+    current = tracker.since(latest)
+    assert (current['added'], current['updated'], current['removed']) == ([], [], [])
+    assert current['aircraft_count'] == 1
+    assert tracker.since(latest + 1) is None
+    assert tracker.since(1) is None  # Aged out of the history
+    assert tracker.since(2) is not None  # The oldest change set kept was based on cycle 2
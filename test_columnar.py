@@ -0,0 +1,98 @@
+"""Tests for the compact columnar /api/patterns encoding, read back with a decoder written from its description."""
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from app import (COLUMNAR_MAGIC, COLUMNAR_MEDIA_TYPE, COORDINATE_SCALE, NO_ALTITUDE, EncodedPayload, encode_columnar,
+                 zigzag_varints)
+
+
+def read_varints(body, pos, count):
+    values = []
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            byte = body[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        values.append((value >> 1) ^ -(value & 1))
+    return values, pos
+
+
+def decode_columnar(body):
+    """The payload encode_columnar was given, with coordinates and times rounded to the encoding's units."""
+    assert body[:4] == COLUMNAR_MAGIC
+    (length,) = struct.unpack('<I', body[4:8])
+    header = json.loads(body[8:8 + length])
+    total = sum(sum(lists['points']) for lists in header['lists'].values())
+    pos = 8 + length
+    columns = []
+    for _ in range(4):
+        deltas, pos = read_varints(body, pos, total)
+        columns.append(np.cumsum(deltas, dtype=np.int64).tolist())
+    assert pos == len(body)
+
+    points = [{'lat': lat / COORDINATE_SCALE, 'lon': lon / COORDINATE_SCALE, 'alt': None if alt == NO_ALTITUDE else alt,
+               'time': header['time_base'] + time / 1000} for lat, lon, alt, time in zip(*columns)]
+    data = dict(header['fields'])
+    for key, lists in header['lists'].items():
+        entries = [dict(zip(lists['columns'], values)) for values in zip(*lists['columns'].values())]
+        for entry, count in zip(entries, lists['points']):
+            entry['path'], points = points[:count], points[count:]
+        data[key] = entries
+    return data
+
+
+def test_zigzag_varints():
+    values = np.array([0, -1, 1, 63, -64, 64, 300, -(2 ** 40)])
+    encoded = zigzag_varints(values)
+    assert encoded[:8] == bytes([0x00, 0x01, 0x02, 0x7e, 0x7f, 0x80, 0x01, 0xd8])
+    assert read_varints(encoded, 0, len(values)) == (values.tolist(), len(encoded))
+
+
+def test_round_trip():
+    """Fields, per-entry columns and paths survive, to a meter and a millisecond."""
+    def path(lat, start, altitudes):
+        return [{'lat': lat + i * 0.0123456, 'lon': -74.0 - i * 0.5, 'alt': alt, 'time': start + i * 1.5}
+                for i, alt in enumerate(altitudes)]
+
+    data = {
+        'timestamp': '2024-01-01T00:00:00', 'aircraft_count': 3, 'cycle': 7,
+        'circles': [{'hex_id': 'a1', 'radius': 2.5, 'path': path(40.0, 1700000000.25, [3000, None, 2900])}],
+        'grids': [],
+        'all_aircraft': [
+            {'hex_id': 'b2', 'callsign': None, 'path': path(-33.9, 1699999990.0, [35000])},
+            {'hex_id': 'c3', 'callsign': 'UAL1', 'path': []},
+        ],
+    }
+    decoded = decode_columnar(encode_columnar(data))
+    assert decoded.keys() == data.keys()
+    for key in ('timestamp', 'aircraft_count', 'cycle'):
+        assert decoded[key] == data[key]
+    for key in ('circles', 'grids', 'all_aircraft'):
+        assert len(decoded[key]) == len(data[key])
+        for entry, expected in zip(decoded[key], data[key]):
+            assert {k: v for k, v in entry.items() if k != 'path'} == {k: v for k, v in expected.items() if k != 'path'}
+            assert len(entry['path']) == len(expected['path'])
+            for point, expected_point in zip(entry['path'], expected['path']):
+                assert point['lat'] == pytest.approx(expected_point['lat'], abs=1e-5)
+                assert point['lon'] == pytest.approx(expected_point['lon'], abs=1e-5)
+                assert point['alt'] == expected_point['alt']
+                assert point['time'] == pytest.approx(expected_point['time'], abs=1e-3)
+
+
+def test_empty_payload():
+    data = {'cycle': 1, 'circles': [], 'grids': [], 'all_aircraft': []}
+    assert decode_columnar(encode_columnar(data)) == data
+
+
+def test_encoded_payload_mimetype():
+    data = {'cycle': 1, 'circles': []}
+    assert EncodedPayload.encode(1, data, columnar=True).mimetype == COLUMNAR_MEDIA_TYPE
+    assert EncodedPayload.encode(1, data).mimetype == 'application/json'
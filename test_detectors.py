@@ -0,0 +1,131 @@
+"""Tests that the NumPy and incremental detector backends agree with the Python detectors."""
+
+import math
+
+import numpy as np
+import pytest
+
+from app import CIRCLE_DETECTORS, GRID_DETECTORS, GridDetector, Position, TrackBuffer, VectorizedGridDetector
+
+
+def circle_track(radius_km=2.0, turns=3.0, points=120, interval=2.0, start=0.0):
+    """A clean circle around (40, -74)."""
+    track = []
+    for i in range(points):
+        angle = 2 * math.pi * turns * i / points
+        track.append(Position(40.0 + radius_km / 111.2 * math.sin(angle),
+                              -74.0 + radius_km / (111.2 * math.cos(math.radians(40.0))) * math.cos(angle),
+                              start + i * interval, 3000.0, 120.0))
+    return track
+
+
+def straight_track(points=120, interval=2.0):
+    return [Position(40.0 + i * 0.002, -74.0 + i * 0.001, i * interval, 3000.0, 120.0) for i in range(points)]
+
+
+def survey_track(legs=6, leg_km=6.0, spacing_km=1.0, step_km=0.25, interval=5.0):
+    """A lawnmower survey: north-south legs joined by short eastward steps."""
+    track = []
+    lat, lon = 40.0, -74.0
+    km_lat = 1 / 111.2
+    km_lon = 1 / (111.2 * math.cos(math.radians(40.0)))
+    for leg in range(legs):
+        direction = 1 if leg % 2 == 0 else -1
+        for _ in range(int(leg_km / step_km)):
+            track.append(Position(lat, lon, len(track) * interval, 3000.0, 120.0))
+            lat += direction * step_km * km_lat
+        for _ in range(int(spacing_km / step_km)):
+            track.append(Position(lat, lon, len(track) * interval, 3000.0, 120.0))
+            lon += step_km * km_lon
+    return track
+
+
+def to_buffer(track):
+    buffer = TrackBuffer(len(track))
+    for position in track:
+        buffer.append(position)
+    return buffer
+
+
+@pytest.mark.parametrize('backend', sorted(CIRCLE_DETECTORS))
+@pytest.mark.parametrize('track, circling', [
+    (circle_track(), True),
+    (circle_track(turns=1.0), False),  # Below min_turns
+    (circle_track(radius_km=0.2), False),  # Below min_radius
+    (circle_track(radius_km=20.0), False),  # Above max_radius
+    (straight_track(), False),
+])
+def test_circle_backends_agree(backend, track, circling):
+    """Every backend gives the reference decision, and close radius and turns, on clear-cut tracks."""
+    reference = CIRCLE_DETECTORS['python']().detect_circling(track)
+    detection = CIRCLE_DETECTORS[backend]().detect_circling(to_buffer(track))
+    assert reference.is_circling == circling
+    assert detection.is_circling == circling
+    if circling:
+        assert detection.radius == pytest.approx(reference.radius, rel=0.02)
+        assert detection.turns == pytest.approx(reference.turns, rel=0.05)
+        assert detection.center_lat == pytest.approx(reference.center_lat, abs=1e-3)
+        assert detection.center_lon == pytest.approx(reference.center_lon, abs=1e-3)
+
+
+def test_incremental_state_follows_appends_and_evictions():
+    """Running sums brought up to date point by point match a fresh state on the same points.
+
+    Turns are measured around the centroid as it stood when each point arrived,
+    so only the moments are compared: centre and radius agree to within the
+    difference between the two states' flat-earth projections.
+    """
+    detector = CIRCLE_DETECTORS['incremental']()
+    buffer = TrackBuffer(100)
+    for position in circle_track(turns=6.0, points=300):
+        buffer.append(position)
+        buffer.evict_before(position.timestamp - 150)
+        if len(buffer) >= 10 and buffer.appended % 7 == 0:
+            kept = detector.detect_circling(buffer)
+            fresh = CIRCLE_DETECTORS['incremental']().detect_circling(TrackBuffer.from_arrays(
+                buffer.lat, buffer.lon, buffer.timestamps))
+            assert kept.radius == pytest.approx(fresh.radius, rel=1e-3)
+            assert kept.center_lat == pytest.approx(fresh.center_lat, abs=1e-6)
+            assert kept.center_lon == pytest.approx(fresh.center_lon, abs=1e-6)
+    assert detector.detect_circling(buffer).is_circling
+
+
+@pytest.mark.parametrize('backend', sorted(GRID_DETECTORS))
+@pytest.mark.parametrize('track, grid', [
+    (survey_track(), True),
+    (straight_track(), False),
+    (circle_track(), False),
+])
+def test_grid_backends_agree(backend, track, grid):
+    """Every grid backend gives the reference decision and leg count on clear-cut tracks."""
+    reference = GRID_DETECTORS['python']().detect_grid_pattern(track)
+    detection = GRID_DETECTORS[backend]().detect_grid_pattern(to_buffer(track))
+    assert reference.is_grid_pattern == grid
+    assert detection.is_grid_pattern == grid
+    if grid:
+        assert detection.num_legs == reference.num_legs
+        assert detection.coverage_area == pytest.approx(reference.coverage_area)
+
+
+def test_grid_fleet_matches_single_tracks():
+    """detect_fleet gives each track the detection detect_grid_pattern gives it alone."""
+    detector = VectorizedGridDetector()
+    tracks = [survey_track(), straight_track(), survey_track(legs=4), circle_track(), straight_track(points=10)]
+    assert detector.detect_fleet(tracks) == [detector.detect_grid_pattern(track) for track in tracks]
+
+
+def test_turns_agree_on_zero_length_chords():
+    """A track that stops and doubles back turns at the same points in both grid backends."""
+    rng = np.random.default_rng(5)
+    for _ in range(50):
+        track = []
+        for i in range(80):
+            if track and rng.random() < 0.3:
+                earlier = track[max(len(track) - 3, 0)]
+                track.append(Position(earlier.lat, earlier.lon, i * 5.0))
+            else:
+                previous = track[-1] if track else Position(40.0, -74.0, 0.0)
+                track.append(Position(previous.lat + rng.uniform(-0.01, 0.01),
+                                      previous.lon + rng.uniform(-0.01, 0.01), i * 5.0))
+        expected = [turn[0] for turn in GridDetector().detect_turns(track)]
+        assert [turn[0] for turn in VectorizedGridDetector().detect_turns(track)] == expected
@@ -0,0 +1,62 @@
+"""Tests for recording polls with SnapshotRecorder and reading them back with SnapshotReplay."""
+
+import gzip
+
+from app import BODY_HEADER, RECORD_HEADER, SnapshotRecorder, SnapshotReplay, VirtualClock
+
+START = 1700000000.0
+JSON_BODY = b'{"now": 1700000000.0, "aircraft": []}'
+
+
+def record(directory, polls):
+    recorder = SnapshotRecorder(directory, ['http://a', 'http://b'], 1.0)
+    for received_at, bodies in polls:
+        recorder.write(received_at, bodies)
+    recorder.close()
+    return recorder
+
+
+def test_round_trip_across_chunks(tmp_path):
+    """Bodies, unchanged and failed markers come back in order, including from a later chunk."""
+    polls = [
+        (START, [('json', JSON_BODY, False), ('bincraft', b'\x00\x1a' * 20, False)]),
+        (START + 1, [('json', None, False), ('bincraft', None, True)]),
+        (START + SnapshotRecorder.CHUNK_SECONDS + 5, [('json', None, True), ('bincraft.zst', b'zst', False)]),
+    ]
+    recorder = record(tmp_path, polls)
+    assert recorder.chunks == 2
+    assert recorder.polls == 3
+    assert recorder.bytes_recorded == len(JSON_BODY) + 40 + 3
+
+    replay = SnapshotReplay(tmp_path)
+    assert replay.manifest == {'server_urls': ['http://a', 'http://b'], 'update_interval': 1.0}
+    assert list(replay.read_records()) == [
+        (START, [('json', JSON_BODY, False), ('bincraft', b'\x00\x1a' * 20, False)]),
+        (START + 1, [(None, None, False), (None, None, True)]),
+        (START + SnapshotRecorder.CHUNK_SECONDS + 5, [(None, None, True), ('bincraft.zst', b'zst', False)]),
+    ]
+
+
+def test_next_poll_sets_the_clock(tmp_path):
+    record(tmp_path, [(START, [('json', JSON_BODY, False)]), (START + 2, [('json', None, False)])])
+    replay = SnapshotReplay(tmp_path)
+    clock = VirtualClock()
+    assert replay.next_poll(clock) == [('json', JSON_BODY, False)]
+    assert clock.time() == START
+    assert replay.next_poll(clock) == [(None, None, False)]
+    assert clock.time() == START + 2
+    assert replay.next_poll(clock) is None
+    assert replay.finished
+    assert replay.stats()['recorded_seconds'] == 2.0
+
+
+def test_truncated_chunk_ends_at_its_last_complete_poll(tmp_path):
+    """A poll cut short by a crash is dropped, and the following chunks are still read."""
+    record(tmp_path, [(START, [('json', JSON_BODY, False)]),
+                      (START + SnapshotRecorder.CHUNK_SECONDS, [('json', JSON_BODY, False)])])
+    first = sorted(tmp_path.glob('snapshots-*.bin.gz'))[0]
+    with gzip.open(first, 'ab') as f:
+        f.write(RECORD_HEADER.pack(START + 1, 1) + BODY_HEADER.pack(0, len(JSON_BODY)) + JSON_BODY[:10])
+
+    records = list(SnapshotReplay(tmp_path).read_records())
+    assert [received_at for received_at, _ in records] == [START, START + SnapshotRecorder.CHUNK_SECONDS]
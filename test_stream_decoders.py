@@ -0,0 +1,103 @@
+"""Tests for the SBS and Beast stream decoders, against the reference frames in "The 1090 MHz Riddle"."""
+
+import pytest
+
+from app import BeastDecoder, SBSDecoder, cpr_global_position, cpr_nl, modes_crc, split_beast_frames
+from stream_replay import beast_frame, position_message, sbs_line
+
+IDENTIFICATION = bytes.fromhex('8D4840D6202CC371C32CE0576098')  # KLM1023
+VELOCITY = bytes.fromhex('8D485020994409940838175B284F')  # 159.20 kt
+POSITION_EVEN = bytes.fromhex('8D40621D58C382D690C8AC2863A7')
+POSITION_ODD = bytes.fromhex('8D40621D58C386435CC412692AD6')
+
+
+def test_modes_crc():
+    """The parity of the first 11 bytes is the last 3; a flipped bit changes it."""
+    for msg in (IDENTIFICATION, VELOCITY, POSITION_EVEN, POSITION_ODD):
+        assert modes_crc(msg[:11]) == int.from_bytes(msg[11:], 'big')
+    corrupt = bytes([IDENTIFICATION[0], IDENTIFICATION[1] ^ 0x01]) + IDENTIFICATION[2:11]
+    assert modes_crc(corrupt) != int.from_bytes(IDENTIFICATION[11:], 'big')
+
+
+def test_cpr_global_position():
+    """An even/odd pair resolves to the reference position of whichever frame is chosen."""
+    even, odd = (93000, 51372), (74158, 50194)
+    lat, lon = cpr_global_position(even, odd, use_odd=False)
+    assert lat == pytest.approx(52.25720, abs=1e-5)
+    assert lon == pytest.approx(3.91937, abs=1e-5)
+    lat, lon = cpr_global_position(even, odd, use_odd=True)
+    assert lat == pytest.approx(52.26578, abs=1e-5)
+    assert lon == pytest.approx(3.93891, abs=1e-5)
+
+
+def test_cpr_nl():
+    assert cpr_nl(0.0) == 59
+    assert cpr_nl(52.2572) == 36
+    assert cpr_nl(-52.2572) == 36
+    assert cpr_nl(89.0) == 1
+
+
+def test_beast_decoder_reference_frames():
+    """Identification, velocity and a position pair decode to the reference values, stamped at receipt."""
+    decoder = BeastDecoder()
+    assert decoder.feed(beast_frame(IDENTIFICATION) + beast_frame(VELOCITY), 100.0) == []
+    assert decoder.aircraft['4840d6'].callsign == 'KLM1023'
+    assert decoder.aircraft['485020'].speed == pytest.approx(159.20, abs=0.01)
+
+    assert decoder.feed(beast_frame(POSITION_ODD), 101.0) == []
+    [(received_at, entry)] = decoder.feed(beast_frame(POSITION_EVEN), 102.5)
+    assert received_at == 102.5
+    assert entry['hex'] == '40621d'
+    assert entry['lat'] == pytest.approx(52.25720, abs=1e-5)
+    assert entry['lon'] == pytest.approx(3.91937, abs=1e-5)
+    assert entry['alt_baro'] == 38000
+    assert decoder.messages == 4
+    assert decoder.errors == 0
+
+
+def test_beast_decoder_rejects_bad_parity_and_stale_pairs():
+    decoder = BeastDecoder()
+    corrupt = POSITION_ODD[:5] + bytes([POSITION_ODD[5] ^ 0x10]) + POSITION_ODD[6:]
+    assert decoder.feed(beast_frame(corrupt), 0.0) == []
+    assert decoder.errors == 1
+
+    # Frames further apart than CPR_PAIR_SECONDS are not paired
+    decoder.feed(beast_frame(POSITION_ODD), 0.0)
+    assert decoder.feed(beast_frame(POSITION_EVEN), BeastDecoder.CPR_PAIR_SECONDS + 1.0) == []
+
+
+def test_beast_frames_split_across_reads():
+    """Frames cut at any byte, including inside an escaped 0x1a, are held back until complete."""
+    stream = b''.join(beast_frame(position_message(0x1A1A1A, 40.0, -74.0, 3000, odd)) for odd in (0, 1))
+    assert b'\x1a\x1a' in stream
+    for cut in range(len(stream) + 1):
+        decoder = BeastDecoder()
+        updates = decoder.feed(stream[:cut], 1.0) + decoder.feed(stream[cut:], 1.0)
+        [(_, entry)] = updates
+        assert entry['hex'] == '1a1a1a'
+        assert entry['lat'] == pytest.approx(40.0, abs=1e-4)
+        assert entry['lon'] == pytest.approx(-74.0, abs=1e-4)
+
+
+def test_split_beast_frames_resynchronizes():
+    payloads, tail = split_beast_frames(b'\x00\x1a\x99junk' + beast_frame(VELOCITY) + b'\x1a\x33\x00')
+    assert payloads == [VELOCITY]
+    assert tail == b'\x1a\x33\x00'
+
+
+def test_sbs_decoder():
+    """Position lines carry the callsign, altitude and speed from earlier lines; partial lines wait."""
+    decoder = SBSDecoder()
+    stream = (sbs_line(1, '40621D', 0, callsign='KLM1023 ') +
+              sbs_line(4, '40621D', 0, speed='159') +
+              sbs_line(3, '40621D', 0, altitude='38000', lat='52.25720', lon='3.91937'))
+    cut = len(stream) - 10
+    assert decoder.feed(stream[:cut], 5.0) == []
+    [(received_at, entry)] = decoder.feed(stream[cut:], 6.0)
+    assert received_at == 6.0
+    assert entry == {'hex': '40621d', 'lat': 52.2572, 'lon': 3.91937, 'alt_baro': 38000.0, 'gs': 159.0,
+                     'flight': 'KLM1023'}
+
+    assert decoder.feed(sbs_line(3, '40621D', 0, altitude='high') + b'MSG,3,short\n', 7.0) == []
+    assert decoder.messages == 4
+    assert decoder.errors == 1
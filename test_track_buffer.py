@@ -0,0 +1,69 @@
+"""Tests for the columnar track store."""
+
+import numpy as np
+import pytest
+
+from app import Position, TrackBuffer
+
+
+def fill(buffer, count, start=0):
+    for i in range(start, start + count):
+        buffer.append(Position(40.0 + i * 0.001, -74.0, float(i), 1000.0 + i, None))
+
+
+def test_append_and_index():
+    """Points read back as the Positions appended, with missing values as None."""
+    buffer = TrackBuffer(10)
+    fill(buffer, 3)
+    assert len(buffer) == 3
+    assert buffer[0] == Position(40.0, -74.0, 0.0, 1000.0, None)
+    assert buffer[-1].timestamp == 2.0
+    assert [p.timestamp for p in buffer] == [0.0, 1.0, 2.0]
+    assert [p.timestamp for p in buffer[1:]] == [1.0, 2.0]
+    with pytest.raises(IndexError):
+        buffer[3]
+
+
+def test_eviction_at_capacity():
+    """A full buffer drops its oldest point on every append, across storage compactions."""
+    buffer = TrackBuffer(100)
+    fill(buffer, 1000)
+    assert len(buffer) == 100
+    assert buffer.appended == 1000
+    np.testing.assert_array_equal(buffer.timestamps, np.arange(900, 1000, dtype=float))
+    np.testing.assert_allclose(buffer.lat, 40.0 + np.arange(900, 1000) * 0.001)
+    assert buffer.nbytes <= 5 * 8 * 150  # Capacity plus half of it in slack
+
+
+def test_evict_before():
+    """Time-based eviction drops points older than the cutoff and bumps the version."""
+    buffer = TrackBuffer(50)
+    fill(buffer, 20)
+    version = buffer.version
+    assert buffer.evict_before(5.0) == 5
+    assert buffer[0].timestamp == 5.0
+    assert buffer.version == version + 1
+    assert buffer.evict_before(5.0) == 0
+    assert buffer.version == version + 1
+    assert buffer.evict_before(100.0) == 15
+    assert len(buffer) == 0
+    fill(buffer, 2, start=200)
+    assert [p.timestamp for p in buffer] == [200.0, 201.0]
+
+
+def test_views_are_read_only():
+    """Column views share storage with the buffer, so writes through them are refused."""
+    buffer = TrackBuffer(10)
+    fill(buffer, 3)
+    with pytest.raises(ValueError):
+        buffer.lat[0] = 0.0
+
+
+def test_from_arrays_keeps_the_newest_points():
+    """Building from columns longer than the capacity keeps the last capacity points."""
+    timestamps = np.arange(30, dtype=float)
+    buffer = TrackBuffer.from_arrays(timestamps, timestamps, timestamps, capacity=10)
+    np.testing.assert_array_equal(buffer.timestamps, timestamps[20:])
+    assert buffer[0].altitude is None
+    fill(buffer, 1, start=30)
+    assert buffer[0].timestamp == 21.0